@@ -0,0 +1,143 @@
+# scripts/benchmark_checkpointer.py
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_core.messages import AIMessage, HumanMessage  # noqa: E402
+from langgraph.checkpoint.memory import MemorySaver  # noqa: E402
+from langgraph.checkpoint.sqlite import SqliteSaver  # noqa: E402
+from langgraph.graph import END, StateGraph  # noqa: E402
+
+from src.core.checkpointer import DeltaSqliteSaver  # noqa: E402
+from src.core.state import AgentState  # noqa: E402
+
+# 실제 그래프와 같은 크기감의 더미 데이터 (도구 결과 약 3KB, 답변 약 1.5KB)
+TOOL_RESULT = "[출처: 시장 트렌드 보고서]\n" + "요즘 외식 시장에서는 소용량 메뉴와 배달 전용 구성이 인기입니다. " * 60
+ANSWER = "사장님 가게의 상황을 고려하면 다음과 같은 전략을 추천드립니다. " * 40
+PROFILE = {
+    "profile_id": "BENCH0001",
+    "core_data": {
+        "basic_info": {"store_name_masked": "벤치***", "industry_main": "카페", "address_district": "성동구"},
+        "performance_metrics": {f"metric_{i}": i * 1.5 for i in range(40)},
+        "customer_profile": {f"segment_{i}": f"{i}%" for i in range(40)},
+    },
+}
+
+# ===============================================
+# 2. 벤치마크용 그래프 (LLM 없이 실제 노드와 같은 상태 변화를 재현)
+# ===============================================
+
+def _router(state):
+    return {"next_node": "planner", "intent": "general_rag_search", "allowed_tools": ["rag_searcher"]}
+
+
+def _planner(state):
+    plan = [{"id": "step1", "tool_name": "rag_searcher", "tool_input": {"query": "트렌드"}, "thought": "검색"}]
+    return {"plan": plan, "past_steps": []}
+
+
+def _executor(state):
+    return {"past_steps": [("rag_searcher 트렌드 검색", TOOL_RESULT)],
+            "sources": [{"title": f"문서 {i}", "snippet": TOOL_RESULT[:300]} for i in range(5)], "plan": []}
+
+
+def _synthesizer(state):
+    return {"messages": [AIMessage(content=ANSWER)], "final_output": ANSWER}
+
+
+def build_graph(checkpointer):
+    workflow = StateGraph(AgentState)
+    for name, func in [("router", _router), ("planner", _planner), ("executor", _executor), ("synthesizer", _synthesizer)]:
+        workflow.add_node(name, func)
+    workflow.set_entry_point("router")
+    workflow.add_edge("router", "planner")
+    workflow.add_edge("planner", "executor")
+    workflow.add_edge("executor", "synthesizer")
+    workflow.add_edge("synthesizer", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+
+def instrument(saver):
+    """saver.put을 감싸서 노드별 저장 시간(ms)과 저장 크기(바이트)를 기록합니다."""
+    latencies, sizes = defaultdict(list), defaultdict(list)
+    original_put = saver.put
+
+    def timed_put(config, checkpoint, metadata):
+        writes = metadata.get("writes")
+        if metadata.get("source") == "loop" and isinstance(writes, dict) and writes:
+            node = next(iter(writes))
+        else:
+            node = metadata.get("source", "input")
+        before = getattr(saver, "bytes_written", None)
+        start = time.perf_counter()
+        result = original_put(config, checkpoint, metadata)
+        latencies[node].append((time.perf_counter() - start) * 1000)
+        if before is not None:
+            sizes[node].append(saver.bytes_written - before)
+        else:
+            sizes[node].append(len(saver.serde.dumps(checkpoint)) + len(saver.serde.dumps(metadata)))
+        return result
+
+    saver.put = timed_put
+    return latencies, sizes
+
+# ===============================================
+# 3. 메인 실행 로직
+# ===============================================
+
+def run(name, saver, turns, threads):
+    latencies, sizes = instrument(saver)
+    graph = build_graph(saver)
+    start = time.perf_counter()
+    for t in range(threads):
+        config = {"configurable": {"thread_id": f"bench-{t}"}}
+        for i in range(turns):
+            inputs = {"messages": [HumanMessage(content=f"{i}번째 질문: 요즘 카페 트렌드 알려줘")]}
+            if i == 0:
+                inputs["current_profile"] = PROFILE
+            graph.invoke(inputs, config)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n[{name}] {threads}개 스레드 x {turns}턴, 총 {elapsed:.2f}초")
+    for node in latencies:
+        values = sorted(latencies[node])
+        p95 = values[min(len(values) - 1, int(0.95 * (len(values) - 1)))]
+        print(f"  - {node:<12} 평균 {statistics.mean(values):7.3f}ms | p95 {p95:7.3f}ms | "
+              f"평균 저장 크기 {statistics.mean(sizes[node]) / 1024:8.1f}KB")
+    total_kb = sum(sum(v) for v in sizes.values()) / 1024
+    print(f"  - 전체 저장량: {total_kb:,.1f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="체크포인터별로 그래프 노드당 체크포인트 저장 비용을 측정합니다.")
+    parser.add_argument("--turns", type=int, default=30, help="스레드당 대화 턴 수")
+    parser.add_argument("--threads", type=int, default=3, help="대화 스레드 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        run("MemorySaver (기존)", MemorySaver(), args.turns, args.threads)
+        full_conn = sqlite3.connect(os.path.join(tmp, "full.sqlite"), check_same_thread=False)
+        run("SqliteSaver (전체 상태 저장)", SqliteSaver(full_conn), args.turns, args.threads)
+        delta = DeltaSqliteSaver(os.path.join(tmp, "delta.sqlite"))
+        run("DeltaSqliteSaver (델타 저장)", delta, args.turns, args.threads)
+        for name in ("full.sqlite", "delta.sqlite"):
+            # WAL 모드에서는 아직 본 파일에 반영되지 않은 내용이 -wal 파일에 있으므로 함께 셉니다.
+            size = sum(os.path.getsize(p) for p in (os.path.join(tmp, name), os.path.join(tmp, name + "-wal")) if os.path.exists(p))
+            print(f"  - {name} 파일 크기 (WAL 포함): {size / 1024:,.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
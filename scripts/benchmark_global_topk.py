@@ -0,0 +1,164 @@
+# scripts/benchmark_global_topk.py
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import chromadb
+import numpy as np
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services import rag_service  # noqa: E402
+from src.services.embedding_service import EmbeddingService  # noqa: E402
+from src.services.rag_service import COLLECTIONS  # noqa: E402
+
+COLLECTION_TYPES = ["strategy", "guide", "trend", "case", "video"]
+EMBEDDING_DIM = 64
+
+# ===============================================
+# 2. 합성 데이터 / 기존 방식(컬렉션 순서) 재현
+# ===============================================
+
+def _unit(x: np.ndarray) -> np.ndarray:
+    return x / np.linalg.norm(x, axis=-1, keepdims=True)
+
+
+def make_data(docs_per_collection: int, duplicates: int, n_queries: int, seed: int):
+    """
+    컬렉션마다 다른 주제 중심 주변에 문서 벡터를 만들고, 문서마다 거의 같은 벡터의 중복 문서(문구만 다름)를 duplicates개 둡니다.
+    질의는 임의의 컬렉션 두 개의 주제를 섞은 벡터이므로, 정답 상위 문서는 컬렉션 순서와 관계없이 일부 컬렉션에 몰립니다.
+    """
+    rng = np.random.default_rng(seed)
+    centers = _unit(rng.standard_normal((len(COLLECTION_TYPES), EMBEDDING_DIM)))
+    data = {}
+    for c, ctype in enumerate(COLLECTION_TYPES):
+        base = _unit(centers[c] + 0.9 * _unit(rng.standard_normal((docs_per_collection, EMBEDDING_DIM))))
+        vectors, ids, cluster = [], [], []
+        for d, vector in enumerate(base):
+            for r in range(duplicates + 1):
+                vectors.append(_unit(vector + 0.03 * rng.standard_normal(EMBEDDING_DIM)) if r else vector)
+                ids.append(f"{ctype}_{d}_{r}")
+                cluster.append(f"{ctype}_{d}")
+        data[ctype] = (ids, np.array(vectors, dtype=np.float32), cluster)
+    queries = []
+    for _ in range(n_queries):
+        a, b = rng.choice(len(COLLECTION_TYPES), size=2, replace=False)
+        queries.append(_unit(centers[a] * rng.uniform(0.5, 1.0) + centers[b] * rng.uniform(0.0, 0.5)
+                             + 0.5 * _unit(rng.standard_normal(EMBEDDING_DIM))))
+    return data, queries
+
+
+def collection_order_search(client, query_vector, n_results: int, top_k: int) -> list[dict]:
+    """기존 구현처럼 컬렉션 순서대로 결과를 이어 붙이고 앞에서부터 top_k개를 씁니다. (비교 기준)"""
+    results, seen = [], set()
+    for ctype in COLLECTION_TYPES:
+        r = client.get_collection(name=COLLECTIONS[ctype]).query(
+            query_embeddings=[query_vector], n_results=n_results, include=["documents", "metadatas"])
+        for doc, meta in zip(r["documents"][0], r["metadatas"][0]):
+            if doc not in seen:
+                results.append({"doc": doc, "meta": meta})
+                seen.add(doc)
+    return results[:top_k]
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class FetchCounter:
+    """rag_service._query_collection을 감싸 질의마다 컬렉션에서 실제로 가져온 후보 수(재검색 포함)를 셉니다."""
+    def __init__(self):
+        self.count = 0
+        self._query_collection = rag_service._query_collection
+        rag_service._query_collection = self._wrapped
+
+    def _wrapped(self, *args, **kwargs):
+        candidates = self._query_collection(*args, **kwargs)
+        self.count += len(candidates or [])
+        return candidates
+
+
+def evaluate(search, queries, truth, top_k: int, counter: FetchCounter) -> dict:
+    recalls, clusters, latencies, fetched = [], [], [], []
+    for q, (query_vector, relevant) in enumerate(zip(queries, truth)):
+        counter.count = 0
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = search(q, query_vector)
+        latencies.append((time.perf_counter() - start) * 1000)
+        fetched.append(counter.count)
+        ids = [r["meta"]["doc_id"] for r in results]
+        recalls.append(len(set(ids) & relevant) / top_k)
+        clusters.append(len({r["meta"]["cluster"] for r in results}))
+    return {"recall": float(np.mean(recalls)), "clusters": float(np.mean(clusters)), "p50": _percentile(latencies, 50),
+            "fetched": float(np.mean(fetched))}
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="컬렉션 순서 결합과 거리 기반 전역 top-k(+MMR)의 정확도/다양성/지연을 비교합니다.")
+    parser.add_argument("--docs", type=int, default=300, help="컬렉션별 원본 문서 수")
+    parser.add_argument("--duplicates", type=int, default=2, help="문서별 거의 같은 중복 문서 수")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    data, queries = make_data(args.docs, args.duplicates, args.queries, args.seed)
+    all_ids = np.array([i for ids, _, _ in data.values() for i in ids])
+    all_vectors = np.concatenate([v for _, v, _ in data.values()])
+    # 정답: 전체 문서에 대한 정확한 코사인 유사도 상위 top_k
+    truth = [set(all_ids[np.argsort(-(all_vectors @ q))[:args.top_k]]) for q in queries]
+
+    with tempfile.TemporaryDirectory(prefix="bench-global-topk-") as tmp:
+        client = chromadb.PersistentClient(path=os.path.join(tmp, "chroma"))
+        for ctype, (ids, vectors, cluster) in data.items():
+            collection = client.create_collection(name=COLLECTIONS[ctype], embedding_function=None)
+            collection.add(ids=ids, embeddings=vectors.tolist(), documents=[f"문서 {i}" for i in ids],
+                           metadatas=[{"doc_id": i, "cluster": c} for i, c in zip(ids, cluster)])
+
+        query_texts = [f"질의 {q}" for q in range(len(queries))]
+        lookup = dict(zip(query_texts, queries))
+        rag_service.embedding_service = EmbeddingService(lambda texts: [lookup[t].tolist() for t in texts], model_name="benchmark")
+        rag_service.LEXICAL_INDEX_DIR = os.path.join(tmp, "lexical_index")  # 벡터 검색만 비교합니다.
+        fetch = rag_service._per_collection_fetch(args.top_k)
+        counter = FetchCounter()
+
+        # 후보 수는 질의당 평균으로, 상위 문서가 몰린 컬렉션을 top_k개로 다시 가져온 수까지 포함합니다.
+        cases = (
+            ("컬렉션 순서 (기존, 컬렉션당 3개)",
+             lambda q, v: collection_order_search(client, v.tolist(), 3, args.top_k)),
+            (f"전역 top-k (컬렉션당 {args.top_k}개, 정확)",
+             lambda q, v: rag_service._perform_search(client, query_texts[q], COLLECTION_TYPES, args.top_k, top_k=args.top_k)),
+            (f"전역 top-k (컬렉션당 {fetch}개 + 재검색)",
+             lambda q, v: rag_service._perform_search(client, query_texts[q], COLLECTION_TYPES, fetch, top_k=args.top_k)),
+            (f"전역 top-k + MMR (컬렉션당 {args.top_k}개)",
+             lambda q, v: rag_service._perform_search(client, query_texts[q], COLLECTION_TYPES, args.top_k, top_k=args.top_k, mmr=True)),
+        )
+        print(f"컬렉션 {len(COLLECTION_TYPES)}개 x 문서 {args.docs * (args.duplicates + 1)}개 (원본마다 거의 같은 중복 {args.duplicates}개), "
+              f"질의 {args.queries}개, top-{args.top_k}\n")
+        for name, search in cases:
+            r = evaluate(search, queries, truth, args.top_k, counter)
+            # 기존 방식은 rag_service를 거치지 않으므로 고정 후보 수를 표시합니다.
+            fetched = r["fetched"] or 3 * len(COLLECTION_TYPES)
+            print(f"  - {name:<30} Recall@{args.top_k} {r['recall']:.3f} | 서로 다른 원본 {r['clusters']:.2f}개 "
+                  f"| 후보 {fetched:4.1f}개 | p50 {r['p50']:6.2f}ms")
+
+if __name__ == "__main__":
+    main()
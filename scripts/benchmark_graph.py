@@ -0,0 +1,220 @@
+# scripts/benchmark_graph.py
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# 네트워크 없이 그래프 자체의 오버헤드만 측정하도록, src를 불러오기 전에 가짜 LLM 백엔드를 기본값으로 지정합니다.
+# (환경 변수로 이미 지정한 값이 있으면 그대로 사용합니다.)
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("LLM_CACHE_MODE", "off")
+os.environ.setdefault("LLM_WARMUP_PING", "false")
+os.environ.setdefault("CHECKPOINT_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="bench-graph-"), "checkpoints.sqlite"))
+
+# 가맹점별로 여러 턴을 이어가는 스크립트 대화 (의도별 경로: 단순 응답 / Planner / 단일 도구 / 프로필 답변)
+CONVERSATIONS = {
+    "cafe": [
+        "안녕하세요",
+        "요즘 카페 트렌드가 어때?",
+        "재방문율 30% 이하 매장 특성 분석해줘",
+        "신규 고객 유치 아이디어 줘",
+        "{카페***} 재방문율 4주 플랜 작성해줘",
+    ],
+    "restaurant": [
+        "우리 가게 프로필 보여줘",
+        "고객 관리 기법에 대해 알려줘",
+        "정부 지원사업 추천해줘",
+        "마케팅 관련 유튜브 영상 찾아줘",
+        "점심 매출 비교 분석해줘",
+    ],
+}
+
+PROFILE = {
+    "profile_id": "BENCH0001",
+    "core_data": {
+        "basic_info": {"store_name_masked": "벤치***", "industry_main": "카페", "address_district": "성동구",
+                       "business_age_months": 26},
+        "performance_metrics": {"sales_rank_in_district_percentile": 42.5},
+        "customer_profile": {"revisit_rate_latest_percent": 24.1, "new_customer_rate_latest_percent": 11.3},
+        "time_series_summary": {"sales_trend_6m": "하락", "revisit_rate_trend_6m": "정체"},
+    },
+}
+
+# ===============================================
+# 2. 계측 (노드 / 도구 / 체크포인트 저장)
+# ===============================================
+
+from langchain_core.callbacks import BaseCallbackHandler  # noqa: E402
+from langchain_core.messages import HumanMessage  # noqa: E402
+
+# 도구 레지스트리에 도구를 등록하는 모듈들 (graph_builder가 도구 설명을 읽기 전에 불러와야 합니다)
+TOOL_MODULES = [
+    "src.core.common_tools.rag_search_tool",
+    "src.core.common_tools.marketing_idea_tool",
+    "src.features.data_analysis.tool",
+    "src.features.action_card_generation.tool",
+    "src.features.policy_recommendation.tool",
+    "src.features.video_recommendation.tool",
+    "src.features.profile_management.tool",
+]
+
+SKIPPED_TOOL_MODULES = []
+with contextlib.redirect_stdout(io.StringIO()):
+    # 모듈 로딩 시 출력되는 도구 등록/연결 로그는 숨깁니다.
+    for module_name in TOOL_MODULES:
+        try:
+            importlib.import_module(module_name)
+        except ImportError as e:
+            SKIPPED_TOOL_MODULES.append(f"{module_name} ({e})")
+    from src.core import graph_builder  # noqa: E402
+    from src.core.llm_factory import llm_factory  # noqa: E402
+
+
+class Recorder:
+    """구간 이름별 지연 시간(ms)을 모읍니다. 병렬 실행 단계(스레드 풀)에서도 안전하게 기록합니다."""
+    def __init__(self):
+        self.samples = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def add(self, name: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.samples[name].append(elapsed_ms)
+
+
+class NodeTimer(BaseCallbackHandler):
+    """그래프 노드(router, planner, executor, synthesizer ...)의 시작/종료 콜백으로 노드 실행 시간을 잽니다."""
+    def __init__(self, recorder: Recorder):
+        self.recorder = recorder
+        self._starts = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, **kwargs):
+        name = kwargs.get("name")
+        if name in graph_builder.NODE_NAMES:
+            self._starts[run_id] = (name, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        started = self._starts.pop(run_id, None)
+        if started:
+            self.recorder.add(started[0], (time.perf_counter() - started[1]) * 1000)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._starts.pop(run_id, None)
+
+
+def instrument_tools(recorder: Recorder) -> None:
+    """Executor가 계획 단계를 실행하는 함수를 감싸서 도구별 실행 시간을 기록합니다. (병렬 DAG 실행 포함)"""
+    original_run_step = graph_builder._run_step
+
+    def timed_run_step(step, state):
+        start = time.perf_counter()
+        try:
+            return original_run_step(step, state)
+        finally:
+            recorder.add(step.get("tool_name", "unknown"), (time.perf_counter() - start) * 1000)
+
+    graph_builder._run_step = timed_run_step
+
+
+def instrument_checkpoints(recorder: Recorder) -> None:
+    """체크포인터의 put을 감싸서 체크포인트 저장 시간을 기록합니다."""
+    saver = graph_builder.memory
+    original_put = saver.put
+
+    def timed_put(config, checkpoint, metadata, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_put(config, checkpoint, metadata, *args, **kwargs)
+        finally:
+            recorder.add("checkpoint.put", (time.perf_counter() - start) * 1000)
+
+    saver.put = timed_put
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _stats(values: list[float]) -> dict:
+    return {"count": len(values), "p50": round(_percentile(values, 50), 3),
+            "p95": round(_percentile(values, 95), 3), "p99": round(_percentile(values, 99), 3)}
+
+
+def _print_table(title: str, samples: dict) -> None:
+    print(f"\n[{title}]")
+    for name, values in sorted(samples.items()):
+        s = _stats(values)
+        print(f"  - {name:<26} n={s['count']:<5} p50 {s['p50']:9.3f}ms | p95 {s['p95']:9.3f}ms | p99 {s['p99']:9.3f}ms")
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def run(repeat: int, verbose: bool) -> dict:
+    nodes, tools, checkpoints, turns = Recorder(), Recorder(), Recorder(), Recorder()
+    instrument_tools(tools)
+    instrument_checkpoints(checkpoints)
+    timer = NodeTimer(nodes)
+
+    for r in range(repeat):
+        for name, queries in CONVERSATIONS.items():
+            config = {"configurable": {"thread_id": f"bench-{name}-{r}"}, "callbacks": [timer]}
+            for i, query in enumerate(queries):
+                inputs = {"messages": [HumanMessage(content=query)]}
+                if i == 0:
+                    inputs["current_profile"] = PROFILE
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(sys.stdout if verbose else io.StringIO()):
+                    for _ in graph_builder.graph.stream(inputs, config=config):
+                        pass
+                turns.add("turn", (time.perf_counter() - start) * 1000)
+
+    return {"nodes": nodes.samples, "tools": tools.samples, "checkpoints": checkpoints.samples, "turns": turns.samples}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="가짜 LLM 백엔드로 스크립트 대화를 실행하여 노드/도구/체크포인트별 지연 시간 분포를 측정합니다.")
+    parser.add_argument("--repeat", type=int, default=5, help="스크립트 대화 전체를 반복할 횟수")
+    parser.add_argument("--json", type=str, default=None, help="결과(p50/p95/p99)를 저장할 JSON 파일 경로")
+    parser.add_argument("--verbose", action="store_true", help="그래프 실행 로그를 그대로 출력")
+    args = parser.parse_args()
+
+    print(f"LLM 백엔드: {llm_factory.backend} | 주입 지연: {os.getenv('FAKE_LLM_LATENCY_MS', '0')}ms/호출, "
+          f"{os.getenv('FAKE_LLM_CHUNK_DELAY_MS', '0')}ms/청크 | 체크포인트: {os.environ['CHECKPOINT_DB_PATH']}")
+    for skipped in SKIPPED_TOOL_MODULES:
+        print(f"⚠️ 도구 모듈을 불러오지 못해 건너뜁니다: {skipped}")
+    results = run(args.repeat, args.verbose)
+
+    _print_table("노드별", results["nodes"])
+    _print_table("도구별", results["tools"])
+    _print_table("체크포인트 저장", results["checkpoints"])
+    _print_table("턴 전체", results["turns"])
+
+    if args.json:
+        report = {group: {name: _stats(values) for name, values in samples.items()} for group, samples in results.items()}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+# scripts/benchmark_hybrid_search.py
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+import zlib
+from pathlib import Path
+
+import chromadb
+import numpy as np
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.lexical_index import LexicalIndex, build_index_from_collection  # noqa: E402
+from src.services import rag_service  # noqa: E402
+from src.services.embedding_service import EmbeddingService  # noqa: E402
+
+COLLECTION_NAME = "case_studies_and_policies"
+EMBEDDING_DIM = 384
+HASH_BUCKETS = 4096
+
+DISTRICTS = ["종로구", "중구", "용산구", "성동구", "광진구", "동대문구", "중랑구", "성북구", "강북구", "도봉구", "노원구", "은평구",
+             "서대문구", "마포구", "양천구", "강서구", "구로구", "금천구", "영등포구", "동작구", "관악구", "서초구", "강남구", "송파구", "강동구"]
+PREFIXES = ["희망", "미래", "청년", "상생", "동행", "든든", "새출발", "재도약", "온기", "디딤돌"]
+CORES = ["리턴", "스타트", "성장", "안심", "브릿지", "점프", "나눔", "상권"]
+SUFFIXES = ["패키지", "지원사업", "바우처", "프로젝트", "자금"]
+BODY_SENTENCES = [
+    "소상공인의 경영 안정과 매출 회복을 위해 지원합니다.", "신청 자격은 사업자 등록 후 6개월 이상 영업 중인 점포입니다.",
+    "컨설팅과 교육, 시설 개선 비용을 함께 지원합니다.", "온라인 판로 개척과 홍보 콘텐츠 제작을 돕습니다.",
+    "지원 규모는 점포당 최대 천만 원이며 자부담이 있습니다.", "접수는 온라인으로만 가능하며 서류 심사 후 선정합니다.",
+    "폐업 위기 점포의 업종 전환과 재창업을 지원합니다.", "배달 플랫폼 수수료 일부를 환급해 드립니다.",
+    "상권 활성화를 위한 공동 마케팅 비용을 지원합니다.", "친환경 포장재 교체 비용을 보조합니다.",
+]
+
+# ===============================================
+# 2. 합성 데이터 / 벡터 모델 대용
+# ===============================================
+
+def make_corpus(n_programs: int, chunks_per_program: int, seed: int):
+    """
+    지원사업 공고 청크를 만듭니다. 실제 적재 스크립트처럼 공고명/지역은 청크마다 메타데이터로 들어가고,
+    본문에는 첫 청크에만 공고명이 나옵니다. (벡터 검색은 본문만 임베딩하므로 나머지 청크의 공고명을 보지 못합니다)
+    """
+    rng = random.Random(seed)
+    names = [f"{p}{c}{s}" for p in PREFIXES for c in CORES for s in SUFFIXES]
+    rng.shuffle(names)
+    programs = [(names[i % len(names)] + ("" if i < len(names) else f" {i // len(names) + 1}기"), rng.choice(DISTRICTS))
+                for i in range(n_programs)]
+    ids, documents, metadatas = [], [], []
+    for p, (name, district) in enumerate(programs):
+        for c in range(chunks_per_program):
+            body = " ".join(rng.sample(BODY_SENTENCES, 3))
+            if c == 0:
+                body = f"[{district}] {name} 공고입니다. {body}"
+            ids.append(f"{COLLECTION_NAME}_{p}_{c}")
+            documents.append(body)
+            metadatas.append({"공고명": name, "지역": district, "source_file": f"{p}.txt"})
+    return programs, ids, documents, metadatas
+
+
+class ProjectionEmbeddingFunction:
+    """
+    문자 3-gram 해시 벡터를 384차원(기본 임베딩 모델과 같은 차원)으로 무작위 투영한 임베딩입니다. (오프라인 벤치마크용 벡터 모델 대용)
+    밀집 벡터처럼 전체 주제는 잘 맞추지만, 드문 고유명사의 정확한 일치는 흐려집니다.
+    실제 임베딩 모델에서의 수치는 실제 컬렉션으로 다시 측정해야 합니다.
+    """
+    def __init__(self, seed: int = 0):
+        self.projection = np.random.default_rng(seed).standard_normal((HASH_BUCKETS, EMBEDDING_DIM)).astype(np.float32)
+
+    def __call__(self, input):
+        vectors = np.zeros((len(input), HASH_BUCKETS), dtype=np.float32)
+        for row, text in enumerate(input):
+            for i in range(len(text) - 2):
+                vectors[row, zlib.crc32(text[i:i + 3].encode("utf-8")) % HASH_BUCKETS] += 1
+        dense = vectors @ self.projection
+        dense /= np.linalg.norm(dense, axis=1, keepdims=True) + 1e-9
+        return dense.tolist()
+
+    @staticmethod
+    def name() -> str:
+        return "benchmark-projection"
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def evaluate(client, queries: list[tuple[str, str]], k: int, hybrid: bool, relevant: int) -> dict:
+    """
+    질의마다 _perform_search로 상위 k개를 받아 지연을 재고, 정답 공고의 청크(질의당 relevant개)를 얼마나 찾았는지 계산합니다.
+    Recall@k = 찾은 정답 청크 수 / 정답 청크 수, Precision@k = 찾은 정답 청크 수 / k
+    """
+    rag_service.HYBRID_SEARCH_ENABLED = hybrid
+    recalls, precisions, latencies = [], [], []
+    for query, program in queries:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = rag_service._perform_search(client, query, ["case"], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits = sum(1 for r in results if r["meta"].get("공고명") == program)
+        recalls.append(hits / relevant)
+        precisions.append(hits / k)
+    return {"recall": sum(recalls) / len(recalls), "precision": sum(precisions) / len(precisions),
+            "p50": _percentile(latencies, 50), "p95": _percentile(latencies, 95)}
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 검색과 하이브리드(벡터 + BM25 문자 bigram, RRF) 검색의 Recall@k와 지연을 비교합니다.")
+    parser.add_argument("--programs", type=int, default=400, help="지원사업 공고 수")
+    parser.add_argument("--chunks", type=int, default=3, help="공고당 청크 수 (Recall@k의 정답 수)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--ks", type=str, default="1,3", help="k 목록 (쉼표 구분, 청크 수 이하)")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    programs, ids, documents, metadatas = make_corpus(args.programs, args.chunks, args.seed)
+    rng = random.Random(args.seed)
+    templates = ["{name} 신청 자격", "{district} {name} 지원 내용", "{name} 접수 방법 알려줘"]
+    queries = [(rng.choice(templates).format(name=name, district=district), name)
+               for name, district in rng.sample(programs, min(args.queries, len(programs)))]
+
+    ef = ProjectionEmbeddingFunction(args.seed)
+    with tempfile.TemporaryDirectory(prefix="bench-hybrid-") as tmp:
+        client = chromadb.PersistentClient(path=os.path.join(tmp, "chroma"))
+        collection = client.create_collection(name=COLLECTION_NAME, embedding_function=None)
+        collection.add(ids=ids, documents=documents, metadatas=metadatas, embeddings=ef(documents))
+
+        rag_service.LEXICAL_INDEX_DIR = os.path.join(tmp, "lexical_index")
+        rag_service.embedding_service = EmbeddingService(ef, model_name=ef.name())
+        start = time.perf_counter()
+        build_index_from_collection(collection, rag_service.lexical_index_path(COLLECTION_NAME))
+        build_s = time.perf_counter() - start
+        start = time.perf_counter()
+        index = LexicalIndex.open(rag_service.lexical_index_path(COLLECTION_NAME))
+        open_ms = (time.perf_counter() - start) * 1000
+        index_mb = sum(f.stat().st_size for f in Path(index.index_dir).iterdir()) / (1024 * 1024)
+
+        print(f"공고 {args.programs}개 x 청크 {args.chunks}개 = 문서 {len(ids)}개, 질의 {len(queries)}개")
+        print(f"역색인: 용어 {index.meta['n_terms']:,}개, {index_mb:.2f}MB, 생성 {build_s:.2f}s, 열기 {open_ms:.2f}ms (메모리 매핑)")
+        for k in [int(x) for x in args.ks.split(",")]:
+            print(f"\n[k={k}]")
+            for name, hybrid in (("벡터 검색만 (기존)", False), ("하이브리드 (벡터+BM25, RRF)", True)):
+                evaluate(client, queries[:5], k, hybrid, args.chunks)  # 워밍업
+                r = evaluate(client, queries, k, hybrid, args.chunks)
+                print(f"  - {name:<26} Recall@{k} {r['recall']:.3f} Precision@{k} {r['precision']:.3f} "
+                      f"| 검색 p50 {r['p50']:6.2f}ms p95 {r['p95']:6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
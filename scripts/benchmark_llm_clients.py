@@ -0,0 +1,95 @@
+# scripts/benchmark_llm_clients.py
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from langchain_google_genai import ChatGoogleGenerativeAI  # noqa: E402
+
+from src.config import LLM_ROLES, PRIMARY_MODEL_NAME  # noqa: E402
+from src.core.llm_factory import LLMFactory  # noqa: E402
+
+PING_PROMPT = "한 단어로만 답하세요: 안녕"
+
+# ===============================================
+# 2. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _summary(name: str, latencies_ms: list[float]) -> str:
+    return (f"  - {name:<28} 평균 {statistics.mean(latencies_ms):9.3f}ms | "
+            f"p50 {_percentile(latencies_ms, 50):9.3f}ms | p95 {_percentile(latencies_ms, 95):9.3f}ms")
+
+
+def _measure(func, iterations: int) -> list[float]:
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+# ===============================================
+# 3. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="호출마다 LLM 클라이언트를 새로 만드는 방식과 llm_factory 재사용 방식의 호출당 오버헤드를 비교합니다.")
+    parser.add_argument("--iterations", type=int, default=200, help="클라이언트 생성 비용 측정 반복 횟수")
+    parser.add_argument("--live", type=int, default=0, help="실제 API 호출 횟수 (0이면 네트워크 호출 없이 생성 비용만 측정)")
+    args = parser.parse_args()
+
+    factory = LLMFactory(LLM_ROLES)
+    api_key = factory.api_key() or "dummy-key-for-construction-benchmark"
+
+    print(f"[클라이언트 준비 비용] {args.iterations}회 반복")
+    before = _measure(lambda: ChatGoogleGenerativeAI(model=PRIMARY_MODEL_NAME, google_api_key=api_key, temperature=0.1),
+                      args.iterations)
+    after = _measure(lambda: factory.get("policy"), args.iterations)
+    print(_summary("호출마다 새로 생성 (기존)", before))
+    print(_summary("llm_factory 재사용", after))
+
+    try:
+        import google.generativeai as genai
+
+        def configure_each_call():
+            genai.configure(api_key=api_key)
+            genai.GenerativeModel(model_name=PRIMARY_MODEL_NAME, generation_config={"temperature": 0.2})
+
+        genai_before = _measure(configure_each_call, args.iterations)
+        genai_after = _measure(lambda: factory.get_genai_model("action_card", PRIMARY_MODEL_NAME, {"temperature": 0.2}, []),
+                               args.iterations)
+        print(_summary("genai configure+생성 (기존)", genai_before))
+        print(_summary("genai llm_factory 재사용", genai_after))
+    except ImportError:
+        print("  - google-generativeai 미설치로 genai 측정을 건너뜁니다.")
+
+    if args.live:
+        if not factory.api_key():
+            print("⚠️ GOOGLE_API_KEY가 없어 실제 호출 측정을 건너뜁니다.")
+            return
+        print(f"\n[실제 호출 지연 시간] {args.live}회 반복 (연결 수립/인증 비용 포함)")
+        fresh = _measure(lambda: ChatGoogleGenerativeAI(model=PRIMARY_MODEL_NAME, google_api_key=api_key,
+                                                        temperature=0.1).invoke(PING_PROMPT), args.live)
+        factory.warm_up(["policy"], ping=True)
+        pooled = _measure(lambda: factory.get("policy").invoke(PING_PROMPT), args.live)
+        print(_summary("호출마다 새 클라이언트 (기존)", fresh))
+        print(_summary("워밍업된 공용 클라이언트", pooled))
+        print(f"  - 호출당 절약: 평균 {statistics.mean(fresh) - statistics.mean(pooled):.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
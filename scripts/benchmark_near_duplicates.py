@@ -0,0 +1,211 @@
+# scripts/benchmark_near_duplicates.py
+import argparse
+import contextlib
+import io
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_PATH = PROJECT_ROOT / 'data'
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import NEAR_DUP_THRESHOLD  # noqa: E402
+from src.core.context_packer import _char_shingles, _jaccard, estimate_tokens  # noqa: E402
+from src.core.lexical_index import LexicalIndex, build_index  # noqa: E402
+from src.core.near_duplicate import NearDuplicateIndex, dedupe_chunks  # noqa: E402
+from src.services import rag_service  # noqa: E402
+
+# 적재 스크립트의 RecursiveCharacterTextSplitter 설정과 같은 값
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 100
+SEPARATORS = ["\n\n", "\n", ". ", " ", ""]
+EMBEDDING_DIM = 384  # 기본 임베딩 모델(all-MiniLM-L6-v2) 차원, float32 저장 기준
+
+# ===============================================
+# 2. 원본 데이터 읽기 / 청크 분할
+# ===============================================
+
+def _fix_name(name: str) -> str:
+    """zip에 cp949로 저장된 한글 파일명이 cp437로 읽힌 경우 되돌립니다."""
+    try:
+        return name.encode("cp437").decode("cp949")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return name
+
+
+def split_text(text: str, separators: list[str] = SEPARATORS) -> list[str]:
+    """
+    RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=100)와 같은 방식의 분할기입니다. (langchain 없이 실행하기 위함)
+    앞쪽 구분자로 나눈 조각을 CHUNK_SIZE까지 이어 붙이고, 다음 청크는 이전 청크 끝의 CHUNK_OVERLAP 이내 조각부터 시작합니다.
+    CHUNK_SIZE보다 긴 조각은 다음 구분자로 다시 나눕니다.
+    """
+    separator, rest = separators[0], separators[1:]
+    pieces = [p for p in (text.split(separator) if separator else list(text)) if p.strip()]
+    chunks, current = [], []
+
+    def flush():
+        if current:
+            chunks.append(separator.join(current).strip())
+
+    for piece in pieces:
+        if len(piece) > CHUNK_SIZE and rest:
+            flush()
+            current = []
+            chunks.extend(split_text(piece, rest))
+            continue
+        if current and len(separator.join(current + [piece])) > CHUNK_SIZE:
+            flush()
+            while current and (len(separator.join(current)) > CHUNK_OVERLAP
+                               or len(separator.join(current + [piece])) > CHUNK_SIZE):
+                current.pop(0)
+        current.append(piece)
+    flush()
+    return [c for c in chunks if c]
+
+
+def load_corpus() -> list[tuple[str, str, dict]]:
+    """data/*_txt.zip의 텍스트를 적재 스크립트처럼 청크로 나눠 (id, 청크, 메타데이터) 목록으로 반환합니다."""
+    corpus = []
+    for zip_path in sorted(DATA_PATH.glob("*_txt.zip")):
+        with zipfile.ZipFile(zip_path) as zf:
+            for name in sorted(n for n in zf.namelist() if n.endswith(".txt")):
+                filename = _fix_name(Path(name).name)
+                content = zf.read(name).decode("utf-8", errors="replace")
+                for i, chunk in enumerate(split_text(content)):
+                    corpus.append((f"{zip_path.stem}_{filename}_{i}", chunk,
+                                   {"source_group": zip_path.stem, "source_file": filename}))
+    return corpus
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def index_size(ids: list[str], chunks: list[str], tmp: str, name: str) -> dict:
+    """문서 수, 본문 크기, 임베딩 크기(추정), BM25 역색인 크기를 잽니다."""
+    index_dir = str(Path(tmp) / name)
+    build_index(index_dir, ids, chunks)
+    return {
+        "docs": len(ids),
+        "text_mb": sum(len(c.encode("utf-8")) for c in chunks) / (1024 * 1024),
+        "embedding_mb": len(ids) * EMBEDDING_DIM * 4 / (1024 * 1024),
+        "bm25_mb": sum(f.stat().st_size for f in Path(index_dir).iterdir()) / (1024 * 1024),
+        "index": LexicalIndex.open(index_dir),
+    }
+
+
+def top_k_prompt(index: LexicalIndex, texts: dict, metas: dict, query: str, k: int, collapse: bool) -> list[str]:
+    """BM25 상위 결과를 rag_service와 같은 규칙(정확히 같은 본문 제외, collapse이면 거의 같은 본문도 제외)으로 k개 고릅니다."""
+    selected, seen = [], set()
+    kept_signatures, kept_clusters = [], set()
+    for doc_id, _ in index.search(query, k * 4):
+        result = {"doc": texts[doc_id], "meta": metas[doc_id]}
+        if result["doc"] in seen:
+            continue
+        if collapse and rag_service._is_near_duplicate(result, kept_signatures, kept_clusters):
+            continue
+        seen.add(result["doc"])
+        selected.append(result["doc"])
+        if len(selected) >= k:
+            break
+    return selected
+
+
+def redundant_tokens(docs: list[str]) -> int:
+    """앞선 결과와 문자 3-gram Jaccard가 기준 이상인(실제로 거의 같은) 결과의 토큰 수"""
+    shingles = [_char_shingles(d, 3) for d in docs]
+    return sum(estimate_tokens(d) for i, d in enumerate(docs)
+               if any(_jaccard(shingles[i], shingles[j]) >= NEAR_DUP_THRESHOLD for j in range(i)))
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="MinHash 중복 청크 제거 전/후의 색인 크기와 검색 상위 k개의 프롬프트 토큰을 비교합니다.")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = load_corpus()
+    if not corpus:
+        print(f"⚠️ '{DATA_PATH}'에 *_txt.zip 데이터가 없습니다.")
+        return
+    ids = [c[0] for c in corpus]
+    chunks = [c[1] for c in corpus]
+    metadatas = [c[2] for c in corpus]
+
+    # 적재 시 서명 계산 + LSH 중복 판정 (drop / cluster)
+    start = time.perf_counter()
+    kept_ids, kept_chunks, kept_metas, duplicates = dedupe_chunks(ids, chunks, metadatas, NearDuplicateIndex(NEAR_DUP_THRESHOLD), "drop")
+    dedupe_ms = (time.perf_counter() - start) * 1000
+    _, _, cluster_metas, _ = dedupe_chunks(ids, chunks, metadatas, NearDuplicateIndex(NEAR_DUP_THRESHOLD), "cluster")
+
+    # 판정 검증: 버린 청크와 대표 청크의 실제 문자 3-gram Jaccard
+    kept = set(kept_ids)
+    texts = dict(zip(ids, chunks))
+    exact = [_jaccard(_char_shingles(texts[i], 3), _char_shingles(texts[m["dup_cluster"]], 3))
+             for i, m in zip(ids, cluster_metas) if i not in kept]
+    # 참고: 인접 청크(겹침 100자)끼리의 유사도 (분할 겹침만으로는 중복이 생기지 않음을 확인)
+    adjacent = [_jaccard(_char_shingles(chunks[i], 3), _char_shingles(chunks[i + 1], 3))
+                for i in range(len(chunks) - 1) if metadatas[i]["source_file"] == metadatas[i + 1]["source_file"]]
+
+    print(f"원본: {len({m['source_file'] for m in metadatas})}개 파일 -> 청크 {len(chunks):,}개 "
+          f"(chunk_size={CHUNK_SIZE}, overlap={CHUNK_OVERLAP})")
+    print(f"MinHash 서명 + LSH 판정: {dedupe_ms:.0f}ms (청크당 {dedupe_ms / len(chunks):.2f}ms), "
+          f"거의 같은 청크 {duplicates}개 ({duplicates / len(chunks):.1%})")
+    kept_texts = set(kept_chunks)
+    identical = sum(1 for i in ids if i not in kept and texts[i] in kept_texts)
+    print(f"  - 본문이 정확히 같은 청크 {identical}개 (기존 검색도 제외) / 조금 다른 청크 {duplicates - identical}개")
+    if exact:
+        print(f"  - 제외한 청크의 실제 Jaccard: 평균 {sum(exact) / len(exact):.3f}, 최소 {min(exact):.3f} (기준 {NEAR_DUP_THRESHOLD})")
+    print(f"  - 참고: 같은 파일의 인접 청크 Jaccard 평균 {sum(adjacent) / max(1, len(adjacent)):.3f}")
+
+    with tempfile.TemporaryDirectory(prefix="bench-near-dup-") as tmp:
+        before = index_size(ids, chunks, tmp, "before")
+        after = index_size(kept_ids, kept_chunks, tmp, "after")
+        print("\n[색인 크기]")
+        for name, r in (("중복 제거 전", before), ("중복 제거 후(drop)", after)):
+            print(f"  - {name:<14} 문서 {r['docs']:5,d}개 | 본문 {r['text_mb']:6.2f}MB | 임베딩 {r['embedding_mb']:6.2f}MB "
+                  f"| BM25 {r['bm25_mb']:6.2f}MB")
+
+        # 질의: 임의 청크의 문장 일부 (실제 질문처럼 특정 내용을 찾는 질의)
+        rng = random.Random(args.seed)
+        queries = []
+        for chunk in rng.sample(chunks, min(args.queries, len(chunks))):
+            start_pos = rng.randrange(max(1, len(chunk) - 40))
+            queries.append(chunk[start_pos:start_pos + 40])
+        metas = dict(zip(ids, metadatas))
+        cluster_by_id = dict(zip(ids, cluster_metas))
+
+        cases = (
+            ("중복 제거 전 (기존)", before["index"], texts, metas, False),
+            ("검색 시 병합 (서명 없음, 본문으로 계산)", before["index"], texts, metas, True),
+            ("검색 시 병합 (메타데이터 서명/클러스터)", before["index"], texts, cluster_by_id, True),
+            ("적재 시 제거 (drop)", after["index"], dict(zip(kept_ids, kept_chunks)), dict(zip(kept_ids, kept_metas)), False),
+        )
+        print(f"\n[프롬프트 토큰: 질의 {len(queries)}개, BM25 상위 {args.top_k}개]")
+        for name, index, case_texts, case_metas, collapse in cases:
+            tokens, redundant, latencies = [], [], []
+            for query in queries:
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(io.StringIO()):
+                    docs = top_k_prompt(index, case_texts, case_metas, query, args.top_k, collapse)
+                latencies.append((time.perf_counter() - start) * 1000)
+                tokens.append(sum(estimate_tokens(d) for d in docs))
+                redundant.append(redundant_tokens(docs))
+            total, dup = sum(tokens), sum(redundant)
+            print(f"  - {name:<28} 평균 {total / len(queries):7.1f}토큰 | 중복 결과 토큰 {dup / len(queries):6.1f} "
+                  f"({dup / max(1, total):5.1%}) | 검색+병합 평균 {sum(latencies) / len(latencies):5.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
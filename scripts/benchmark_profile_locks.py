@@ -0,0 +1,160 @@
+# scripts/benchmark_profile_locks.py
+import argparse
+import contextlib
+import io
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    # 싱글톤 생성 시 출력되는 ChromaDB 연결 로그는 숨깁니다.
+    from src.services.profile_service import ProfileManager  # noqa: E402
+
+# 실제 프로필과 비슷한 크기(수 KB)의 더미 프로필
+def make_profile(store_id: str) -> dict:
+    return {
+        "profile_id": store_id,
+        "core_data": {
+            "basic_info": {"store_name_masked": "벤치***", "industry_main": "카페", "address_district": "성동구"},
+            "performance_metrics": {f"metric_{i}": i * 1.5 for i in range(60)},
+            "customer_profile": {f"segment_{i}": f"{i}%" for i in range(60)},
+            "time_series_summary": {f"trend_{i}": "상승" if i % 2 else "하락" for i in range(30)},
+        },
+        "dynamic_data": {},
+    }
+
+# ===============================================
+# 2. 벤치마크용 컬렉션 / 기존 방식(전역 락) 재현
+# ===============================================
+
+class InMemoryProfileCollection:
+    """
+    ChromaDB 'store_profiles' 컬렉션의 get/upsert만 흉내 내는 인메모리 컬렉션입니다.
+    호출마다 지정한 시간만큼 대기하여 SQLite 조회/쓰기(I/O 동안 GIL을 놓는 구간)를 재현합니다.
+    """
+    def __init__(self, store_ids: list[str], read_latency_ms: float, write_latency_ms: float):
+        self._rows = {sid: ("문서", json.dumps(make_profile(sid), ensure_ascii=False)) for sid in store_ids}
+        self.read_latency_ms = read_latency_ms
+        self.write_latency_ms = write_latency_ms
+
+    def get(self, ids, include):
+        time.sleep(self.read_latency_ms / 1000)
+        rows = [(i, self._rows[i]) for i in ids if i in self._rows]
+        return {"ids": [i for i, _ in rows], "documents": [doc for _, (doc, _) in rows],
+                "metadatas": [{"profile_json": meta} for _, (_, meta) in rows]}
+
+    def upsert(self, ids, documents, metadatas):
+        time.sleep(self.write_latency_ms / 1000)
+        for i, doc, meta in zip(ids, documents, metadatas):
+            self._rows[i] = (doc, meta["profile_json"])
+
+
+class GlobalLockProfileManager(ProfileManager):
+    """기존 구현처럼 모든 조회/업데이트를 하나의 전역 락으로 직렬화합니다. (비교 기준)"""
+    def __init__(self, collection):
+        super().__init__(collection=collection)
+        self._global_lock = threading.Lock()
+
+    def get_profile(self, store_id):
+        with self._global_lock:
+            return super().get_profile(store_id)
+
+    def update_profile(self, store_id, section, key, data_to_update):
+        with self._global_lock:
+            return super().update_profile(store_id, section, key, data_to_update)
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def run(manager: ProfileManager, store_ids: list[str], readers: int, writers: int, ops: int, seed: int) -> dict:
+    """readers개의 조회 스레드와 writers개의 업데이트 스레드가 각각 ops번씩 임의의 가맹점에 접근합니다."""
+    latencies = {"read": [], "write": []}
+    lock = threading.Lock()
+    barrier = threading.Barrier(readers + writers + 1)
+
+    def worker(kind: str, worker_id: int):
+        rng = random.Random(seed * 1000 + worker_id)
+        local = []
+        barrier.wait()
+        for n in range(ops):
+            store_id = rng.choice(store_ids)
+            start = time.perf_counter()
+            if kind == "read":
+                manager.get_profile(store_id)
+            else:
+                manager.update_profile(store_id, "dynamic_data", "bench", {f"w{worker_id}": n})
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies[kind].extend(local)
+
+    threads = [threading.Thread(target=worker, args=("read", i)) for i in range(readers)]
+    threads += [threading.Thread(target=worker, args=("write", readers + i)) for i in range(writers)]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "ops_per_sec": (readers + writers) * ops / elapsed,
+        "read_p50": _percentile(latencies["read"], 50), "read_p95": _percentile(latencies["read"], 95),
+        "write_p50": _percentile(latencies["write"], 50), "write_p95": _percentile(latencies["write"], 95),
+    }
+
+
+def _print_result(name: str, r: dict) -> None:
+    print(f"  - {name:<24} {r['ops_per_sec']:9.1f} ops/s | 조회 p50 {r['read_p50']:7.2f}ms p95 {r['read_p95']:7.2f}ms "
+          f"| 업데이트 p50 {r['write_p50']:7.2f}ms p95 {r['write_p95']:7.2f}ms")
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="ProfileManager의 전역 락과 store_id별 읽기-쓰기 락의 동시 처리량을 비교합니다.")
+    parser.add_argument("--readers", type=str, default="1,4,16", help="조회 스레드 수 목록 (쉼표 구분)")
+    parser.add_argument("--writers", type=int, default=2, help="업데이트 스레드 수")
+    parser.add_argument("--stores", type=int, default=200, help="가맹점 수 (적을수록 같은 가맹점에 대한 쓰기 경합이 커집니다)")
+    parser.add_argument("--ops", type=int, default=200, help="스레드당 작업 수")
+    parser.add_argument("--read-latency-ms", type=float, default=1.0, help="컬렉션 조회 1회의 I/O 지연")
+    parser.add_argument("--write-latency-ms", type=float, default=3.0, help="컬렉션 쓰기 1회의 I/O 지연")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    store_ids = [f"STORE{i:05d}" for i in range(args.stores)]
+    print(f"가맹점 {args.stores}개, 업데이트 스레드 {args.writers}개, 스레드당 {args.ops}회 "
+          f"(조회 {args.read_latency_ms}ms / 쓰기 {args.write_latency_ms}ms I/O 가정)")
+
+    for readers in [int(n) for n in args.readers.split(",")]:
+        print(f"\n[조회 스레드 {readers}개]")
+        results = {}
+        for name, cls in (("전역 락 (기존)", GlobalLockProfileManager), ("store_id별 RW 락", ProfileManager)):
+            collection = InMemoryProfileCollection(store_ids, args.read_latency_ms, args.write_latency_ms)
+            manager = cls(collection)
+            with contextlib.redirect_stdout(io.StringIO()):
+                results[name] = run(manager, store_ids, readers, args.writers, args.ops, args.seed)
+            _print_result(name, results[name])
+        baseline, improved = results.values()
+        print(f"  => 처리량 {improved['ops_per_sec'] / baseline['ops_per_sec']:.1f}배")
+
+
+if __name__ == "__main__":
+    main()
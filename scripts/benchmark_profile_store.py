@@ -0,0 +1,166 @@
+# scripts/benchmark_profile_store.py
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.profile_store import ProfileStore  # noqa: E402
+
+COLLECTION_NAME = "store_profiles"
+# ChromaDB는 임베딩이 필요하므로, 임베딩 모델 없이 적재할 수 있도록 작은 고정 벡터를 직접 넣습니다.
+EMBEDDING_DIM = 8
+CHROMA_BATCH_SIZE = 5000
+STORE_BATCH_SIZE = 10000
+
+
+def make_profile(i: int) -> dict:
+    """실제 프로필과 비슷한 구조/크기(약 2~3KB)의 더미 프로필 (ENCODED_MCT 형식의 ID)"""
+    rng = random.Random(i)
+    store_id = f"{i:010X}"
+    return {
+        "profile_id": store_id,
+        "core_data": {
+            "basic_info": {"store_name_masked": f"가게{i % 997}***", "industry_main": rng.choice(["카페", "한식", "치킨", "베이커리"]),
+                           "address_district": rng.choice(["성동구", "마포구", "강남구"]), "business_age_months": rng.randint(1, 240)},
+            "performance_metrics": {f"metric_{k}": round(rng.random() * 100, 2) for k in range(40)},
+            "customer_profile": {
+                "revisit_rate_latest_percent": round(rng.random() * 60, 1),
+                "new_customer_rate_latest_percent": round(rng.random() * 30, 1),
+                "top_customer_segments": [{"segment": f"{20 + 10 * k}대 여성", "ratio": rng.randint(5, 40)} for k in range(3)],
+            },
+            "time_series_summary": {f"trend_{k}": rng.choice(["상승", "하락", "정체"]) for k in range(20)},
+        },
+        "extended_features": {"is_franchise": rng.random() < 0.3, "has_delivery_service": rng.random() < 0.5},
+        "dynamic_data": {},
+    }
+
+# ===============================================
+# 2. 적재 / 조회 (조회는 메모리 측정을 위해 별도 프로세스에서 실행)
+# ===============================================
+
+def build_chroma(path: str, n: int) -> None:
+    import chromadb
+
+    client = chromadb.PersistentClient(path=path)
+    collection = client.create_collection(name=COLLECTION_NAME, embedding_function=None)
+    for start in range(0, n, CHROMA_BATCH_SIZE):
+        profiles = [make_profile(i) for i in range(start, min(n, start + CHROMA_BATCH_SIZE))]
+        collection.add(
+            ids=[p["profile_id"] for p in profiles],
+            embeddings=[[random.random() for _ in range(EMBEDDING_DIM)] for _ in profiles],
+            documents=[f"{p['core_data']['basic_info']['industry_main']} 가맹점" for p in profiles],
+            metadatas=[{"profile_json": json.dumps(p, ensure_ascii=False)} for p in profiles],
+        )
+
+
+def build_store(path: str, n: int) -> None:
+    store = ProfileStore(path)
+    for start in range(0, n, STORE_BATCH_SIZE):
+        store.put_many((p["profile_id"], p) for p in (make_profile(i) for i in range(start, min(n, start + STORE_BATCH_SIZE))))
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def lookup_worker(backend: str, path: str, ids: list, queue) -> None:
+    """기존 방식(ChromaDB 메타데이터 + json.loads) 또는 프로필 저장소로 프로필을 조회하고 지연 시간과 메모리 증가량을 보고합니다."""
+    if backend == "chroma":
+        import chromadb
+
+        rss_before = _rss_mb()
+        collection = chromadb.PersistentClient(path=path).get_collection(name=COLLECTION_NAME, embedding_function=None)
+
+        def lookup(store_id):
+            result = collection.get(ids=[store_id], include=["metadatas"])
+            return json.loads(result["metadatas"][0]["profile_json"])
+    else:
+        rss_before = _rss_mb()
+        store = ProfileStore(path)
+        lookup = store.get
+
+    latencies = []
+    for store_id in ids:
+        start = time.perf_counter()
+        profile = lookup(store_id)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert profile["profile_id"] == store_id
+    queue.put({"latencies": latencies, "rss_mb": _rss_mb() - rss_before})
+
+
+def _dir_size_mb(path: str) -> float:
+    if os.path.isfile(path):
+        files = [p for p in (path, path + "-wal", path + "-shm") if os.path.exists(p)]
+    else:
+        files = [os.path.join(root, f) for root, _, names in os.walk(path) for f in names]
+    return sum(os.path.getsize(f) for f in files) / (1024 * 1024)
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(backend: str, path: str, ids: list) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=lookup_worker, args=(backend, path, ids, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    lat = result["latencies"]
+    return {"p50": _percentile(lat, 50), "p95": _percentile(lat, 95), "p99": _percentile(lat, 99),
+            "rss_mb": result["rss_mb"], "disk_mb": _dir_size_mb(path)}
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="ChromaDB 메타데이터(JSON 문자열)와 전용 프로필 저장소의 조회 지연/메모리/파일 크기를 비교합니다.")
+    parser.add_argument("--sizes", type=str, default="4000,400000", help="가맹점 수 목록 (쉼표 구분)")
+    parser.add_argument("--lookups", type=int, default=2000, help="무작위 ID 조회 횟수")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    for n in [int(s) for s in args.sizes.split(",")]:
+        rng = random.Random(args.seed)
+        ids = [f"{rng.randrange(n):010X}" for _ in range(args.lookups)]
+        print(f"\n[가맹점 {n:,}개, 무작위 조회 {args.lookups:,}회]")
+        with tempfile.TemporaryDirectory(prefix="bench-profile-store-") as tmp:
+            chroma_path, store_path = os.path.join(tmp, "chroma"), os.path.join(tmp, "profiles.sqlite")
+            for name, backend, path, build in (("ChromaDB 메타데이터 (기존)", "chroma", chroma_path, build_chroma),
+                                               ("ProfileStore (SQLite)", "store", store_path, build_store)):
+                start = time.perf_counter()
+                build(path, n)
+                build_s = time.perf_counter() - start
+                r = measure(backend, path, ids)
+                print(f"  - {name:<26} 적재 {build_s:7.1f}s | 조회 p50 {r['p50']:6.3f}ms p95 {r['p95']:6.3f}ms "
+                      f"p99 {r['p99']:6.3f}ms | RSS +{r['rss_mb']:7.1f}MB | 파일 {r['disk_mb']:8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
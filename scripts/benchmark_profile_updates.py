@@ -0,0 +1,162 @@
+# scripts/benchmark_profile_updates.py
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+with contextlib.redirect_stdout(io.StringIO()):
+    # 싱글톤 생성 시 출력되는 ChromaDB 연결 로그는 숨깁니다.
+    from src.services.profile_service import ProfileManager  # noqa: E402
+from src.core.profile_store import ProfileStore, ProfileWriteBehind  # noqa: E402
+
+import chromadb  # noqa: E402
+from chromadb import Documents, EmbeddingFunction, Embeddings  # noqa: E402
+
+COLLECTION_NAME = "store_profiles"
+EMBEDDING_DIM = 8
+
+
+def make_profile(store_id: str) -> dict:
+    """실제 프로필과 비슷한 크기(수 KB)의 더미 프로필"""
+    return {
+        "profile_id": store_id,
+        "core_data": {
+            "basic_info": {"store_name_masked": "벤치***", "industry_main": "카페", "address_district": "성동구"},
+            "performance_metrics": {f"metric_{i}": i * 1.5 for i in range(60)},
+            "customer_profile": {f"segment_{i}": f"{i}%" for i in range(60)},
+        },
+        "dynamic_data": {},
+    }
+
+# ===============================================
+# 2. 임베딩 비용 재현 / 기존 방식(문서 upsert) 재현
+# ===============================================
+
+class CostlyEmbeddingFunction(EmbeddingFunction):
+    """문서 1개당 지정한 시간만큼 대기하여 임베딩 모델 호출 비용을 재현하고, 호출 횟수를 셉니다."""
+    def __init__(self, cost_ms: float = 0.0):
+        self.cost_ms = cost_ms
+        self.calls = 0
+
+    def __call__(self, input: Documents) -> Embeddings:
+        self.calls += len(input)
+        time.sleep(self.cost_ms * len(input) / 1000)
+        return [[float(len(doc) % 7)] + [0.0] * (EMBEDDING_DIM - 1) for doc in input]
+
+    @staticmethod
+    def name() -> str:
+        return "benchmark-costly"
+
+    def get_config(self) -> dict:
+        return {"cost_ms": self.cost_ms}
+
+    @staticmethod
+    def build_from_config(config: dict) -> "CostlyEmbeddingFunction":
+        return CostlyEmbeddingFunction(config.get("cost_ms", 0.0))
+
+
+class DocumentUpsertCollection:
+    """기존 구현처럼 업데이트마다 문서를 다시 읽어 upsert(=재임베딩)하는 컬렉션 래퍼입니다. (비교 기준)"""
+    def __init__(self, collection):
+        self._collection = collection
+
+    def get(self, *args, **kwargs):
+        return self._collection.get(*args, **kwargs)
+
+    def update(self, ids, metadatas):
+        documents = self._collection.get(ids=ids, include=["documents"])["documents"]
+        self._collection.upsert(ids=ids, documents=documents, metadatas=metadatas)
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))] if ordered else 0.0
+
+
+def build(tmp: str, store_ids: list[str], embed_ms: float):
+    """검색용 문서(+프로필 메타데이터)를 넣은 ChromaDB 컬렉션과 프로필 저장소를 만듭니다."""
+    embedding_function = CostlyEmbeddingFunction(embed_ms)
+    collection = chromadb.PersistentClient(path=os.path.join(tmp, "chroma")).create_collection(
+        name=COLLECTION_NAME, embedding_function=embedding_function)
+    profiles = [make_profile(sid) for sid in store_ids]
+    collection.add(
+        ids=store_ids,
+        embeddings=[[random.random() for _ in range(EMBEDDING_DIM)] for _ in store_ids],
+        documents=[f"{p['core_data']['basic_info']['industry_main']} 가맹점 {p['profile_id']}" for p in profiles],
+        metadatas=[{"profile_json": json.dumps(p, ensure_ascii=False)} for p in profiles],
+    )
+    store = ProfileStore(os.path.join(tmp, "profiles.sqlite"))
+    store.put_many((p["profile_id"], p) for p in profiles)
+    return collection, embedding_function, store
+
+
+def run(manager: ProfileManager, store_ids: list[str], updates: int, seed: int) -> dict:
+    """임의의 가맹점에 updates번 업데이트하고, 호출자가 기다린 시간과 남은 쓰기를 저장하기까지의 총 시간을 잽니다."""
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    for n in range(updates):
+        store_id = rng.choice(store_ids)
+        t0 = time.perf_counter()
+        assert manager.update_profile(store_id, "dynamic_data", "bench", {"n": n})
+        latencies.append((time.perf_counter() - t0) * 1000)
+    manager.flush()
+    elapsed = time.perf_counter() - start
+    return {"p50": _percentile(latencies, 50), "p95": _percentile(latencies, 95),
+            "updates_per_sec": updates / elapsed}
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="프로필 업데이트 방식(문서 upsert / 메타데이터만 / 저장소 / write-behind)별 지연을 비교합니다.")
+    parser.add_argument("--stores", type=int, default=200, help="가맹점 수 (적을수록 write-behind에서 합쳐지는 업데이트가 많아집니다)")
+    parser.add_argument("--updates", type=int, default=500, help="업데이트 횟수")
+    parser.add_argument("--embed-ms", type=float, default=20.0, help="문서 1개 임베딩 비용 (ms)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    store_ids = [f"STORE{i:05d}" for i in range(args.stores)]
+    print(f"가맹점 {args.stores}개, 업데이트 {args.updates}회 (문서 임베딩 1회 {args.embed_ms}ms 가정)\n")
+
+    with tempfile.TemporaryDirectory(prefix="bench-profile-updates-") as tmp:
+        collection, embedding_function, store = build(tmp, store_ids, args.embed_ms)
+        cases = (
+            ("ChromaDB 문서 upsert (기존)", lambda: ProfileManager(collection=DocumentUpsertCollection(collection))),
+            ("ChromaDB 메타데이터만 update", lambda: ProfileManager(collection=collection)),
+            ("ProfileStore 즉시 쓰기", lambda: ProfileManager(collection=collection, store=store)),
+            ("ProfileStore + write-behind", lambda: ProfileManager(
+                collection=collection, store=store, write_behind=ProfileWriteBehind(store, flush_interval=0.5)))
+        )
+        for name, factory in cases:
+            manager = factory()
+            calls_before = embedding_function.calls
+            with contextlib.redirect_stdout(io.StringIO()):
+                r = run(manager, store_ids, args.updates, args.seed)
+            extra = ""
+            stats = manager.write_behind_stats()
+            if stats:
+                extra = f" | 저장 {stats['batches']}회({stats['written']}건, 합쳐진 업데이트 {stats['merged']}건)"
+            print(f"  - {name:<28} 업데이트 p50 {r['p50']:7.3f}ms p95 {r['p95']:7.3f}ms | "
+                  f"{r['updates_per_sec']:8.1f} 건/s | 임베딩 {embedding_function.calls - calls_before}회{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# scripts/benchmark_query_embedding.py
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services import rag_service  # noqa: E402
+from src.services.embedding_service import DiskEmbeddingCache, EmbeddingService  # noqa: E402
+from src.utils.cache import TTLCache  # noqa: E402
+
+COLLECTION_TYPES = ["strategy", "guide", "trend", "case", "video"]
+EMBEDDING_DIM = 384
+
+# ===============================================
+# 2. 벤치마크용 임베딩 함수 / 컬렉션
+# ===============================================
+
+class CpuEmbeddingFunction:
+    """텍스트 1개당 지정한 시간만큼 CPU를 사용(GIL을 쥔 채 대기)하여 CPU 임베딩 모델을 재현하고, 사용 시간을 기록합니다."""
+    def __init__(self, cost_ms: float):
+        self.cost_ms = cost_ms
+        self.texts = 0
+        self.total_ms = 0.0
+
+    def __call__(self, input):
+        start = time.perf_counter()
+        end = start + self.cost_ms * len(input) / 1000
+        while time.perf_counter() < end:
+            pass
+        self.texts += len(input)
+        self.total_ms += (time.perf_counter() - start) * 1000
+        return [[random.random() for _ in range(EMBEDDING_DIM)] for _ in input]
+
+    @staticmethod
+    def name() -> str:
+        return "benchmark-cpu"
+
+
+class SimulatedCollection:
+    """query_texts로 검색하면 컬렉션의 임베딩 함수를 호출하고, query_embeddings로 검색하면 인덱스 조회 시간만 듭니다."""
+    def __init__(self, name: str, embedding_function: CpuEmbeddingFunction, search_latency_ms: float):
+        self.name = name
+        self.embedding_function = embedding_function
+        self.search_latency_ms = search_latency_ms
+
+    def query(self, n_results, include, query_texts=None, query_embeddings=None):
+        if query_embeddings is None:
+            query_embeddings = self.embedding_function(query_texts)
+        time.sleep(self.search_latency_ms / 1000)
+        docs = [f"{self.name} 문서 {i}" for i in range(n_results)]
+        return {"ids": [[f"{self.name}_{i}" for i in range(n_results)]], "documents": [docs],
+                "metadatas": [[{"title": doc} for doc in docs]], "distances": [[0.1 * (i + 1) for i in range(n_results)]]}
+
+
+class SimulatedClient:
+    def __init__(self, embedding_function: CpuEmbeddingFunction, search_latency_ms: float):
+        self.embedding_function = embedding_function
+        self.search_latency_ms = search_latency_ms
+
+    def get_collection(self, name: str):
+        return SimulatedCollection(name, self.embedding_function, self.search_latency_ms)
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def make_queries(distinct: int, repeats: int, seed: int) -> list[str]:
+    """같은 질문이 공백만 다르게 반복되는 질의 목록 (정규화 후 같은 캐시 키가 됩니다)"""
+    base = [f"성수동 카페 재방문율 높이는 방법 {i}" for i in range(distinct)]
+    queries = [q if r == 0 else f"  {q.replace(' ', '  ')} " for r in range(repeats) for q in base]
+    random.Random(seed).shuffle(queries)
+    return queries
+
+
+def run(service: EmbeddingService | None, client: SimulatedClient, queries: list[str]) -> dict:
+    """질의마다 _perform_search를 실행하고, 질의 임베딩 시간과 나머지 검색 시간을 따로 잽니다."""
+    embed_ms_list, total_ms_list = [], []
+
+    def timed_embed(query):
+        start = time.perf_counter()
+        try:
+            return service.embed_query(query) if service is not None else None
+        finally:
+            embed_ms_list.append((time.perf_counter() - start) * 1000)
+
+    ef = client.embedding_function
+    texts_before, ef_ms_before = ef.texts, ef.total_ms
+    original = rag_service._embed_query
+    rag_service._embed_query = timed_embed
+    try:
+        for query in queries:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                rag_service._perform_search(client, query, COLLECTION_TYPES, 3)
+            total_ms_list.append((time.perf_counter() - start) * 1000)
+    finally:
+        rag_service._embed_query = original
+    search_ms_list = [t - e for t, e in zip(total_ms_list, embed_ms_list)]
+    return {
+        "total_p50": _percentile(total_ms_list, 50),
+        "embed_avg": sum(embed_ms_list) / len(embed_ms_list),
+        "search_avg": sum(search_ms_list) / len(search_ms_list),
+        "model_texts": ef.texts - texts_before,
+        "model_ms": ef.total_ms - ef_ms_before,
+    }
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="컬렉션별 질의 임베딩과 한 번 임베딩(+LRU/디스크 캐시)의 검색 지연을 비교합니다.")
+    parser.add_argument("--distinct", type=int, default=20, help="서로 다른 질문 수")
+    parser.add_argument("--repeats", type=int, default=3, help="질문별 반복 횟수 (공백만 다른 변형 포함)")
+    parser.add_argument("--embed-ms", type=float, default=15.0, help="텍스트 1개 임베딩 CPU 시간")
+    parser.add_argument("--search-ms", type=float, default=5.0, help="벡터 1개로 컬렉션 1개를 조회하는 시간")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    queries = make_queries(args.distinct, args.repeats, args.seed)
+    print(f"컬렉션 {len(COLLECTION_TYPES)}개, 질의 {len(queries)}회 (서로 다른 질문 {args.distinct}개), "
+          f"임베딩 {args.embed_ms}ms(CPU) / 조회 {args.search_ms}ms 가정\n")
+
+    ef = CpuEmbeddingFunction(args.embed_ms)
+    client = SimulatedClient(ef, args.search_ms)
+    with tempfile.TemporaryDirectory(prefix="bench-embedding-") as tmp:
+        disk_cache = DiskEmbeddingCache(os.path.join(tmp, "embedding_cache.sqlite"))
+        cases = (
+            ("컬렉션별 임베딩 (기존)", None),
+            ("한 번 임베딩 (캐시 없음)", EmbeddingService(ef, model_name=ef.name())),
+            ("한 번 임베딩 + LRU/디스크 캐시", EmbeddingService(ef, model_name=ef.name(), cache=TTLCache(2048, 3600),
+                                                    disk_cache=disk_cache)),
+            # 재시작 후: 메모리 캐시는 비어 있고 디스크 캐시만 남아 있는 상태
+            ("재시작 후 (디스크 캐시만)", EmbeddingService(ef, model_name=ef.name(), cache=TTLCache(2048, 3600),
+                                                 disk_cache=disk_cache)),
+        )
+        for name, service in cases:
+            r = run(service, client, queries)
+            print(f"  - {name:<26} 검색 p50 {r['total_p50']:7.1f}ms | 질의 임베딩 평균 {r['embed_avg']:6.2f}ms "
+                  f"+ 컬렉션 검색 평균 {r['search_avg']:6.1f}ms | 모델 호출 {r['model_texts']:4d}건 ({r['model_ms']:7.0f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+# scripts/benchmark_rag_fanout.py
+import argparse
+import contextlib
+import io
+import sys
+import time
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services import rag_service  # noqa: E402
+from src.services.rag_service import COLLECTIONS, _perform_search  # noqa: E402
+
+COLLECTION_TYPES = ["strategy", "guide", "trend", "case", "video"]
+
+# ===============================================
+# 2. 벤치마크용 클라이언트 / 기존 방식(순차 검색) 재현
+# ===============================================
+
+class SimulatedCollection:
+    """query 호출마다 지정한 시간만큼 대기하여 쿼리 임베딩 + 인덱스 조회(I/O 동안 GIL을 놓는 구간)를 재현합니다."""
+    def __init__(self, name: str, query_latency_ms: float):
+        self.name = name
+        self.query_latency_ms = query_latency_ms
+
+    def query(self, query_texts, n_results, include):
+        time.sleep(self.query_latency_ms / 1000)
+        docs = [f"{self.name} 문서 {i}: {query_texts[0]}" for i in range(n_results)]
+        return {"ids": [[f"{self.name}_{i}" for i in range(n_results)]], "documents": [docs],
+                "metadatas": [[{"title": doc} for doc in docs]], "distances": [[0.1 * (i + 1) for i in range(n_results)]]}
+
+
+class SimulatedClient:
+    """get_collection 호출마다 지정한 시간만큼 대기합니다. slow_collection은 slow_latency_ms만큼 느리게 응답합니다."""
+    def __init__(self, lookup_latency_ms: float, query_latency_ms: float, slow_collection: str | None = None,
+                 slow_latency_ms: float = 0.0):
+        self.lookup_latency_ms = lookup_latency_ms
+        self.query_latency_ms = query_latency_ms
+        self.slow_collection = slow_collection
+        self.slow_latency_ms = slow_latency_ms
+
+    def get_collection(self, name: str):
+        time.sleep(self.lookup_latency_ms / 1000)
+        latency = self.slow_latency_ms if name == self.slow_collection else self.query_latency_ms
+        return SimulatedCollection(name, latency)
+
+
+def sequential_search(client, query: str, collection_types: list[str], n_results: int) -> list[dict]:
+    """기존 구현처럼 컬렉션마다 get_collection과 query를 순서대로 호출합니다. (비교 기준)"""
+    all_results, seen_docs = [], set()
+    for ctype in collection_types:
+        collection = client.get_collection(name=COLLECTIONS[ctype])
+        results = collection.query(query_texts=[query], n_results=n_results, include=["documents", "metadatas"])
+        for doc, meta in zip(results["documents"][0], results["metadatas"][0]):
+            if doc not in seen_docs:
+                all_results.append({"doc": doc, "meta": meta, "collection": ctype})
+                seen_docs.add(doc)
+    return all_results
+
+# ===============================================
+# 3. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(search, client, collection_types: list[str], repeats: int) -> dict:
+    latencies, count = [], 0
+    for n in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            count = len(search(client, f"질문 {n}", collection_types, 3))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {"p50": _percentile(latencies, 50), "p95": _percentile(latencies, 95), "results": count}
+
+# ===============================================
+# 4. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG 컬렉션 순차 검색과 동시 검색(핸들 캐시 + 타임아웃)의 지연을 비교합니다.")
+    parser.add_argument("--types", type=str, default="1,3,5", help="검색할 컬렉션 종류 수 목록 (쉼표 구분)")
+    parser.add_argument("--repeats", type=int, default=20, help="조건별 검색 횟수")
+    parser.add_argument("--lookup-latency-ms", type=float, default=5.0, help="get_collection 1회 지연")
+    parser.add_argument("--query-latency-ms", type=float, default=40.0, help="컬렉션 query 1회 지연")
+    parser.add_argument("--slow-latency-ms", type=float, default=5000.0, help="느린 컬렉션 시나리오에서 한 컬렉션의 query 지연")
+    parser.add_argument("--slow-repeats", type=int, default=10, help="느린 컬렉션 시나리오에서 첫 검색 이후 연속 검색 횟수")
+    args = parser.parse_args()
+
+    print(f"get_collection {args.lookup_latency_ms}ms, query {args.query_latency_ms}ms 가정 "
+          f"(동시 검색 스레드 {rag_service.RAG_MAX_WORKERS}개, 타임아웃 {rag_service.RAG_QUERY_TIMEOUT_SECONDS}s)")
+    client = SimulatedClient(args.lookup_latency_ms, args.query_latency_ms)
+    for n in [int(t) for t in args.types.split(",")]:
+        types = COLLECTION_TYPES[:n]
+        base = measure(sequential_search, client, types, args.repeats)
+        fanout = measure(_perform_search, client, types, args.repeats)
+        print(f"\n[컬렉션 {n}종]")
+        print(f"  - 순차 검색 (기존)          p50 {base['p50']:7.1f}ms p95 {base['p95']:7.1f}ms | 결과 {base['results']}건")
+        print(f"  - 동시 검색 + 핸들 캐시     p50 {fanout['p50']:7.1f}ms p95 {fanout['p95']:7.1f}ms | 결과 {fanout['results']}건")
+        print(f"  => {base['p50'] / fanout['p50']:.1f}배")
+
+    # 느린 컬렉션에 검색을 반복해도, 시간 초과된 검색이 풀 스레드를 차지한 채 쌓여 다른 컬렉션까지 밀리지 않는지 확인합니다.
+    types = COLLECTION_TYPES
+    slow = SimulatedClient(args.lookup_latency_ms, args.query_latency_ms, COLLECTIONS[types[-1]], args.slow_latency_ms)
+    first = measure(_perform_search, slow, types, 1)
+    rest = measure(_perform_search, slow, types, args.slow_repeats)
+    print(f"\n[컬렉션 5종 중 '{COLLECTIONS[types[-1]]}'이 {args.slow_latency_ms / 1000:.0f}s 지연, 연속 검색 {1 + args.slow_repeats}회]")
+    print(f"  - 첫 검색 (타임아웃 대기)    {first['p50']:7.1f}ms | 결과 {first['results']}건 (느린 컬렉션 제외)")
+    print(f"  - 이후 검색                  p50 {rest['p50']:7.1f}ms p95 {rest['p95']:7.1f}ms | 결과 {rest['results']}건 "
+          f"(실행 중인 느린 컬렉션은 건너뜀)")
+
+
+if __name__ == "__main__":
+    main()
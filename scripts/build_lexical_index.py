@@ -0,0 +1,58 @@
+# scripts/build_lexical_index.py
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import chromadb
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_PATH = PROJECT_ROOT / 'data'
+CHROMA_DB_PATH = str(DATA_PATH / 'chroma_db')
+
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.config import LEXICAL_INDEX_DIR  # noqa: E402
+from src.core.lexical_index import build_index_from_collection  # noqa: E402
+
+# 색인할 컬렉션 (src/services/rag_service.py의 COLLECTIONS와 같습니다)
+COLLECTION_NAMES = [
+    "store_profiles",
+    "strategies_and_theories",
+    "practical_guides",
+    "market_trends_and_data",
+    "learning_videos",
+    "case_studies_and_policies",
+]
+
+# ===============================================
+# 2. 메인 실행 로직
+# ===============================================
+
+def main():
+    """
+    ChromaDB 컬렉션마다 BM25(문자 bigram) 역색인을 만들어 LEXICAL_INDEX_DIR/<컬렉션 이름>에 저장합니다.
+    적재 스크립트(populate_rag_data*.py)는 업로드 후 자동으로 색인을 다시 만들므로, 기존 DB에 처음 적용할 때 사용합니다.
+    """
+    parser = argparse.ArgumentParser(description="ChromaDB 컬렉션별 BM25 역색인을 만듭니다.")
+    parser.add_argument("--collections", type=str, default=",".join(COLLECTION_NAMES), help="컬렉션 이름 목록 (쉼표 구분)")
+    args = parser.parse_args()
+
+    client = chromadb.PersistentClient(path=CHROMA_DB_PATH)
+    existing = {c.name for c in client.list_collections()}
+    for name in args.collections.split(","):
+        if name not in existing:
+            print(f"⚠️ '{name}' 컬렉션이 없어 건너뜁니다.")
+            continue
+        start = time.perf_counter()
+        index_dir = str(PROJECT_ROOT / LEXICAL_INDEX_DIR / name)
+        count = build_index_from_collection(client.get_collection(name=name), index_dir)
+        print(f"✅ '{name}': 문서 {count}개 색인 완료 ({time.perf_counter() - start:.1f}s) -> {index_dir}")
+
+
+if __name__ == "__main__":
+    main()
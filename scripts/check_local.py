@@ -1,7 +1,8 @@
 # check_local_db.py
 import chromadb
+import os
+import sys
 from pathlib import Path
-import json
 
 # --- 설정 ---
 # 프로젝트 루트를 기준으로 DB 경로를 설정합니다.
@@ -9,6 +10,13 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_PATH = PROJECT_ROOT / 'data'
 LOCAL_CHROMA_DB_PATH = str(DATA_PATH / 'chroma_db')
 
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.config import PROFILE_STORE_PATH  # noqa: E402
+from src.core.profile_store import ProfileStore  # noqa: E402
+
+# 프로필 본문이 저장된 키-값 저장소 경로 (store_profiles 컬렉션에는 검색용 요약 문서만 있습니다)
+PROFILE_STORE_FILE = str(PROJECT_ROOT / PROFILE_STORE_PATH)
+
 # 확인할 컬렉션 목록 (migrate 스크립트와 동일하게)
 COLLECTIONS_TO_CHECK = [
     "store_profiles",
@@ -44,6 +52,9 @@ def main():
         print(f"❌ 컬렉션 목록을 가져오는 데 실패했습니다: {e}")
         return
 
+    # 프로필 저장소가 없으면 새로 만들지 않도록, 파일이 있을 때만 엽니다.
+    profile_store = ProfileStore(PROFILE_STORE_FILE) if os.path.exists(PROFILE_STORE_FILE) else None
+
     # --- 3. 각 컬렉션별 상세 정보 확인 ---
     all_collections_ok = True
     for collection_name in COLLECTIONS_TO_CHECK:
@@ -79,12 +90,16 @@ def main():
                 print(f"\n    [샘플 {i+1}]")
                 print(f"    - ID: {doc_id}")
                 
-                # 'store_profiles' 컬렉션은 메타데이터의 JSON을 예쁘게 출력
-                if collection_name == 'store_profiles' and 'profile_json' in metadata:
-                    profile = json.loads(metadata['profile_json'])
-                    store_name = profile.get('core_data', {}).get('basic_info', {}).get('store_name_masked', 'N/A')
-                    print(f"    - 가맹점명: {store_name}")
-                    print("    - 메타데이터: (프로필 JSON, 정상)")
+                # 'store_profiles' 컬렉션은 같은 ID의 프로필 본문이 프로필 저장소에 있는지 확인
+                if collection_name == 'store_profiles':
+                    profile = profile_store.get(doc_id) if profile_store is not None else None
+                    if profile is None:
+                        print(f"    ❌ 오류: 프로필 저장소('{PROFILE_STORE_FILE}')에 이 ID의 프로필이 없습니다!")
+                        all_collections_ok = False
+                    else:
+                        store_name = profile.get('core_data', {}).get('basic_info', {}).get('store_name_masked', 'N/A')
+                        print(f"    - 가맹점명: {store_name}")
+                        print("    - 프로필 저장소: (프로필 JSON, 정상)")
                 else:
                     print(f"    - 메타데이터: {metadata}")
                 
@@ -0,0 +1,129 @@
+# scripts/evaluate_intent_classifier.py
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import LOCAL_INTENT_CONFIDENCE_THRESHOLD  # noqa: E402
+from src.core.intent_classifier import FEW_SHOT_EXAMPLES, _classify_with_llm  # noqa: E402
+from src.core.local_intent_classifier import (  # noqa: E402
+    CONVERSATION_LOG_PATH,
+    LocalIntentClassifier,
+    load_labelled_examples_from_log,
+)
+
+# ===============================================
+# 2. 유틸리티 함수
+# ===============================================
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def _latency_summary(name: str, latencies_ms: list[float]) -> str:
+    if not latencies_ms:
+        return f"  - {name}: 측정값 없음"
+    return (f"  - {name}: 평균 {statistics.mean(latencies_ms):.3f}ms | "
+            f"p50 {_percentile(latencies_ms, 50):.3f}ms | p95 {_percentile(latencies_ms, 95):.3f}ms | "
+            f"최대 {max(latencies_ms):.3f}ms")
+
+
+def _load_queries(path: str | None) -> list[str]:
+    if not path:
+        return []
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+# ===============================================
+# 3. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 의도 분류기를 LLM 레이블과 비교하여 정확도/지연 시간을 평가합니다.")
+    parser.add_argument("--log", default=CONVERSATION_LOG_PATH, help="레이블이 포함된 대화 로그 CSV 경로")
+    parser.add_argument("--queries", default=None, help="추가로 평가할 질문 목록 파일 (한 줄에 하나)")
+    parser.add_argument("--threshold", type=float, default=LOCAL_INTENT_CONFIDENCE_THRESHOLD, help="로컬 분류 신뢰도 임계값")
+    parser.add_argument("--no-llm", action="store_true", help="LLM을 호출하지 않고 예시/로그의 레이블을 정답으로 사용")
+    args = parser.parse_args()
+
+    train_examples = FEW_SHOT_EXAMPLES + load_labelled_examples_from_log(args.log)
+    eval_items = [(ex["input"], ex["output"], i) for i, ex in enumerate(train_examples)]
+    eval_items += [(q, None, None) for q in _load_queries(args.queries)]
+
+    if args.no_llm:
+        eval_items = [item for item in eval_items if item[1] is not None]
+    print(f"학습 예시 {len(train_examples)}건, 평가 질문 {len(eval_items)}건 (임계값 {args.threshold})")
+
+    full_classifier = LocalIntentClassifier().fit(train_examples)
+
+    local_latencies, llm_latencies = [], []
+    correct = covered = covered_correct = 0
+    mismatches = []
+
+    for query, stored_label, train_idx in eval_items:
+        # --- 1. 정답 레이블: LLM 분류 결과 (또는 저장된 레이블) ---
+        if args.no_llm:
+            reference = stored_label
+        else:
+            start = time.perf_counter()
+            try:
+                reference = _classify_with_llm(query)
+            except Exception as e:
+                print(f"⚠️ LLM 분류 실패로 건너뜀: '{query}' ({e})")
+                continue
+            llm_latencies.append((time.perf_counter() - start) * 1000)
+
+        # --- 2. 로컬 분류: 학습 세트에 있는 질문은 자기 자신을 제외하고(leave-one-out) 평가 ---
+        classifier = full_classifier
+        if train_idx is not None:
+            classifier = LocalIntentClassifier().fit(train_examples[:train_idx] + train_examples[train_idx + 1:])
+
+        start = time.perf_counter()
+        predicted, confidence = classifier.predict(query)
+        local_latencies.append((time.perf_counter() - start) * 1000)
+
+        is_correct = predicted == reference
+        correct += is_correct
+        if confidence >= args.threshold:
+            covered += 1
+            covered_correct += is_correct
+            if not is_correct:
+                mismatches.append((query, reference, predicted, confidence))
+
+    total = len(local_latencies)
+    if not total:
+        print("평가할 질문이 없습니다.")
+        return
+
+    print("\n" + "=" * 50)
+    print("[정확도]")
+    print(f"  - 로컬 분류기 전체 정확도: {correct / total:.1%} ({correct}/{total})")
+    print(f"  - 임계값 통과율(LLM 생략 비율): {covered / total:.1%} ({covered}/{total})")
+    if covered:
+        print(f"  - 임계값 통과 질문의 정확도: {covered_correct / covered:.1%} ({covered_correct}/{covered})")
+    print("[질문당 지연 시간]")
+    print(_latency_summary("로컬 분류기", local_latencies))
+    if llm_latencies:
+        print(_latency_summary("LLM 분류", llm_latencies))
+
+    if mismatches:
+        print("[임계값을 통과했지만 LLM과 다른 예측]")
+        for query, reference, predicted, confidence in mismatches:
+            print(f"  - '{query}': LLM={reference}, 로컬={predicted} (신뢰도 {confidence:.2f})")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# scripts/migrate_profiles_to_store.py
+import json
+import sys
+from pathlib import Path
+
+from tqdm import tqdm
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.config import PROFILE_STORE_PATH  # noqa: E402
+from src.core.profile_store import ProfileStore  # noqa: E402
+from src.services.rag_service import get_chroma_client  # noqa: E402
+
+COLLECTION_NAME = "store_profiles"
+PROFILE_STORE_FILE = str(PROJECT_ROOT / PROFILE_STORE_PATH)
+
+# 한 번에 가져올 데이터 개수 (메모리 사용량에 따라 조절)
+BATCH_SIZE = 1000
+
+# ===============================================
+# 2. 메인 실행 로직
+# ===============================================
+
+def main():
+    """
+    기존 ChromaDB 'store_profiles' 컬렉션 메타데이터의 profile_json을 프로필 저장소로 옮깁니다.
+    (scripts/populate_chromadb.py로 새로 적재하는 경우에는 필요 없습니다)
+    """
+    client = get_chroma_client()
+    if client is None:
+        print("❌ ChromaDB 클라이언트를 만들 수 없습니다.")
+        return
+    collection = client.get_collection(name=COLLECTION_NAME)
+    store = ProfileStore(PROFILE_STORE_FILE)
+
+    total = collection.count()
+    print(f"'{COLLECTION_NAME}' 컬렉션의 프로필 {total}개를 '{PROFILE_STORE_FILE}'로 옮깁니다.")
+    migrated = 0
+    for offset in tqdm(range(0, total, BATCH_SIZE), desc="프로필 이전 중"):
+        batch = collection.get(include=["metadatas"], limit=BATCH_SIZE, offset=offset)
+        items = [(store_id, json.loads(meta["profile_json"]))
+                 for store_id, meta in zip(batch["ids"], batch["metadatas"]) if meta and meta.get("profile_json")]
+        migrated += store.put_many(items)
+
+    print(f"\n✅ 프로필 {migrated}개 이전 완료 (저장소 전체 {store.count()}개)")
+
+
+if __name__ == "__main__":
+    main()
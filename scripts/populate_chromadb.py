@@ -2,6 +2,7 @@
 import chromadb
 import json
 import os
+import sys
 from tqdm import tqdm
 from pathlib import Path
 
@@ -21,6 +22,14 @@ CHROMA_DB_PATH = str(DATA_PATH / 'chroma_db')
 COLLECTION_NAME = "store_profiles"
 BATCH_SIZE = 100
 
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.config import LEXICAL_INDEX_DIR, PROFILE_STORE_PATH  # noqa: E402
+from src.core.lexical_index import build_index_from_collection  # noqa: E402
+from src.core.profile_store import ProfileStore  # noqa: E402
+
+# 프로필 본문을 저장할 키-값 저장소 경로 (ChromaDB에는 검색용 요약 문서만 저장합니다)
+PROFILE_STORE_FILE = str(PROJECT_ROOT / PROFILE_STORE_PATH)
+
 # ===============================================
 # 2. 핵심 함수: 검색용 문서 생성기 (고도화 버전)
 # ===============================================
@@ -117,8 +126,8 @@ def main():
 
     # --- 3. 데이터 준비 ---
     documents = []
-    metadatas = []
     ids = []
+    store_items = []
 
     for profile in tqdm(profiles, desc="프로필 데이터 준비 중"):
         if not profile.get('profile_id'):
@@ -128,13 +137,16 @@ def main():
         doc = create_document_from_profile(profile)
         documents.append(doc)
         
-        # 검색 결과로 원본 전체 JSON을 참조할 수 있도록 메타데이터에 저장
-        meta = {"profile_json": json.dumps(profile, ensure_ascii=False)}
-        metadatas.append(meta)
+        # 원본 전체 JSON은 ChromaDB 메타데이터 대신 프로필 저장소에 저장 (ID로 바로 조회)
+        store_items.append((str(profile['profile_id']), profile))
         
         # 각 문서의 고유 ID 설정
         ids.append(str(profile['profile_id'])) # ID는 문자열이어야 함
 
+    print(f"프로필 본문을 '{PROFILE_STORE_FILE}' 저장소에 저장합니다.")
+    saved = ProfileStore(PROFILE_STORE_FILE).put_many(store_items)
+    print(f"프로필 저장소에 {saved}개의 프로필을 저장했습니다.")
+
     # --- 4. ChromaDB에 데이터 일괄 적재 ---
     total_batches = (len(ids) + BATCH_SIZE - 1) // BATCH_SIZE
     print(f"데이터를 {BATCH_SIZE}개씩 나누어 총 {total_batches}개의 배치로 적재합니다.")
@@ -142,18 +154,20 @@ def main():
     for i in tqdm(range(0, len(ids), BATCH_SIZE), desc="ChromaDB에 적재 중"):
         batch_ids = ids[i:i+BATCH_SIZE]
         batch_documents = documents[i:i+BATCH_SIZE]
-        batch_metadatas = metadatas[i:i+BATCH_SIZE]
         
         # add 메서드를 사용하여 데이터를 컬렉션에 추가
         collection.add(
             ids=batch_ids,
             documents=batch_documents,
-            metadatas=batch_metadatas
         )
         
     print("\nChromaDB 데이터 적재 완료!")
     print(f"'{COLLECTION_NAME}' 컬렉션에 총 {collection.count()}개의 프로필이 저장되었습니다.")
     print(f"데이터베이스는 '{CHROMA_DB_PATH}' 디렉토리에 저장되었습니다.")
+
+    # 컬렉션을 새로 만들었으므로 BM25 역색인도 다시 만듭니다. (하이브리드 검색용, 예전 색인이 남지 않도록)
+    index_count = build_index_from_collection(collection, str(PROJECT_ROOT / LEXICAL_INDEX_DIR / COLLECTION_NAME))
+    print(f"✅ BM25 역색인 갱신 완료 (문서 {index_count}개)")
     
     # --- 5. 테스트 쿼리 ---
     print("\n--- 테스트 쿼리 실행 ---")
@@ -2,6 +2,7 @@
 
 import chromadb
 import os
+import sys
 import re
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from tqdm import tqdm
@@ -15,6 +16,11 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_PATH = PROJECT_ROOT / 'data'
 CHROMA_DB_PATH = str(DATA_PATH / 'chroma_db')
 
+sys.path.insert(0, str(PROJECT_ROOT))
+from src.config import LEXICAL_INDEX_DIR, NEAR_DUP_ENABLED, NEAR_DUP_MODE, NEAR_DUP_THRESHOLD  # noqa: E402
+from src.core.lexical_index import build_index_from_collection  # noqa: E402
+from src.core.near_duplicate import dedupe_chunks, index_from_collection  # noqa: E402
+
 COLLECTION_NAME = "case_studies_and_policies"
 DATA_FOLDER_PATH = DATA_PATH / "rag_sources/서울_지원사업_txt"
 
@@ -107,6 +113,14 @@ def main():
         except Exception as e:
             print(f"\n⚠️ 파일 '{filename}' 처리 중 오류 발생: {e}")
 
+    # --- 거의 같은 청크 처리 (MinHash 서명을 메타데이터에 저장하고, 기존/앞선 청크와 거의 같으면 버리거나 묶음) ---
+    if all_chunks and NEAR_DUP_ENABLED:
+        dup_index = index_from_collection(collection, NEAR_DUP_THRESHOLD)
+        all_ids, all_chunks, all_metadatas, duplicates = dedupe_chunks(
+            all_ids, all_chunks, all_metadatas, dup_index, NEAR_DUP_MODE)
+        action = "제외" if NEAR_DUP_MODE == "drop" else "클러스터로 묶음"
+        print(f"🔁 거의 같은 청크 {duplicates}개 {action} (추정 유사도 {NEAR_DUP_THRESHOLD} 이상)")
+
     if all_chunks:
         print(f"\n총 {len(all_chunks)}개의 청크를 ChromaDB에 업로드합니다...")
         
@@ -118,6 +132,9 @@ def main():
             )
             print("✅ 업로드 완료!")
             print(f"'{COLLECTION_NAME}' 컬렉션의 최종 문서 수: {collection.count()}")
+            # 컬렉션 전체 문서로 BM25 역색인을 다시 만듭니다. (하이브리드 검색용)
+            index_count = build_index_from_collection(collection, str(PROJECT_ROOT / LEXICAL_INDEX_DIR / COLLECTION_NAME))
+            print(f"✅ BM25 역색인 갱신 완료 (문서 {index_count}개)")
         except Exception as e:
             print(f"❌ 업로드 실패: {e}")
 
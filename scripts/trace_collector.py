@@ -0,0 +1,119 @@
+# scripts/trace_collector.py
+import argparse
+import json
+import sys
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# ===============================================
+# 1. 설정 변수
+# ===============================================
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+# OpenTelemetry Collector의 OTLP/HTTP 기본 수신 경로
+TRACES_PATH = "/v1/traces"
+
+# ===============================================
+# 2. 스팬 정리 / 요약
+# ===============================================
+
+def _attr_value(value: dict):
+    for key in ("stringValue", "boolValue", "doubleValue"):
+        if key in value:
+            return value[key]
+    if "intValue" in value:
+        return int(value["intValue"])
+    return None
+
+
+def flatten_otlp(payload: dict) -> list[dict]:
+    """OTLP/HTTP JSON 요청 본문을 JSONL 내보내기와 같은 형태의 스팬 딕셔너리 목록으로 변환합니다."""
+    spans = []
+    for resource_spans in payload.get("resourceSpans", []):
+        for scope_spans in resource_spans.get("scopeSpans", []):
+            for span in scope_spans.get("spans", []):
+                attributes = {a["key"]: _attr_value(a["value"]) for a in span.get("attributes", [])}
+                start, end = int(span["startTimeUnixNano"]), int(span["endTimeUnixNano"])
+                spans.append({
+                    "name": span["name"],
+                    "trace_id": span["traceId"],
+                    "span_id": span["spanId"],
+                    "parent_id": span.get("parentSpanId") or None,
+                    "thread_id": attributes.pop("thread_id", None) or None,
+                    "start_ns": start,
+                    "end_ns": end,
+                    "duration_ms": round((end - start) / 1e6, 3),
+                    "status": "error" if span.get("status", {}).get("code") == 2 else "ok",
+                    "attributes": attributes,
+                })
+    return spans
+
+
+def print_turn_breakdown(spans: list[dict]) -> None:
+    """턴(루트 스팬)마다 하위 스팬을 트리로 출력하여, 턴의 시간이 어디에 쓰였는지 보여줍니다."""
+    children = defaultdict(list)
+    for span in spans:
+        children[span["parent_id"]].append(span)
+
+    def _print(span: dict, depth: int) -> None:
+        attrs = {k: v for k, v in span["attributes"].items() if k in
+                 ("input_tokens", "output_tokens", "cache_hit", "llm_cache_hits", "result_count", "result_chars", "error")}
+        print(f"{'  ' * depth}- {span['name']:<40} {span['duration_ms']:9.1f}ms {attrs if attrs else ''}")
+        for child in sorted(children[span["span_id"]], key=lambda s: s["start_ns"]):
+            _print(child, depth + 1)
+
+    for turn in sorted((s for s in spans if s["name"] == "turn"), key=lambda s: s["start_ns"]):
+        print(f"\n[thread_id={turn['thread_id']}] trace {turn['trace_id'][:8]}")
+        _print(turn, 1)
+
+# ===============================================
+# 3. 메인 실행 로직
+# ===============================================
+
+def main():
+    parser = argparse.ArgumentParser(description="OTLP/HTTP(JSON) 트레이스를 받아 JSONL로 저장하는 로컬 수집기입니다. (OpenTelemetry Collector 대용)")
+    parser.add_argument("--port", type=int, default=4318, help="수신 포트 (OTLP/HTTP 기본값 4318)")
+    parser.add_argument("--output", type=str, default="logs/collected_traces.jsonl", help="받은 스팬을 저장할 JSONL 파일")
+    parser.add_argument("--summarize", type=str, default=None, help="서버를 띄우지 않고, 지정한 JSONL 파일의 턴별 시간 분해만 출력")
+    args = parser.parse_args()
+
+    if args.summarize:
+        with open(args.summarize, encoding="utf-8") as f:
+            print_turn_breakdown([json.loads(line) for line in f if line.strip()])
+        return
+
+    Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != TRACES_PATH:
+                self.send_response(404)
+                self.end_headers()
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            spans = flatten_otlp(json.loads(body or b"{}"))
+            with open(args.output, "a", encoding="utf-8") as f:
+                for span in spans:
+                    f.write(json.dumps(span, ensure_ascii=False) + "\n")
+            print_turn_breakdown(spans)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b"{}")
+
+        def log_message(self, format, *args):
+            pass  # 요청마다 찍히는 기본 접근 로그는 숨깁니다.
+
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), Handler)
+    print(f"📡 OTLP/HTTP 수집기 대기 중: http://localhost:{args.port}{TRACES_PATH} -> {args.output}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,184 @@
+import os
+
 # --- LLM 모델 설정 ---
 # 이 변수만 수정하면 프로젝트 전체의 모델이 변경됩니다.
 PRIMARY_MODEL_NAME = "gemini-2.5-flash"
 # 만약 의도 분류 등 빠른 작업에 다른 모델을 쓴다면 추가
 FAST_MODEL_NAME = "gemini-2.5-flash" 
+
+# 역할별 LLM 클라이언트 설정: 역할 -> (모델, 온도). llm_factory가 이 조합마다 클라이언트를 하나씩 만들어 재사용합니다.
+LLM_ROLES = {
+    "default": (PRIMARY_MODEL_NAME, 0.0),
+    "orchestrator": (PRIMARY_MODEL_NAME, 0.0),   # Router/Planner/Synthesizer
+    "intent": (PRIMARY_MODEL_NAME, 0.0),
+    "summary": (FAST_MODEL_NAME, 0.0),
+    "marketing": (PRIMARY_MODEL_NAME, 0.7),      # 창의성을 위해 온도를 약간 높임
+    "policy": (PRIMARY_MODEL_NAME, 0.1),
+    "video": (PRIMARY_MODEL_NAME, 0.3),
+    "data_analysis": (PRIMARY_MODEL_NAME, 0.0),
+}
+# True이면 앱(main_app) 시작 시 역할별 클라이언트에 짧은 호출을 보내 연결/인증을 미리 맺어둡니다. (False이면 객체 생성만)
+# 역할마다 실제 API 요청이 나가므로 기본값은 꺼져 있습니다.
+LLM_WARMUP_PING = os.getenv("LLM_WARMUP_PING", "false").lower() in ("1", "true", "yes")
+# LLM 백엔드: gemini(실제 API) / fake(네트워크 없이 고정 응답을 돌려주는 벤치마크용 가짜 LLM)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "gemini").lower()
+# fake 백엔드에 주입할 지연 시간(ms): 호출당 첫 토큰까지의 지연, 스트리밍 청크당 지연
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "0"))
+FAKE_LLM_CHUNK_DELAY_MS = float(os.getenv("FAKE_LLM_CHUNK_DELAY_MS", "0"))
+
+
+# --- 의도 분류 설정 ---
+# 로컬 분류기(문자 n-gram TF-IDF kNN)의 신뢰도가 이 값 이상이면 LLM 호출 없이 바로 답합니다.
+# 1.0보다 크게 설정하면 로컬 분류기를 사실상 끌 수 있습니다.
+LOCAL_INTENT_CONFIDENCE_THRESHOLD = 0.75
+
+# 정규화된 질문 -> 의도 캐시 (최대 항목 수, 만료 시간(초))
+INTENT_CACHE_MAXSIZE = 2048
+INTENT_CACHE_TTL_SECONDS = 6 * 60 * 60
+
+# --- 그래프 실행 모드 설정 ---
+# True이면 Planner가 필요한 의도에 대해 의도 분류와 계획 수립을 한 번의 LLM 호출로 처리합니다. (A/B 테스트용 플래그)
+FUSED_ROUTER_PLANNER = os.getenv("FUSED_ROUTER_PLANNER", "false").lower() in ("1", "true", "yes")
+
+# True이면 반복되는 단순 요청 형태(의도 + 질문 패턴)에 대해 LLM Planner 대신 계획 템플릿을 사용합니다.
+PLAN_TEMPLATES_ENABLED = os.getenv("PLAN_TEMPLATES_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# True이면 Executor가 depends_on을 명시한 다단계 계획을 의존성 순서대로 한 번에 실행하고, 독립적인 단계는 동시에 실행합니다.
+# depends_on이 없는 계획과 최종 답변을 낼 수 있는 도구의 단계는 기존처럼 순서대로 실행합니다.
+PARALLEL_EXECUTOR_ENABLED = os.getenv("PARALLEL_EXECUTOR", "true").lower() in ("1", "true", "yes")
+# 동시에 실행할 수 있는 계획 단계(도구 호출)의 최대 수
+EXECUTOR_MAX_WORKERS = 4
+
+# True이면 그래프를 공용 이벤트 루프에서 graph.astream(비동기 노드/도구)으로 실행합니다.
+ASYNC_GRAPH_ENABLED = os.getenv("ASYNC_GRAPH", "false").lower() in ("1", "true", "yes")
+
+# True이면 최종 답변을 토큰 단위로 스트리밍하여 UI에 바로 표시합니다. (graph.astream_events 사용)
+STREAMING_ENABLED = os.getenv("STREAMING", "true").lower() in ("1", "true", "yes")
+
+
+# --- RAG 검색 설정 ---
+# 여러 컬렉션을 동시에 검색할 때 사용할 스레드 수
+RAG_MAX_WORKERS = 5
+# 컬렉션 하나의 검색을 기다리는 최대 시간(초). 넘으면 그 컬렉션 결과 없이 나머지 결과만 사용합니다.
+RAG_QUERY_TIMEOUT_SECONDS = float(os.getenv("RAG_QUERY_TIMEOUT_SECONDS", "3.0"))
+# 여러 컬렉션의 결과를 관련도 순으로 합친 뒤 최종적으로 사용할 문서 수
+RAG_TOP_K = 5
+# 컬렉션별로 처음 가져올 후보 수 = ceil(RAG_TOP_K * 배수) (기본 0.4 -> 2개, 기존 고정값 3개보다 적음)
+# 마지막 후보까지 전역 top-k에 든 컬렉션만 RAG_TOP_K개로 다시 가져오므로 전역 top-k는 그대로 정확합니다. (MMR 사용 시에는 RAG_TOP_K개씩)
+RAG_CANDIDATE_FACTOR = float(os.getenv("RAG_CANDIDATE_FACTOR", "0.4"))
+# True이면 최종 문서를 MMR(Maximal Marginal Relevance)로 골라 비슷한 문서가 중복되지 않게 합니다.
+RAG_MMR_ENABLED = os.getenv("RAG_MMR_ENABLED", "false").lower() in ("1", "true", "yes")
+# MMR의 관련도 가중치 (1이면 관련도만, 0이면 다양성만 고려)
+RAG_MMR_LAMBDA = 0.7
+# True이면 벡터 검색과 BM25(문자 bigram 역색인) 검색 결과를 RRF로 합칩니다. 색인이 없는 컬렉션은 벡터 검색만 사용합니다.
+HYBRID_SEARCH_ENABLED = os.getenv("HYBRID_SEARCH_ENABLED", "true").lower() in ("1", "true", "yes")
+# 컬렉션별 역색인을 저장하는 디렉토리 (적재 스크립트 또는 scripts/build_lexical_index.py가 생성)
+LEXICAL_INDEX_DIR = os.getenv("LEXICAL_INDEX_DIR", os.path.join("data", "lexical_index"))
+# 합치기 전에 각 검색 방식에서 가져올 후보 수 = n_results * 배수 (최종 결과 수는 n_results 그대로)
+HYBRID_CANDIDATE_MULTIPLIER = 2
+# RRF 점수 = Σ 1 / (RRF_K + 순위)
+RRF_K = 60
+
+# --- 중복 청크 탐지 설정 ---
+# 적재 시 청크마다 MinHash 서명(문자 3-gram)을 계산해 메타데이터에 저장하고, 거의 같은 청크를 버리거나(drop) 묶습니다(cluster).
+# 검색 시에도 같은 서명으로 거의 같은 결과를 하나만 남깁니다.
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() in ("1", "true", "yes")
+# 추정 Jaccard 유사도가 이 값 이상이면 중복으로 봅니다. (컨텍스트 압축의 중복 제거 기준과 같은 값)
+NEAR_DUP_THRESHOLD = 0.8
+# drop: 중복 청크를 적재하지 않음 / cluster: 모두 적재하고 대표 청크 ID를 메타데이터(dup_cluster)에 기록
+NEAR_DUP_MODE = os.getenv("NEAR_DUP_MODE", "drop").lower()
+
+# --- 질의 임베딩 캐시 설정 ---
+# 검색 질의의 임베딩을 한 번만 계산하여 모든 컬렉션에 재사용하고, 정규화한 질의 텍스트를 키로 메모리(LRU)와 디스크에 캐시합니다.
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+EMBEDDING_CACHE_MAXSIZE = 2048
+EMBEDDING_CACHE_TTL_SECONDS = 24 * 60 * 60
+# 임베딩 벡터를 저장하는 SQLite 파일 경로와 최대 항목 수 (넘으면 오래된 벡터부터 삭제)
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join("data", "embedding_cache.sqlite"))
+EMBEDDING_CACHE_MAX_ENTRIES = 100_000
+
+# --- Synthesizer 컨텍스트 패킹 설정 ---
+# 최종 답변 프롬프트에 넣을 컨텍스트(대화 기록 + 근거 자료 + 프로필)의 토큰 예산
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "2000"))
+# 예산 중 대화 기록/프로필에 배정할 최대 비율 (남는 예산은 근거 자료에 사용, 근거 자료가 없으면 프로필이 남은 예산을 모두 사용)
+CONTEXT_HISTORY_SHARE = 0.2
+CONTEXT_PROFILE_SHARE = 0.15
+# 요약하지 않고 그대로 유지할 최근 메시지 수 (그보다 오래된 메시지는 대화 메모리의 누적 요약으로 대체)
+CONTEXT_RECENT_MESSAGES = 4
+# 대화 메모리의 누적 요약 최대 길이(글자 수)
+MEMORY_SUMMARY_MAX_CHARS = 1000
+# 프로세스 메모리에 보관할 대화 요약의 최대 스레드 수와, 요약이 갱신되지 않은 스레드를 비우는 시간(초)
+# (비워진 요약은 체크포인트에 저장된 요약 스냅샷에서 다시 불러옵니다)
+MEMORY_MAX_THREADS = 1000
+MEMORY_IDLE_SECONDS = 24 * 60 * 60
+# 두 스니펫의 문자 3-gram Jaccard 유사도가 이 값 이상이면 중복으로 보고 하나만 남깁니다.
+CONTEXT_DEDUP_THRESHOLD = 0.8
+
+# --- 프로필 저장소 설정 ---
+# 가맹점 프로필 본문을 저장하는 키-값 저장소(SQLite, 압축 바이너리). ChromaDB에는 검색용 문서만 둡니다.
+PROFILE_STORE_PATH = os.getenv("PROFILE_STORE_PATH", os.path.join("data", "profiles.sqlite"))
+# 프로필 업데이트를 즉시 쓰지 않고 모아서 한 트랜잭션으로 저장할지 여부 (write-behind, 종료 시 남은 업데이트를 저장)
+PROFILE_WRITE_BEHIND_ENABLED = os.getenv("PROFILE_WRITE_BEHIND_ENABLED", "false").lower() in ("1", "true", "yes")
+# 모인 업데이트를 저장하는 주기(초)와, 주기 전이라도 바로 저장할 대기 가맹점 수
+PROFILE_WRITE_BEHIND_FLUSH_SECONDS = 1.0
+PROFILE_WRITE_BEHIND_MAX_BATCH = 500
+
+# --- 프로필 캐시 설정 ---
+# 파싱된 가맹점 프로필을 프로세스 안에 보관하여 ChromaDB 조회와 JSON 파싱을 반복하지 않습니다. (update_profile 시 갱신)
+PROFILE_CACHE_ENABLED = os.getenv("PROFILE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+PROFILE_CACHE_MAXSIZE = 1024
+PROFILE_CACHE_TTL_SECONDS = 10 * 60
+
+# --- 체크포인트(대화 상태) 저장소 설정 ---
+# 그래프 상태를 저장하는 SQLite(WAL) 파일 경로. 재시작 후에도 thread_id로 대화를 이어갈 수 있습니다.
+CHECKPOINT_DB_PATH = os.getenv("CHECKPOINT_DB_PATH", os.path.join("data", "checkpoints.sqlite"))
+# 스레드마다 보존할 최근 체크포인트 수
+CHECKPOINT_KEEP_PER_THREAD = 20
+# 이 시간(초) 동안 사용되지 않은 스레드는 삭제합니다.
+CHECKPOINT_MAX_IDLE_SECONDS = 14 * 24 * 60 * 60
+# 체크포인트 저장소 전체 크기 한도(MB). 넘으면 가장 오래 전에 사용된 스레드부터 삭제합니다.
+CHECKPOINT_MAX_DB_MB = 512
+# 조회 시 스레드의 마지막 사용 시각(last_access)을 다시 기록하는 최소 간격(초). 매 조회마다 쓰기/commit하지 않습니다.
+CHECKPOINT_TOUCH_INTERVAL_SECONDS = 60
+
+# --- LLM 응답 캐시 설정 ---
+# off: 사용 안 함 / on: 온도 0 호출만 캐시 / record: 모든 호출을 녹화 / replay: 녹화된 응답만 사용(네트워크 없이 재현 실행)
+# 캐시 파일에는 프롬프트(가맹점 프로필, 사용자 질문 원문)와 응답이 그대로 저장되므로 기본값은 off입니다.
+# 켜려면 LLM_CACHE_MODE=on (또는 record/replay)으로 실행합니다.
+LLM_CACHE_MODE = os.getenv("LLM_CACHE_MODE", "off").lower()
+# 응답을 저장하는 SQLite(WAL) 파일 경로
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join("data", "llm_cache.sqlite"))
+# 이 시간(초)이 지난 응답은 다시 호출합니다. (replay 모드에서는 만료되지 않습니다)
+LLM_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+# 캐시 파일 전체 크기 한도(MB). 넘으면 가장 오래 전에 사용된 응답부터 삭제합니다.
+LLM_CACHE_MAX_MB = 256
+
+# --- 트레이싱 설정 ---
+# 턴 > 노드 > 도구 > 검색 단위의 중첩 스팬(소요 시간, 토큰 수, 캐시 적중, 결과 크기)을 기록합니다.
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "true").lower() in ("1", "true", "yes")
+# 스팬을 기록할 JSONL 파일 (빈 문자열이면 기록하지 않음). 크기 한도(MB)를 넘으면 백업 파일 수만큼 회전합니다.
+TRACE_JSONL_PATH = os.getenv("TRACE_JSONL_PATH", os.path.join("logs", "traces.jsonl"))
+TRACE_JSONL_MAX_MB = 20
+TRACE_JSONL_BACKUPS = 5
+# OTLP/HTTP(JSON) 수신 주소 (예: http://localhost:4318/v1/traces). 비어 있으면 보내지 않습니다.
+TRACE_OTLP_ENDPOINT = os.getenv("TRACE_OTLP_ENDPOINT", "")
+TRACE_SERVICE_NAME = "bigcon-consulting-agent"
+
+# --- 턴 토큰 예산 설정 ---
+# 한 턴에서 사용할 수 있는 LLM 토큰(입력+출력) 상한. 0이면 제한 없이 집계만 합니다.
+# 예산을 넘기면 남은 계획 단계와 추가 Agent2 턴을 건너뛰고, 지금까지 모은 정보로 답변을 마무리합니다.
+TURN_TOKEN_BUDGET = int(os.getenv("TURN_TOKEN_BUDGET", "0"))
+
+# --- 대화 로그 설정 ---
+# 턴마다 질문/답변, 의도, 사용한 도구, 지연 시간, 토큰 수를 백그라운드 스레드에서 모아 CSV로 기록합니다.
+CONVERSATION_LOG_DIR = "logs"
+# 질문/답변 원문이 파일에 남으므로 기본값은 꺼져 있습니다. (CONVERSATION_LOG_ENABLED=true로 켭니다)
+CONVERSATION_LOG_ENABLED = os.getenv("CONVERSATION_LOG_ENABLED", "false").lower() in ("1", "true", "yes")
+# 대기열 크기 (가득 차면 새 로그를 버립니다) / 한 번에 쓰는 최대 행 수 / 최대 대기 시간(초)
+CONVERSATION_LOG_QUEUE_SIZE = 10000
+CONVERSATION_LOG_BATCH_SIZE = 200
+CONVERSATION_LOG_FLUSH_SECONDS = 2.0
+# 날짜가 바뀌거나 이 크기(MB)를 넘으면 날짜가 붙은 세그먼트 파일로 회전합니다.
+CONVERSATION_LOG_MAX_MB = 50
+# 회전한 세그먼트를 zstd 압축 Parquet(열 지향) 파일로 변환해 보관할지 여부 (pyarrow 필요)
+CONVERSATION_LOG_PARQUET = os.getenv("CONVERSATION_LOG_PARQUET", "false").lower() in ("1", "true", "yes")
@@ -0,0 +1,63 @@
+# src/core/async_runtime.py
+
+import asyncio
+import queue
+import threading
+from typing import Any, AsyncIterator, Coroutine, Iterator
+
+# 모든 세션이 공유하는 단일 이벤트 루프와 그 루프를 돌리는 백그라운드 스레드
+_loop: asyncio.AbstractEventLoop | None = None
+_loop_lock = threading.Lock()
+
+# 비동기 이터레이터가 끝났음을 알리는 표식
+_DONE = object()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    백그라운드 스레드에서 계속 실행되는 공용 이벤트 루프를 반환합니다. (최초 호출 시 생성)
+    Streamlit 워커 스레드마다 루프를 만들지 않고, 여러 세션의 I/O 대기를 하나의 루프에서 처리합니다.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="graph-event-loop", daemon=True)
+            thread.start()
+            print("✅ 비동기 그래프 실행용 공용 이벤트 루프 시작")
+        return _loop
+
+
+def run_async(coro: Coroutine[Any, Any, Any]) -> Any:
+    """동기 코드에서 코루틴을 공용 이벤트 루프에 제출하고 결과를 기다립니다."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+def iterate_async(async_iterable: AsyncIterator[Any]) -> Iterator[Any]:
+    """
+    비동기 이터레이터(예: graph.astream)를 공용 이벤트 루프에서 소비하면서,
+    동기 이터레이터로 하나씩 전달합니다. 예외는 호출 스레드에서 다시 발생합니다.
+    """
+    items: "queue.Queue[Any]" = queue.Queue()
+
+    async def _pump():
+        try:
+            async for item in async_iterable:
+                items.put_nowait(item)
+        except Exception as e:
+            items.put_nowait(e)
+        finally:
+            items.put_nowait(_DONE)
+
+    future = asyncio.run_coroutine_threadsafe(_pump(), get_event_loop())
+    try:
+        while True:
+            item = items.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # 소비자가 중간에 반복을 멈추면 이벤트 루프 쪽 작업도 취소합니다.
+        future.cancel()
@@ -0,0 +1,317 @@
+# src/core/checkpointer.py
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import BaseCheckpointSaver, Checkpoint, CheckpointMetadata, CheckpointTuple
+
+from src.utils.tracing import tracer
+
+SCHEMA = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+CREATE TABLE IF NOT EXISTS threads (
+    thread_id TEXT PRIMARY KEY,
+    last_access REAL NOT NULL,
+    size_bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    thread_id TEXT NOT NULL,
+    thread_ts TEXT NOT NULL,
+    parent_ts TEXT,
+    header BLOB NOT NULL,
+    metadata BLOB,
+    PRIMARY KEY (thread_id, thread_ts)
+);
+CREATE TABLE IF NOT EXISTS channel_values (
+    thread_id TEXT NOT NULL,
+    channel TEXT NOT NULL,
+    version TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (thread_id, channel, version)
+);
+"""
+
+
+class DeltaSqliteSaver(BaseCheckpointSaver):
+    """
+    SQLite(WAL) 기반의 LangGraph 체크포인터입니다. MemorySaver와 달리 재시작 후에도 대화를 이어갈 수 있고,
+    저장 공간이 무한히 늘어나지 않습니다.
+
+    - 델타 저장: 체크포인트 행에는 채널 버전 정보만 저장하고, 채널 값은 (채널, 버전)별로 한 번만 저장합니다.
+      router -> planner -> executor 처럼 messages가 바뀌지 않는 노드 이동에서는 대화 기록을 다시 쓰지 않습니다.
+    - 보존 개수: 스레드마다 최근 keep_per_thread개의 체크포인트만 남기고, 참조되지 않는 채널 값은 지웁니다.
+    - 축출: 오래 사용되지 않은 스레드를 먼저, 전체 크기가 한도를 넘으면 가장 오래 전에 사용된 스레드부터 지웁니다.
+    - 메타데이터의 'writes'(노드 출력)는 채널 값과 중복되므로 노드 이름만 남깁니다.
+    """
+    def __init__(self, db_path: str, keep_per_thread: int = 20, max_idle_seconds: float = 7 * 24 * 3600,
+                 max_db_bytes: int = 512 * 1024 * 1024, evict_every: int = 200, touch_interval: float = 60):
+        super().__init__()
+        if db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.executescript(SCHEMA)
+        self.keep_per_thread = keep_per_thread
+        self.max_idle_seconds = max_idle_seconds
+        self.max_db_bytes = max_db_bytes
+        self.evict_every = evict_every
+        self.touch_interval = touch_interval
+        self._lock = threading.RLock()
+        self._puts_since_evict = 0
+        # 지금까지 저장한 바이트 수 (벤치마크/모니터링용)
+        self.bytes_written = 0
+        # thread_id -> 마지막으로 저장한 체크포인트의 {채널: 버전} (이미 저장된 채널 값을 다시 직렬화하지 않기 위함)
+        self._stored_versions: Dict[str, Dict[str, str]] = {}
+        # thread_id -> 마지막으로 threads.last_access를 기록한 시각 (조회마다 UPDATE/commit하지 않기 위함)
+        self._touched: Dict[str, float] = {}
+        self.evict()
+
+    # --- 1. 버전 관리 ---
+
+    def get_next_version(self, current: Optional[Any], channel: Any) -> str:
+        """
+        단조 증가하는 번호 + 임의 접미사 형식의 채널 버전을 만듭니다.
+        과거 체크포인트에서 분기하더라도 (채널, 버전) 키가 다른 값과 겹치지 않습니다.
+        """
+        if current is None:
+            current_v = 0
+        elif isinstance(current, str):
+            current_v = int(current.split(".")[0])
+        else:
+            current_v = int(current)
+        return f"{current_v + 1:032}.{uuid.uuid4().hex[:12]}"
+
+    # --- 2. 조회 ---
+
+    def _load_tuple(self, cur: sqlite3.Cursor, thread_id: str, thread_ts: str, parent_ts: Optional[str],
+                    header_blob: bytes, metadata_blob: Optional[bytes]) -> CheckpointTuple:
+        header = self.serde.loads(header_blob)
+        channel_values = {}
+        for channel, version in header.pop("stored_channels").items():
+            row = cur.execute(
+                "SELECT value FROM channel_values WHERE thread_id = ? AND channel = ? AND version = ?",
+                (thread_id, channel, version),
+            ).fetchone()
+            if row is not None:
+                channel_values[channel] = self.serde.loads(row[0])
+        checkpoint = Checkpoint(**header, channel_values=channel_values)
+        return CheckpointTuple(
+            {"configurable": {"thread_id": thread_id, "thread_ts": thread_ts}},
+            checkpoint,
+            self.serde.loads(metadata_blob) if metadata_blob is not None else {},
+            {"configurable": {"thread_id": thread_id, "thread_ts": parent_ts}} if parent_ts else None,
+        )
+
+    def get_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        thread_id = str(config["configurable"]["thread_id"])
+        thread_ts = config["configurable"].get("thread_ts")
+        with self._lock:
+            cur = self.conn.cursor()
+            try:
+                if thread_ts:
+                    row = cur.execute(
+                        "SELECT thread_ts, parent_ts, header, metadata FROM checkpoints WHERE thread_id = ? AND thread_ts = ?",
+                        (thread_id, str(thread_ts)),
+                    ).fetchone()
+                else:
+                    row = cur.execute(
+                        "SELECT thread_ts, parent_ts, header, metadata FROM checkpoints WHERE thread_id = ? "
+                        "ORDER BY thread_ts DESC LIMIT 1",
+                        (thread_id,),
+                    ).fetchone()
+                if row is None:
+                    return None
+                self._touch(cur, thread_id)
+                return self._load_tuple(cur, thread_id, *row)
+            finally:
+                cur.close()
+
+    def _touch(self, cur: sqlite3.Cursor, thread_id: str) -> None:
+        """
+        조회한 스레드의 last_access를 갱신합니다. 축출 기준은 일 단위이므로, 마지막 기록 후 touch_interval초가 지난 경우에만 씁니다.
+        (매 조회마다 전역 락 안에서 UPDATE + commit을 하지 않기 위함)
+        """
+        now = time.time()
+        if now - self._touched.get(thread_id, 0.0) < self.touch_interval:
+            return
+        cur.execute("UPDATE threads SET last_access = ? WHERE thread_id = ?", (now, thread_id))
+        self.conn.commit()
+        self._touched[thread_id] = now
+
+    def list(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+             before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> Iterator[CheckpointTuple]:
+        wheres, params = [], []
+        if config is not None:
+            wheres.append("thread_id = ?")
+            params.append(str(config["configurable"]["thread_id"]))
+        if before is not None:
+            wheres.append("thread_ts < ?")
+            params.append(before["configurable"]["thread_ts"])
+        query = "SELECT thread_id, thread_ts, parent_ts, header, metadata FROM checkpoints"
+        if wheres:
+            query += " WHERE " + " AND ".join(wheres)
+        query += " ORDER BY thread_ts DESC"
+
+        with self._lock:
+            cur = self.conn.cursor()
+            try:
+                rows = cur.execute(query, params).fetchall()
+                tuples = []
+                for thread_id, *row in rows:
+                    checkpoint_tuple = self._load_tuple(cur, thread_id, *row)
+                    if filter and any(checkpoint_tuple.metadata.get(k) != v for k, v in filter.items()):
+                        continue
+                    tuples.append(checkpoint_tuple)
+                    if limit and len(tuples) >= limit:
+                        break
+            finally:
+                cur.close()
+        yield from tuples
+
+    # --- 3. 저장 ---
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata) -> RunnableConfig:
+        thread_id = str(config["configurable"]["thread_id"])
+        parent_ts = config["configurable"].get("thread_ts")
+        channel_versions = {k: str(v) for k, v in checkpoint["channel_versions"].items()}
+        # 값이 있는 채널만 기록합니다. (비어 있는 채널은 복원 시에도 비어 있어야 함)
+        stored_channels = {ch: channel_versions.get(ch, "") for ch in checkpoint["channel_values"]}
+
+        header = {k: v for k, v in checkpoint.items() if k != "channel_values"}
+        header["stored_channels"] = stored_channels
+        compact_metadata = dict(metadata)
+        if isinstance(compact_metadata.get("writes"), dict):
+            compact_metadata["writes"] = {node: None for node in compact_metadata["writes"]}
+
+        with tracer.span("checkpoint.put", thread_id=thread_id) as span:
+            with self._lock:
+                cur = self.conn.cursor()
+                try:
+                    known = self._stored_versions.get(thread_id)
+                    if known is None:
+                        known = dict(cur.execute(
+                            "SELECT channel, MAX(version) FROM channel_values WHERE thread_id = ? GROUP BY channel",
+                            (thread_id,),
+                        ).fetchall())
+
+                    written = 0
+                    for channel, version in stored_channels.items():
+                        # 버전이 없는 채널은 매번 덮어쓰고, 버전이 같으면 값도 같으므로 건너뜁니다.
+                        if version and known.get(channel) == version:
+                            continue
+                        value_blob = self.serde.dumps(checkpoint["channel_values"][channel])
+                        cur.execute(
+                            "INSERT OR REPLACE INTO channel_values (thread_id, channel, version, value) VALUES (?, ?, ?, ?)",
+                            (thread_id, channel, version, value_blob),
+                        )
+                        written += len(value_blob)
+
+                    header_blob = self.serde.dumps(header)
+                    metadata_blob = self.serde.dumps(compact_metadata)
+                    cur.execute(
+                        "INSERT OR REPLACE INTO checkpoints (thread_id, thread_ts, parent_ts, header, metadata) VALUES (?, ?, ?, ?, ?)",
+                        (thread_id, checkpoint["id"], parent_ts, header_blob, metadata_blob),
+                    )
+                    written += len(header_blob) + len(metadata_blob)
+                    cur.execute(
+                        "INSERT INTO threads (thread_id, last_access, size_bytes) VALUES (?, ?, ?) "
+                        "ON CONFLICT(thread_id) DO UPDATE SET last_access = excluded.last_access, "
+                        "size_bytes = size_bytes + excluded.size_bytes",
+                        (thread_id, time.time(), written),
+                    )
+                    self._prune_thread(cur, thread_id)
+                    self.conn.commit()
+                    self._stored_versions[thread_id] = stored_channels
+                    self._touched[thread_id] = time.time()
+                    self.bytes_written += written
+                    span.set(bytes_written=written)
+                except Exception:
+                    self.conn.rollback()
+                    self._stored_versions.pop(thread_id, None)
+                    raise
+                finally:
+                    cur.close()
+
+                self._puts_since_evict += 1
+                if self._puts_since_evict >= self.evict_every:
+                    self.evict()
+
+        return {"configurable": {"thread_id": thread_id, "thread_ts": checkpoint["id"]}}
+
+    # --- 4. 보존 개수 제한 및 축출 ---
+
+    def _prune_thread(self, cur: sqlite3.Cursor, thread_id: str) -> None:
+        """스레드의 체크포인트가 보존 개수의 2배를 넘으면 최근 것만 남기고, 참조되지 않는 채널 값을 지웁니다."""
+        count = cur.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+        if count <= self.keep_per_thread * 2:
+            return
+        cur.execute(
+            "DELETE FROM checkpoints WHERE thread_id = ? AND thread_ts NOT IN "
+            "(SELECT thread_ts FROM checkpoints WHERE thread_id = ? ORDER BY thread_ts DESC LIMIT ?)",
+            (thread_id, thread_id, self.keep_per_thread),
+        )
+        referenced = set()
+        for (header_blob,) in cur.execute("SELECT header FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchall():
+            referenced.update(self.serde.loads(header_blob)["stored_channels"].items())
+        stored = cur.execute("SELECT channel, version FROM channel_values WHERE thread_id = ?", (thread_id,)).fetchall()
+        cur.executemany(
+            "DELETE FROM channel_values WHERE thread_id = ? AND channel = ? AND version = ?",
+            [(thread_id, channel, version) for channel, version in stored if (channel, version) not in referenced],
+        )
+        cur.execute(
+            "UPDATE threads SET size_bytes = "
+            "(SELECT COALESCE(SUM(LENGTH(value)), 0) FROM channel_values WHERE thread_id = ?) + "
+            "(SELECT COALESCE(SUM(LENGTH(header) + LENGTH(metadata)), 0) FROM checkpoints WHERE thread_id = ?) "
+            "WHERE thread_id = ?",
+            (thread_id, thread_id, thread_id),
+        )
+
+    def delete_thread(self, thread_id: str) -> None:
+        with self._lock:
+            for table in ("channel_values", "checkpoints", "threads"):
+                self.conn.execute(f"DELETE FROM {table} WHERE thread_id = ?", (thread_id,))
+            self.conn.commit()
+            self._stored_versions.pop(thread_id, None)
+            self._touched.pop(thread_id, None)
+
+    def evict(self) -> List[str]:
+        """유휴 시간 한도를 넘은 스레드와, 전체 크기 한도를 넘는 만큼 가장 오래 전에 사용된 스레드를 지웁니다."""
+        with self._lock:
+            self._puts_since_evict = 0
+            threads = self.conn.execute("SELECT thread_id, last_access, size_bytes FROM threads ORDER BY last_access").fetchall()
+            cutoff = time.time() - self.max_idle_seconds
+            total = sum(size for _, _, size in threads)
+            evicted = []
+            for thread_id, last_access, size in threads:
+                if last_access >= cutoff and total <= self.max_db_bytes:
+                    break
+                self.delete_thread(thread_id)
+                total -= size
+                evicted.append(thread_id)
+            if evicted:
+                print(f"🧹 체크포인트 축출: {len(evicted)}개 스레드 삭제 (남은 크기 약 {total / 1024 / 1024:.1f}MB)")
+            return evicted
+
+    def thread_exists(self, thread_id: str) -> bool:
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM threads WHERE thread_id = ?", (thread_id,)).fetchone() is not None
+
+    # --- 5. 비동기 인터페이스 (graph.astream / astream_events용) ---
+
+    async def aget_tuple(self, config: RunnableConfig) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config: Optional[RunnableConfig], *, filter: Optional[Dict[str, Any]] = None,
+                    before: Optional[RunnableConfig] = None, limit: Optional[int] = None) -> AsyncIterator[CheckpointTuple]:
+        tuples = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for checkpoint_tuple in tuples:
+            yield checkpoint_tuple
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata) -> RunnableConfig:
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata)
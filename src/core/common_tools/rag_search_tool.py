@@ -32,6 +32,34 @@ class RagSearchInput(BaseModel):
 
 # --- 도구 구현 ---
 
+def _default_collections(collection_types: List[str] | None) -> tuple[str, ...]:
+    # collection_types가 None이면 모든 타입을 검색하도록 기본값 설정
+    return tuple(collection_types) if collection_types else ("strategy", "guide", "trend", "case")
+
+
+def _summarize_sources(query: str, sources_list: List[Dict[str, Any]]) -> str:
+    """검색 결과를 Synthesizer가 이해하기 좋은 요약 텍스트로 가공합니다."""
+    if not sources_list:
+        return f"'{query}'와 관련된 자료를 찾지 못했습니다."
+
+    context_parts = []
+    for i, src in enumerate(sources_list):
+        title = src.get('title', '제목 없음')
+        content_part = str(src.get('content', ''))[:500]  
+        context_parts.append(f"[{i+1}] 제목: {title}\n   내용 요약: {content_part}...")
+    return "\n\n".join(context_parts)
+
+
+def _search_output(query: str, sources_list: List[Dict[str, Any]]) -> dict:
+    """검색 결과를 요약 텍스트 + 원본 소스로 묶은 ToolOutput으로 만듭니다. (동기/비동기 구현 공용)"""
+    print(f"--- [RAG Tool] '{query}' 검색 결과 {len(sources_list)}건 발견 ---")
+    return ToolOutput(content=_summarize_sources(query, sources_list), sources=sources_list).model_dump()
+
+
+def _error_output(e: Exception, query: str) -> dict:
+    return ToolOutput(content=create_tool_error("rag_searcher", e, query=query)).model_dump()
+
+
 @tool_registry.register(
     name="rag_searcher",
     description=TOOL_DESCRIPTION
@@ -44,27 +72,19 @@ def rag_search_tool(query: str, collection_types: List[str] | None = None) -> di
     """
     print(f"--- 🛠️ Tool: rag_searcher 호출됨 (Query: '{query}') ---")
     try:
-        # collection_types가 None이면 모든 타입을 검색하도록 기본값 설정
-        search_collections = tuple(collection_types) if collection_types else ("strategy", "guide", "trend", "case")
-
         # 실제 검색 작업은 DataService에 위임
-        sources_list = data_service.search_for_sources(query, collection_types=search_collections)
-
-        if not sources_list:
-            content = f"'{query}'와 관련된 자료를 찾지 못했습니다."
-        else:
-            # 검색 결과를 Synthesizer가 이해하기 좋은 요약 텍스트로 가공
-            context_parts = []
-            for i, src in enumerate(sources_list):
-                title = src.get('title', '제목 없음')
-                content_part = str(src.get('content', ''))[:500]  
-                context_parts.append(f"[{i+1}] 제목: {title}\n   내용 요약: {content_part}...")
-            content = "\n\n".join(context_parts)
-
-        print(f"--- [RAG Tool] '{query}' 검색 결과 {len(sources_list)}건 발견 ---")
+        sources_list = data_service.search_for_sources(query, collection_types=_default_collections(collection_types))
+        return _search_output(query, sources_list)
+    except Exception as e:
+        return _error_output(e, query)
 
-        return ToolOutput(content=content, sources=sources_list).model_dump()
 
+@tool_registry.register_coroutine("rag_searcher")
+async def arag_search_tool(query: str, collection_types: List[str] | None = None) -> dict:
+    """rag_search_tool의 비동기 구현입니다."""
+    print(f"--- 🛠️ Tool: rag_searcher (async) 호출됨 (Query: '{query}') ---")
+    try:
+        sources_list = await data_service.asearch_for_sources(query, collection_types=_default_collections(collection_types))
+        return _search_output(query, sources_list)
     except Exception as e:
-        error_content = create_tool_error("rag_searcher", e, query=query)
-        return ToolOutput(content=error_content).model_dump()
\ No newline at end of file
+        return _error_output(e, query)
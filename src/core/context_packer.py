@@ -0,0 +1,248 @@
+# src/core/context_packer.py
+
+import json
+import math
+import re
+from typing import Any, Dict, List, Tuple
+
+from src.config import (
+    CONTEXT_TOKEN_BUDGET,
+    CONTEXT_HISTORY_SHARE,
+    CONTEXT_PROFILE_SHARE,
+    CONTEXT_RECENT_MESSAGES,
+    CONTEXT_DEDUP_THRESHOLD,
+)
+
+# --- 1. 토큰 추정 ---
+
+def estimate_tokens(text: str) -> int:
+    """
+    토크나이저 없이 토큰 수를 대략 추정합니다.
+    영문/숫자는 약 4글자당 1토큰, 한글 등 비ASCII 문자는 1글자당 약 0.7토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4 + (len(text) - ascii_chars) * 0.7)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """추정 토큰 수가 max_tokens 이하가 되도록 텍스트 뒷부분을 잘라냅니다."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= max_tokens:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo].rstrip() + "..."
+
+
+# --- 2. 관련도 / 중복 판정 ---
+
+def _char_shingles(text: str, n: int) -> set:
+    compact = re.sub(r"\s+", "", text.lower())
+    if len(compact) < n:
+        return {compact} if compact else set()
+    return {compact[i:i + n] for i in range(len(compact) - n + 1)}
+
+
+def relevance(query: str, text: str) -> float:
+    """질문의 문자 bigram 중 텍스트에 등장하는 비율 (0~1). 한국어 조사/어미 변화에 강합니다."""
+    query_grams = _char_shingles(query, 2)
+    if not query_grams:
+        return 0.0
+    return len(query_grams & _char_shingles(text, 2)) / len(query_grams)
+
+
+def _jaccard(a: set, b: set) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+# --- 3. 근거 자료 패킹 ---
+
+def _split_snippets(result: str) -> List[str]:
+    """도구 결과를 빈 줄 기준의 단락(스니펫)으로 나눕니다."""
+    return [part.strip() for part in re.split(r"\n\s*\n", str(result)) if part.strip()]
+
+
+def pack_evidence(query: str, past_steps: List[tuple], budget: int) -> str:
+    """
+    실행 단계 결과를 스니펫 단위로 나눈 뒤, 질문 관련도 순으로 예산 안에서 선택합니다.
+    이미 선택된 스니펫과 거의 같은 내용(문자 3-gram Jaccard 기준)은 건너뛰고,
+    선택된 스니펫은 원래의 단계/순서대로 다시 묶어 반환합니다.
+    """
+    candidates = []
+    for step_idx, (step, result) in enumerate(past_steps):
+        for snippet_idx, snippet in enumerate(_split_snippets(result)):
+            candidates.append((relevance(query, snippet), step_idx, snippet_idx, snippet))
+    candidates.sort(key=lambda c: (-c[0], c[1], c[2]))
+
+    headers = [f"**실행 내용:** {step}\n**결과:**" for step, _ in past_steps]
+    remaining = budget - sum(estimate_tokens(h) for h in headers)
+    selected: List[Tuple[int, int, str]] = []
+    selected_shingles: List[set] = []
+
+    for _, step_idx, snippet_idx, snippet in candidates:
+        if remaining <= 0:
+            break
+        shingles = _char_shingles(snippet, 3)
+        if any(_jaccard(shingles, other) >= CONTEXT_DEDUP_THRESHOLD for other in selected_shingles):
+            continue
+        cost = estimate_tokens(snippet)
+        if cost > remaining:
+            # 남은 예산이 어느 정도 있으면 잘라서라도 넣고, 아니면 더 짧은 스니펫을 찾아봅니다.
+            if remaining < 50:
+                continue
+            snippet = _truncate_to_tokens(snippet, remaining)
+            cost = estimate_tokens(snippet)
+        selected.append((step_idx, snippet_idx, snippet))
+        selected_shingles.append(shingles)
+        remaining -= cost
+
+    sections = []
+    for step_idx, header in enumerate(headers):
+        snippets = [s for i, _, s in sorted(selected) if i == step_idx]
+        sections.append(f"{header}\n" + ("\n\n".join(snippets) if snippets else "(중복되거나 관련도가 낮아 생략됨)"))
+    return "\n\n".join(sections)
+
+
+# --- 4. 프로필 압축 ---
+
+# 프로필 core_data 섹션별로, 질문에 이 키워드가 있을 때만 포함합니다. (basic_info는 항상 포함)
+PROFILE_SECTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "performance_metrics": ("매출", "객단가", "실적", "성과", "순위", "수익", "판매", "건수"),
+    "customer_profile": ("고객", "손님", "재방문", "신규", "연령", "성별", "타겟", "단골", "유동"),
+    "time_series_summary": ("추이", "변화", "월별", "최근", "추세", "시계열", "감소", "증가"),
+}
+
+
+def _drop_empty(value: Any) -> Any:
+    """None/빈 값 필드를 재귀적으로 제거합니다."""
+    if isinstance(value, dict):
+        cleaned = {k: _drop_empty(v) for k, v in value.items()}
+        return {k: v for k, v in cleaned.items() if v not in (None, "", [], {})}
+    if isinstance(value, list):
+        return [_drop_empty(v) for v in value if v not in (None, "", [], {})]
+    return value
+
+
+def _dumps_compact(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _fit_fields(section: Dict[str, Any], budget: int) -> Dict[str, Any]:
+    """예산 안에 들어가는 필드만 순서대로 남깁니다. (JSON 문자열 중간에서 자르지 않기 위함)"""
+    kept: Dict[str, Any] = {}
+    for key, value in section.items():
+        if estimate_tokens(_dumps_compact({**kept, key: value})) <= budget:
+            kept[key] = value
+    return kept
+
+
+def compress_profile(query: str, profile: Dict[str, Any] | None, budget: int, include_all: bool = False) -> str:
+    """
+    질문에 필요한 프로필 섹션만 남기고, 빈 값을 지운 뒤 한 줄 JSON으로 직렬화합니다.
+    include_all=True(근거 자료가 없어 예산이 남는 경우)이면 키워드와 맞지 않는 섹션도 예산 안에서 덧붙입니다.
+    예산을 넘으면 섹션(basic_info는 필드) 단위로 생략하므로 결과는 항상 올바른 JSON입니다.
+    """
+    if not profile:
+        return "{}"
+    core = profile.get("core_data", {})
+    matched = [section for section, keywords in PROFILE_SECTION_KEYWORDS.items()
+               if section in core and any(k in query for k in keywords)]
+    extra = [section for section in core if section not in matched and section != "basic_info"] if include_all else []
+
+    compact: Dict[str, Any] = {}
+    for section in ["basic_info"] + matched + extra:
+        value = _drop_empty(core.get(section, {}))
+        if not value:
+            continue
+        if estimate_tokens(_dumps_compact({**compact, section: value})) <= budget:
+            compact[section] = value
+        elif section == "basic_info" and isinstance(value, dict):
+            compact[section] = _fit_fields(value, budget - estimate_tokens(_dumps_compact({section: {}})))
+    return _dumps_compact(compact)
+
+
+# --- 5. 대화 기록 압축 ---
+
+def _first_sentence(text: str, max_chars: int = 80) -> str:
+    sentence = re.split(r"(?<=[.!?다요])\s", str(text).strip(), maxsplit=1)[0]
+    return sentence if len(sentence) <= max_chars else sentence[:max_chars].rstrip() + "..."
+
+
+def compress_history(messages: List[Any], budget: int, memory: Dict[str, Any] | None = None) -> str:
+    """
+    최근 메시지는 그대로 두고, 그보다 오래된 턴은 대화 메모리의 누적 요약으로 대체합니다.
+    요약이 아직 따라잡지 못한 메시지는 메시지당 첫 문장만 남기고, 그래도 예산을 넘으면 오래된 것부터 버립니다.
+    """
+    memory = memory or {}
+    recent = messages[-CONTEXT_RECENT_MESSAGES:] if CONTEXT_RECENT_MESSAGES else []
+    older = messages[:len(messages) - len(recent)]
+    summary = memory.get("summary", "")
+    unsummarized = older[min(memory.get("covered", 0), len(older)):]
+
+    recent_lines = [f"- {msg.type}: {msg.content}" for msg in recent]
+    summary_lines = [f"- {msg.type}: {_first_sentence(msg.content)}" for msg in unsummarized]
+
+    recent_text = _truncate_to_tokens("\n".join(recent_lines), budget)
+    remaining = budget - estimate_tokens(recent_text)
+    while summary_lines and estimate_tokens("\n".join(summary_lines)) > remaining:
+        summary_lines.pop(0)
+    remaining -= estimate_tokens("\n".join(summary_lines))
+    if summary and remaining > 0:
+        summary_lines.insert(0, _truncate_to_tokens(summary, remaining))
+
+    if summary_lines:
+        return "(이전 대화 요약)\n" + "\n".join(summary_lines) + f"\n(최근 대화)\n{recent_text}"
+    return recent_text
+
+
+# --- 6. 패킹 진입점 ---
+
+def _legacy_context(messages: List[Any], past_steps: List[tuple], profile: Dict[str, Any] | None) -> str:
+    """패킹 이전 방식(전체 대화, 들여쓰기 JSON, 단계별 1000자)으로 만든 컨텍스트. 절약량 계산에만 사용합니다."""
+    history = "\n".join(f"- {msg.type}: {msg.content}" for msg in messages)
+    profile_json = json.dumps(profile, ensure_ascii=False, indent=2)
+    evidence = "\n\n".join(f"**실행 내용:** {step}\n**결과:**\n{str(result)[:1000]}..." for step, result in past_steps)
+    return f"{history}\n{evidence}\n{profile_json}"
+
+
+def pack_context(user_query: str, history: List[Any], past_steps: List[tuple],
+                 profile: Dict[str, Any] | None, token_budget: int = CONTEXT_TOKEN_BUDGET,
+                 memory: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """
+    Synthesizer 프롬프트에 들어갈 대화 기록/근거 자료/프로필을 토큰 예산 안으로 압축합니다.
+    프로필과 대화 기록이 예산을 다 쓰지 않으면 남은 만큼 근거 자료에 배정합니다.
+    근거 자료가 없으면(예: 프로필 조회) 대화 기록을 뺀 나머지 예산을 모두 프로필에 배정합니다.
+    memory는 대화 메모리 스냅샷({"summary", "covered"})으로, 오래된 대화 기록 대신 사용됩니다.
+
+    반환값: {"history", "evidence", "profile", "report"}
+    report: {"budget", "tokens_before", "tokens_after", "tokens_saved"}
+    """
+    history_text = compress_history(history, int(token_budget * CONTEXT_HISTORY_SHARE), memory)
+    if past_steps:
+        profile_text = compress_profile(user_query, profile, int(token_budget * CONTEXT_PROFILE_SHARE))
+    else:
+        profile_text = compress_profile(user_query, profile, token_budget - estimate_tokens(history_text), include_all=True)
+    evidence_budget = token_budget - estimate_tokens(profile_text) - estimate_tokens(history_text)
+    evidence_text = pack_evidence(user_query, past_steps, evidence_budget) if past_steps else ""
+
+    tokens_before = estimate_tokens(_legacy_context(history, past_steps, profile))
+    tokens_after = estimate_tokens(history_text) + estimate_tokens(evidence_text) + estimate_tokens(profile_text)
+    return {
+        "history": history_text,
+        "evidence": evidence_text,
+        "profile": profile_text,
+        "report": {
+            "budget": token_budget,
+            "tokens_before": tokens_before,
+            "tokens_after": tokens_after,
+            "tokens_saved": max(0, tokens_before - tokens_after),
+        },
+    }
@@ -0,0 +1,128 @@
+# src/core/conversation_memory.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from src.config import CONTEXT_RECENT_MESSAGES, MEMORY_SUMMARY_MAX_CHARS, MEMORY_MAX_THREADS, MEMORY_IDLE_SECONDS
+from src.core.llm_factory import llm_factory
+from src.utils.cache import TTLCache
+
+# --- 1. 설정 및 초기화 ---
+# 대화 요약을 위한 전용 LLM 인스턴스 (빠른 모델 사용)
+try:
+    SUMMARY_LLM = llm_factory.get("summary")
+except Exception as e:
+    print(f"❌ Summary LLM 초기화 오류: {e}")
+    SUMMARY_LLM = None
+
+SUMMARY_PROMPT = """당신은 소상공인 상담 대화를 기록하는 비서입니다.
+아래 [기존 요약]에 [새 대화]의 내용을 반영하여 갱신된 요약을 작성하세요.
+- 가맹점 정보, 사용자의 목표/고민, 이미 제공한 주요 답변과 결정 사항을 중심으로 정리하세요.
+- 인사말 등 의미 없는 내용은 생략하세요.
+- {max_chars}자 이내의 한국어 글머리표(-) 목록으로만 출력하세요.
+
+**[기존 요약]**
+{summary}
+
+**[새 대화]**
+{new_turns}
+
+**[갱신된 요약]**
+"""
+
+
+def _format_messages(messages: List[Any]) -> str:
+    return "\n".join(f"- {msg.type}: {msg.content}" for msg in messages)
+
+
+# --- 2. 대화 메모리 ---
+
+class ConversationMemory:
+    """
+    대화 스레드(thread_id)별로 '오래된 대화의 누적 요약 + 최근 N개 메시지'를 관리합니다.
+    요약은 답변이 끝난 뒤 백그라운드에서 새로 밀려난 메시지만 반영하여 점진적으로 갱신되므로,
+    세션이 길어져도 프롬프트에 들어가는 대화 기록의 크기는 일정하게 유지됩니다.
+    요약은 최대 max_threads개 스레드만 보관하고(LRU), idle_seconds 동안 갱신되지 않은 스레드는 비웁니다.
+    Router가 요약 스냅샷을 그래프 상태(체크포인트)에 남기므로, 비워지거나 재시작으로 사라진 요약은 restore()로 되살립니다.
+    """
+    def __init__(self, recent_messages: int, max_summary_chars: int,
+                 max_threads: int = MEMORY_MAX_THREADS, idle_seconds: float = MEMORY_IDLE_SECONDS):
+        self.recent_messages = recent_messages
+        self.max_summary_chars = max_summary_chars
+        # thread_id -> {"summary": 누적 요약, "covered": 요약에 반영된 앞쪽 메시지 수}
+        self._entries = TTLCache(maxsize=max_threads, ttl_seconds=idle_seconds)
+        self._pending: set = set()
+        self._lock = threading.Lock()
+        # 요약은 순서대로 반영되어야 하므로 단일 워커로 처리합니다.
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-summary")
+
+    def get(self, thread_id: str | None, fallback: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        """
+        스레드의 현재 요약 상태 {"summary", "covered"}를 반환합니다.
+        메모리에 없으면 fallback(체크포인트에 저장된 요약 스냅샷)을 복원하여 사용합니다.
+        """
+        if thread_id and fallback:
+            self.restore(thread_id, fallback)
+        with self._lock:
+            entry = self._entries.get(thread_id) if thread_id else None
+            return dict(entry) if entry else {"summary": "", "covered": 0}
+
+    def restore(self, thread_id: str | None, snapshot: Dict[str, Any] | None) -> None:
+        """저장된 요약 스냅샷이 메모리의 요약보다 더 많은 메시지를 반영하고 있으면 메모리에 되살립니다."""
+        if not thread_id or not snapshot or not snapshot.get("covered"):
+            return
+        with self._lock:
+            current = self._entries.get(thread_id) or {}
+            if snapshot["covered"] > current.get("covered", 0):
+                self._entries.set(thread_id, {"summary": snapshot.get("summary", ""), "covered": snapshot["covered"]})
+
+    def schedule_update(self, thread_id: str | None, messages: List[Any]) -> None:
+        """
+        최근 N개를 제외한 메시지 중 아직 요약되지 않은 부분이 있으면 백그라운드 요약 작업을 예약합니다.
+        같은 스레드의 작업이 이미 대기 중이면 중복 예약하지 않습니다.
+        """
+        if not thread_id:
+            return
+        target = max(0, len(messages) - self.recent_messages)
+        with self._lock:
+            covered = (self._entries.get(thread_id) or {}).get("covered", 0)
+            if target <= covered or thread_id in self._pending:
+                return
+            self._pending.add(thread_id)
+        self._pool.submit(self._update, thread_id, list(messages[:target]))
+
+    def _update(self, thread_id: str, messages: List[Any]) -> None:
+        try:
+            entry = self.get(thread_id)
+            new_turns = messages[entry["covered"]:]
+            summary = self._summarize(entry["summary"], new_turns)
+            with self._lock:
+                self._entries.set(thread_id, {"summary": summary, "covered": len(messages)})
+            print(f"--- 🧠 대화 요약 갱신 (thread: {thread_id}, 누적 {len(messages)}개 메시지, {len(summary)}자) ---")
+        except Exception as e:
+            print(f"⚠️ 대화 요약 갱신 실패 (thread: {thread_id}): {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(thread_id)
+
+    def _summarize(self, summary: str, new_turns: List[Any]) -> str:
+        """기존 요약에 새 메시지를 반영합니다. LLM을 쓸 수 없으면 각 메시지의 앞부분을 이어 붙입니다."""
+        if SUMMARY_LLM is not None:
+            try:
+                prompt = SUMMARY_PROMPT.format(
+                    max_chars=self.max_summary_chars,
+                    summary=summary or "(없음)",
+                    new_turns=_format_messages(new_turns),
+                )
+                return SUMMARY_LLM.invoke(prompt).content.strip()[:self.max_summary_chars]
+            except Exception as e:
+                print(f"⚠️ LLM 대화 요약 실패, 단순 요약으로 대체: {e}")
+        lines = [f"- {msg.type}: {str(msg.content)[:80]}" for msg in new_turns]
+        merged = "\n".join(filter(None, [summary, *lines]))
+        # 길이 제한을 넘으면 오래된 줄부터 버립니다.
+        return merged[-self.max_summary_chars:]
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+conversation_memory = ConversationMemory(CONTEXT_RECENT_MESSAGES, MEMORY_SUMMARY_MAX_CHARS)
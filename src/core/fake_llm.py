@@ -0,0 +1,205 @@
+# src/core/fake_llm.py
+
+import json
+import re
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+from src.core.context_packer import estimate_tokens
+
+# 네트워크 없이 그래프 자체의 오버헤드를 측정하기 위한 결정적(deterministic) 가짜 LLM 백엔드입니다.
+# 프롬프트의 형태(의도 분류 / Planner / 통합 Router+Planner / Synthesizer / Pandas 에이전트 / 실행 카드)를 보고
+# 각 파서가 그대로 받아들일 수 있는 고정 응답을 돌려줍니다. (config.LLM_BACKEND="fake"로 활성화)
+
+# 키워드 -> 의도 (위에서부터 먼저 일치하는 규칙을 사용)
+_INTENT_RULES = [
+    (("플랜", "실행 카드", "솔루션", "방안", "전략", "진단"), "bigcon_request"),
+    (("프로필", "가게 정보", "현황"), "profile_query"),
+    (("영상", "유튜브", "동영상"), "video_recommendation"),
+    (("지원사업", "정부 지원", "보조금"), "policy_recommendation"),
+    (("분석", "특성", "비교", "통계"), "data_analysis"),
+    (("아이디어", "이벤트", "홍보"), "marketing_idea"),
+    (("트렌드", "최신", "방법", "기법"), "general_rag_search"),
+    (("안녕", "hi", "hello"), "greeting"),
+]
+
+_TOOL_LINE_PATTERN = re.compile(r"^- `([^`]+)`:", re.MULTILINE)
+
+
+def fake_intent(user_query: str) -> str:
+    q = user_query.lower()
+    for keywords, intent in _INTENT_RULES:
+        if any(k in q for k in keywords):
+            return intent
+    return "unknown"
+
+
+def _extract(pattern: str, text: str, default: str = "") -> str:
+    match = re.search(pattern, text, re.DOTALL)
+    return match.group(1).strip() if match else default
+
+
+def _fake_plan(user_query: str, tools: List[str]) -> List[Dict[str, Any]]:
+    """사용 가능한 도구 중에서 질문 유형에 맞는 (의존 관계가 있는) 계획을 만듭니다."""
+    if not tools:
+        return []
+    rag_step = {"id": "step1", "tool_name": "rag_searcher", "tool_input": {"query": user_query},
+                "depends_on": [], "thought": "관련 자료를 검색합니다."}
+    if "rag_searcher" in tools and len(tools) == 1:
+        return [rag_step]
+    if "분석" in user_query and "data_analyzer" in tools:
+        return [
+            {"id": "step1", "tool_name": "data_analyzer", "tool_input": {"query": user_query},
+             "depends_on": [], "thought": "원본 데이터를 분석합니다."},
+            {**rag_step, "id": "step2"},
+        ]
+    if "marketing_idea_generator" in tools:
+        return [rag_step, {"id": "step2", "tool_name": "marketing_idea_generator", "tool_input": {"topic": user_query},
+                           "depends_on": ["step1"], "thought": "검색 결과를 바탕으로 아이디어를 만듭니다."}]
+    return [rag_step] if "rag_searcher" in tools else [{"id": "step1", "tool_name": tools[0], "tool_input": {},
+                                                          "depends_on": [], "thought": "도구를 호출합니다."}]
+
+
+def _fake_action_cards() -> str:
+    cards = [
+        {
+            "title": f"재방문 쿠폰 캠페인 {i + 1}",
+            "what": "최근 3개월 내 방문한 단골 고객",
+            "where": ["네이버 플레이스", "인스타그램"],
+            "how": ["2회 방문 시 음료 1잔 증정", "영수증 QR로 쿠폰 발급"],
+            "copy": ["다시 오시면 한 잔 더 드려요!"],
+            "kpi": {"target": "재방문율", "range": ["+3%p", "+5%p"]},
+            "risks": ["쿠폰 남용"],
+            "evidence": ["가맹점 재방문율이 상권 평균보다 낮음"],
+        }
+        for i in range(3)
+    ]
+    return json.dumps({"recommendations": cards}, ensure_ascii=False, indent=2)
+
+
+def canned_response(prompt: str) -> str:
+    """프롬프트 형태에 맞는 고정 응답을 반환합니다."""
+    if "분류된 의도 키워드" in prompt:
+        # few-shot 예시 뒤에 붙는 마지막 질문만 분류합니다.
+        return fake_intent(prompt.rsplit("사용자 질문:", 1)[-1].split("\n---", 1)[0])
+    if "[액션카드 스키마(JSON)]" in prompt:
+        return _fake_action_cards()
+    if "Final Answer" in prompt:
+        # Pandas 데이터프레임 에이전트(ReAct)가 바로 종료하도록 최종 답변 형식으로 응답합니다.
+        return "Thought: 데이터를 확인했습니다.\nFinal Answer: 조건에 맞는 매장의 평균 재방문율은 27.4%입니다."
+
+    user_query = _extract(r'사용자의 가장 최근 요청:\*\*\s*"(.*?)"\n', prompt)
+    if '"intent"' in prompt and '"plan"' in prompt:
+        intent = fake_intent(user_query)
+        plan_intents = ("data_analysis", "marketing_idea", "general_rag_search")
+        tools = ["rag_searcher"] if intent == "general_rag_search" else _TOOL_LINE_PATTERN.findall(prompt)
+        plan = _fake_plan(user_query, tools) if intent in plan_intents else []
+        return json.dumps({"intent": intent, "plan": plan}, ensure_ascii=False)
+    if "JSON 배열" in prompt and user_query:
+        return json.dumps(_fake_plan(user_query, _TOOL_LINE_PATTERN.findall(prompt)), ensure_ascii=False)
+    if "**[최종 답변]**" in prompt:
+        question = _extract(r"\*\*\[사용자 질문\]\*\*\n(.*?)\n\n", prompt)
+        return (f"사장님, '{question}'에 대한 답변입니다. 수집된 근거를 종합하면 다음 세 가지를 추천드립니다.\n"
+                "1. 단골 고객 대상 재방문 쿠폰을 운영하세요.\n"
+                "2. 점심 시간대 회전율을 높이는 세트 메뉴를 구성하세요.\n"
+                "3. 리뷰 이벤트로 신규 고객 유입을 늘리세요.")
+    return "요청하신 내용을 정리했습니다. 핵심은 고객 재방문을 늘리는 작은 실험을 꾸준히 반복하는 것입니다."
+
+
+def _split_chunks(text: str, chunk_chars: int) -> List[str]:
+    return [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+
+
+class FakeChatModel(BaseChatModel):
+    """
+    ChatGoogleGenerativeAI를 대신하는 가짜 채팅 모델입니다.
+    호출마다 latency_ms만큼(첫 토큰까지), 스트리밍 청크마다 chunk_delay_ms만큼 기다려 실제 지연을 흉내 냅니다.
+    """
+    model: str = "fake-gemini"
+    temperature: float = 0.0
+    latency_ms: float = 0.0
+    chunk_delay_ms: float = 0.0
+    chunk_chars: int = 8
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-gemini"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "temperature": self.temperature}
+
+    @staticmethod
+    def _prompt_text(messages: List[BaseMessage]) -> str:
+        return "\n".join(m.content if isinstance(m.content, str) else str(m.content) for m in messages)
+
+    @staticmethod
+    def _usage(prompt: str, text: str) -> Dict[str, int]:
+        """실제 모델처럼 토큰 사용량(추정치)을 함께 돌려줍니다. (트레이싱/토큰 집계 검증용)"""
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(text)
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency_ms / 1000)
+        prompt = self._prompt_text(messages)
+        text = canned_response(prompt)
+        time.sleep(self.chunk_delay_ms * len(_split_chunks(text, self.chunk_chars)) / 1000)
+        message = AIMessage(content=text, usage_metadata=self._usage(prompt, text))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Optional[CallbackManagerForLLMRun] = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        time.sleep(self.latency_ms / 1000)
+        prompt = self._prompt_text(messages)
+        text = canned_response(prompt)
+        pieces = _split_chunks(text, self.chunk_chars)
+        for i, piece in enumerate(pieces):
+            time.sleep(self.chunk_delay_ms / 1000)
+            # 토큰 사용량은 마지막 청크에만 붙입니다. (청크를 합칠 때 더해지므로)
+            usage = self._usage(prompt, text) if i == len(pieces) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+
+class _FakeGenaiResponse:
+    """google.generativeai 응답 객체 중 이 프로젝트가 사용하는 부분(text, candidates, usage_metadata, 스트림 순회)만 흉내 냅니다."""
+    def __init__(self, text: str, chunks: List[str], chunk_delay_ms: float, prompt_text: str = ""):
+        self.text = text
+        self.usage_metadata = SimpleNamespace(prompt_token_count=estimate_tokens(prompt_text),
+                                              candidates_token_count=estimate_tokens(text))
+        self._chunks = chunks
+        self._chunk_delay_ms = chunk_delay_ms
+        part = SimpleNamespace(text=text)
+        self.candidates = [SimpleNamespace(content=SimpleNamespace(parts=[part]),
+                                           finish_reason=SimpleNamespace(name="STOP"))]
+
+    def __iter__(self):
+        for piece in self._chunks:
+            time.sleep(self._chunk_delay_ms / 1000)
+            yield SimpleNamespace(text=piece)
+
+
+class FakeGenerativeModel:
+    """google.generativeai.GenerativeModel을 대신하는 가짜 모델입니다. (실행 카드 Agent2용)"""
+    def __init__(self, model_name: str, latency_ms: float = 0.0, chunk_delay_ms: float = 0.0, chunk_chars: int = 32):
+        self.model_name = model_name
+        self.latency_ms = latency_ms
+        self.chunk_delay_ms = chunk_delay_ms
+        self.chunk_chars = chunk_chars
+
+    def generate_content(self, prompt_text: str, stream: bool = False) -> _FakeGenaiResponse:
+        time.sleep(self.latency_ms / 1000)
+        text = canned_response(prompt_text)
+        chunks = _split_chunks(text, self.chunk_chars)
+        if not stream:
+            time.sleep(self.chunk_delay_ms * len(chunks) / 1000)
+        return _FakeGenaiResponse(text, chunks, self.chunk_delay_ms, prompt_text)
@@ -1,42 +1,150 @@
 # src/core/graph_builder.py
 
+import asyncio
+import contextvars
+import inspect
 import json
-import os
-from typing import Dict, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Iterator, Tuple
 
-import streamlit as st
-from dotenv import load_dotenv
 from langchain_core.messages import AIMessage
 from langchain_core.output_parsers import JsonOutputParser
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langgraph.checkpoint.memory import MemorySaver
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import END, StateGraph
 
-from src.config import PRIMARY_MODEL_NAME
-from src.core.intent_classifier import classify_intent
+from src.config import (
+    FUSED_ROUTER_PLANNER,
+    PLAN_TEMPLATES_ENABLED,
+    PARALLEL_EXECUTOR_ENABLED,
+    EXECUTOR_MAX_WORKERS,
+    ASYNC_GRAPH_ENABLED,
+    CHECKPOINT_DB_PATH,
+    CHECKPOINT_KEEP_PER_THREAD,
+    CHECKPOINT_MAX_IDLE_SECONDS,
+    CHECKPOINT_MAX_DB_MB,
+    CHECKPOINT_TOUCH_INTERVAL_SECONDS,
+    CONVERSATION_LOG_ENABLED,
+)
+from src.core.async_runtime import iterate_async
+from src.core.checkpointer import DeltaSqliteSaver
+from src.core.common_models import ToolOutput
+from src.core.context_packer import pack_context
+from src.core.conversation_memory import conversation_memory
+from src.core.llm_factory import llm_factory
+from src.core.intent_classifier import (
+    INTENT_SOURCE_LLM,
+    aclassify_intent,
+    aclassify_intent_with_source,
+    classify_intent,
+    classify_intent_fast,
+    classify_intent_with_source,
+    remember_intent,
+)
+from src.core.plan_templates import plan_template_engine
 from src.core.state import AgentState
+from src.core.streaming import ACTION_CARD_EVENT, FINAL_ANSWER_TAG, astream_llm_text, stream_llm_text
 from src.core.tool_registry import tool_registry
+from src.core.turn_budget import turn_budgets
 from src.utils.errors import create_tool_error
-from .planner_prompt import build_planner_prompt
+from src.utils.logger import conversation_logger
+from src.utils.tracing import llm_tracing_callback, tracer
+from .planner_prompt import build_planner_prompt, build_fused_router_planner_prompt
 
 # --- 1. 전역 설정 및 LLM 초기화 ---
-load_dotenv()
-google_api_key = st.secrets.get("GOOGLE_API_KEY", os.getenv("GOOGLE_API_KEY"))
 
 # 프로젝트의 핵심 LLM을 정의
-llm = ChatGoogleGenerativeAI(model=PRIMARY_MODEL_NAME, google_api_key=google_api_key, temperature=0)
+llm = llm_factory.get("orchestrator")
 
 # 등록된 모든 도구의 설명 정보를 가져오고 Planner가 계획 수립 시 참고
 TOOL_DESCRIPTIONS = tool_registry.get_all_descriptions()
 
+# 독립적인 계획 단계를 동시에 실행하기 위한 공용 스레드 풀 (동시 실행 수 제한)
+_executor_pool = ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS, thread_name_prefix="plan-step")
+
+# Planner를 거쳐 다단계 계획을 수립해야 하는 의도 목록
+PLANNER_INTENTS = ["data_analysis", "marketing_idea", "general_rag_search"]
+
+
+def _allowed_tools_for(intent: str) -> list[str] | None:
+    """의도별로 Planner가 사용할 수 있는 도구 목록을 반환합니다. (None이면 모든 도구 허용)"""
+    return ["rag_searcher"] if intent == "general_rag_search" else None
+
+
+def _validate_plan(plan: Any, allowed_tools: list[str] | None) -> list[Dict[str, Any]] | None:
+    """LLM이 생성한 계획이 등록된(그리고 허용된) 도구만 사용하는 유효한 단계 목록인지 확인합니다."""
+    if not isinstance(plan, list) or not plan:
+        return None
+    for step in plan:
+        if not isinstance(step, dict) or step.get("tool_name") not in TOOL_DESCRIPTIONS:
+            return None
+        if allowed_tools and step["tool_name"] not in allowed_tools:
+            return None
+        if not isinstance(step.get("tool_input", {}), dict):
+            return None
+    return plan
+
+
+def _build_fused_prompt(state: AgentState) -> str:
+    tool_descriptions_str = "\n".join([f"- `{name}`: {desc}" for name, desc in TOOL_DESCRIPTIONS.items()])
+    return build_fused_router_planner_prompt(state, tool_descriptions_str)
+
+
+def _parse_fused_result(user_query: str, fused_json: Any) -> tuple[str | None, list[Dict[str, Any]] | None]:
+    """통합 호출 결과에서 의도와 검증된 계획을 추출합니다. 의도가 없거나 알 수 없는 레이블이면 (None, None)을 반환합니다."""
+    intent = str(fused_json.get("intent", "")).strip().lower() if isinstance(fused_json, dict) else ""
+    if not intent or not remember_intent(user_query, intent):
+        return None, None
+    plan = _validate_plan(fused_json.get("plan"), _allowed_tools_for(intent)) if intent in PLANNER_INTENTS else None
+    return intent, plan
+
+
+def _fused_route_and_plan(state: AgentState) -> tuple[str, str, list[Dict[str, Any]] | None]:
+    """
+    한 번의 LLM 호출로 의도와 실행 계획을 함께 얻어 (의도, 의도 출처, 계획)을 반환합니다. (Router+Planner 통합 모드)
+    계획이 유효하지 않으면 의도만 반환하여 기존 Planner 노드가 계획을 수립하도록 합니다.
+    """
+    user_query = state['messages'][-1].content
+    try:
+        fused_json = (llm | JsonOutputParser()).invoke(_build_fused_prompt(state))
+    except Exception as e:
+        print(f"❌ Router+Planner 통합 호출 중 오류 발생: {e}")
+        fused_json = None
+
+    intent, plan = _parse_fused_result(user_query, fused_json)
+    return (intent, INTENT_SOURCE_LLM, plan) if intent else (*classify_intent_with_source(user_query), None)
+
+
+async def _afused_route_and_plan(state: AgentState) -> tuple[str, str, list[Dict[str, Any]] | None]:
+    """_fused_route_and_plan의 비동기 버전입니다."""
+    user_query = state['messages'][-1].content
+    try:
+        fused_json = await (llm | JsonOutputParser()).ainvoke(_build_fused_prompt(state))
+    except Exception as e:
+        print(f"❌ Router+Planner 통합 호출 중 오류 발생: {e}")
+        fused_json = None
+
+    intent, plan = _parse_fused_result(user_query, fused_json)
+    return (intent, INTENT_SOURCE_LLM, plan) if intent else (*(await aclassify_intent_with_source(user_query)), None)
+
 # --- 2. 그래프 노드(Graph Nodes) 정의 ---
 
 def simple_responder_node(state: AgentState) -> dict:
     """'greeting', 'unknown' 등 간단한 의도에 대해 즉시 답변하는 경량 노드입니다."""
     print("--- 👋 Simple Responder 활동 시작 ---")
-    user_query = state['messages'][-1].content
-    intent = classify_intent(user_query)
+    # Router가 이미 분류한 의도를 재사용하여 LLM 재호출을 막습니다.
+    intent = state.get("intent") or classify_intent(state['messages'][-1].content)
+    return _simple_response(intent)
+
+
+async def asimple_responder_node(state: AgentState) -> dict:
+    """simple_responder_node의 비동기 버전입니다."""
+    print("--- 👋 Simple Responder 활동 시작 ---")
+    intent = state.get("intent") or await aclassify_intent(state['messages'][-1].content)
+    return _simple_response(intent)
+
 
+def _simple_response(intent: str) -> dict:
     if intent == 'greeting':
         response_content = "안녕하세요, 사장님! 무엇을 도와드릴까요?"
     else:
@@ -48,18 +156,62 @@ def simple_responder_node(state: AgentState) -> dict:
     }
 
 
-def router_node(state: AgentState) -> dict:
+def _thread_id(config: RunnableConfig | None) -> str | None:
+    return ((config or {}).get("configurable") or {}).get("thread_id")
+
+
+def router_node(state: AgentState, config: RunnableConfig) -> dict:
     """사용자 질문의 의도를 분석하여 워크플로우를 적절한 다음 노드로 분기합니다."""
     print("--- 🚦 Router 활동 시작 ---")
     user_query = state['messages'][-1].content
-    intent = classify_intent(user_query)
+    # 이번 턴의 이후 노드들이 같은 대화 요약을 보도록, 턴 시작 시점의 메모리 스냅샷을 상태에 담습니다.
+    # (상태는 체크포인트에 저장되므로, 메모리에서 비워진 요약은 지난 턴의 스냅샷으로 복원됩니다)
+    memory_snapshot = conversation_memory.get(_thread_id(config), fallback=state.get("conversation_memory"))
+    fused_plan = None
+    if FUSED_ROUTER_PLANNER:
+        # 캐시/로컬 분류로 의도를 알 수 없을 때만 의도+계획 통합 호출을 사용합니다.
+        fast = classify_intent_fast(user_query)
+        if fast is None:
+            intent, source, fused_plan = _fused_route_and_plan({**state, "conversation_memory": memory_snapshot})
+        else:
+            intent, source = fast
+    else:
+        intent, source = classify_intent_with_source(user_query)
+    return {**_route(user_query, intent, fused_plan), "intent_source": source, "conversation_memory": memory_snapshot}
+
+
+async def arouter_node(state: AgentState, config: RunnableConfig) -> dict:
+    """router_node의 비동기 버전입니다."""
+    print("--- 🚦 Router 활동 시작 ---")
+    user_query = state['messages'][-1].content
+    memory_snapshot = conversation_memory.get(_thread_id(config), fallback=state.get("conversation_memory"))
+    fused_plan = None
+    if FUSED_ROUTER_PLANNER:
+        fast = classify_intent_fast(user_query)
+        if fast is None:
+            intent, source, fused_plan = await _afused_route_and_plan({**state, "conversation_memory": memory_snapshot})
+        else:
+            intent, source = fast
+    else:
+        intent, source = await aclassify_intent_with_source(user_query)
+    return {**_route(user_query, intent, fused_plan), "intent_source": source, "conversation_memory": memory_snapshot}
+
+
+def _route(user_query: str, intent: str, fused_plan: list[Dict[str, Any]] | None) -> dict:
+    """분류된 의도(와 통합 호출 계획)에 따라 다음 노드와 초기 상태를 결정합니다."""
     print(f"--- 분석된 의도: {intent} ---")
 
     # 시나리오 1: 복잡한 분석이 필요하여 Planner에게 계획 수립을 요청
-    if intent in ["data_analysis", "marketing_idea", "general_rag_search"]:
+    if intent in PLANNER_INTENTS:
+        allowed_tools = _allowed_tools_for(intent)
+        if fused_plan:
+            # 통합 호출에서 이미 계획을 받았으므로 Planner 노드를 건너뜁니다.
+            print("--- [Router] 통합 호출로 계획 수립 완료, Executor 직접 호출 ---")
+            print(f"--- 📝 수립된 계획 ---\n" + json.dumps(fused_plan, indent=2, ensure_ascii=False))
+            return {"next_node": "executor", "intent": intent, "allowed_tools": allowed_tools,
+                    "plan": fused_plan, "past_steps": []}
         print("--- [Router] Planner 호출 결정 ---")
-        allowed_tools = ["rag_searcher"] if intent == "general_rag_search" else None
-        return {"next_node": "planner", "allowed_tools": allowed_tools}
+        return {"next_node": "planner", "intent": intent, "allowed_tools": allowed_tools}
 
     # 시나리오 2: 단일 도구로 해결 가능하여 Planner를 건너뛰고 바로 Executor 호출
     elif intent in ["bigcon_request", "video_recommendation", "policy_recommendation"]:
@@ -75,106 +227,359 @@ def router_node(state: AgentState) -> dict:
             "tool_input": {"user_query": user_query},
             "thought": f"사용자 의도 '{intent}'에 따라 {tool_name} 도구를 직접 호출합니다."
         }]
-        return {"next_node": "executor", "plan": plan, "past_steps": []}
+        return {"next_node": "executor", "intent": intent, "plan": plan, "past_steps": []}
 
     # 시나리오 3: 도구 사용 없이 프로필 정보만으로 답변 가능
     elif intent == "profile_query":
         print("--- [Router] Synthesizer 직접 호출 결정 (프로필 기반 답변) ---")
-        return {"next_node": "synthesizer", "plan": []}
+        return {"next_node": "synthesizer", "intent": intent, "plan": []}
 
     # 시나리오 4: 인사 등 간단한 응답
     else:
         print("--- [Router] Simple Responder 호출 결정 ---")
-        return {"next_node": "simple_responder"}
+        return {"next_node": "simple_responder", "intent": intent}
+
+
+def _plan_from_template(state: AgentState) -> dict | None:
+    """반복되는 요청 형태는 계획 템플릿으로 LLM 호출 없이 즉시 계획을 만듭니다. 일치하는 템플릿이 없으면 None."""
+    if not PLAN_TEMPLATES_ENABLED:
+        return None
+    matched = plan_template_engine.match(state.get("intent", ""), state['messages'][-1].content, state, state.get("allowed_tools"))
+    if not matched:
+        return None
+
+    template_name, plan_json = matched
+    stats = plan_template_engine.stats()
+    planner_report = {
+        "source": "template",
+        "template": template_name,
+        "latency_ms": 0.0,
+        "saved_ms": round(plan_template_engine.avg_llm_latency_ms or 0.0, 1),
+        "hit_rate": stats["hit_rate"],
+    }
+    print(f"--- ⚡ 계획 템플릿 적용: {template_name} (적중률 {stats['hit_rate']:.0%}) ---")
+    print(f"--- 📝 수립된 계획 ---\n" + json.dumps(plan_json, indent=2, ensure_ascii=False))
+    return {"plan": plan_json, "past_steps": [], "planner_report": planner_report}
 
 
-def planner_node(state: AgentState) -> dict:
-    """사용자 요청과 현재 상태를 바탕으로 LLM을 사용하여 단계별 실행 계획을 수립합니다."""
-    print("--- 🤔 Planner 활동 시작 ---")
+def _build_llm_planner_prompt(state: AgentState) -> str:
     allowed_list = state.get("allowed_tools")
     effective_tools = {key: TOOL_DESCRIPTIONS[key] for key in allowed_list if key in TOOL_DESCRIPTIONS} if allowed_list else TOOL_DESCRIPTIONS
     effective_tool_descriptions_str = "\n".join([f"- `{name}`: {desc}" for name, desc in effective_tools.items()])
+    return build_planner_prompt(state, effective_tool_descriptions_str)
+
+
+def _llm_plan_result(plan_json: Any, latency_ms: float) -> dict:
+    plan_template_engine.record_llm_latency(latency_ms)
+    planner_report = {
+        "source": "llm",
+        "template": None,
+        "latency_ms": round(latency_ms, 1),
+        "saved_ms": 0.0,
+        "hit_rate": plan_template_engine.stats()["hit_rate"],
+    }
+    print(f"--- 📝 수립된 계획 ---\n" + json.dumps(plan_json, indent=2, ensure_ascii=False))
+    return {"plan": plan_json, "past_steps": [], "planner_report": planner_report}
+
 
-    prompt = build_planner_prompt(state, effective_tool_descriptions_str)
+def planner_node(state: AgentState) -> dict:
+    """사용자 요청과 현재 상태를 바탕으로 LLM을 사용하여 단계별 실행 계획을 수립합니다."""
+    print("--- 🤔 Planner 활동 시작 ---")
+    template_result = _plan_from_template(state)
+    if template_result:
+        return template_result
+
+    prompt = _build_llm_planner_prompt(state)
     planner_chain = llm | JsonOutputParser()
+    start = time.perf_counter()
     plan_json = planner_chain.invoke(prompt)
+    return _llm_plan_result(plan_json, (time.perf_counter() - start) * 1000)
 
-    print(f"--- 📝 수립된 계획 ---\n" + json.dumps(plan_json, indent=2, ensure_ascii=False))
-    return {"plan": plan_json, "past_steps": []}
+
+async def aplanner_node(state: AgentState) -> dict:
+    """planner_node의 비동기 버전입니다."""
+    print("--- 🤔 Planner 활동 시작 ---")
+    template_result = _plan_from_template(state)
+    if template_result:
+        return template_result
+
+    prompt = _build_llm_planner_prompt(state)
+    planner_chain = llm | JsonOutputParser()
+    start = time.perf_counter()
+    plan_json = await planner_chain.ainvoke(prompt)
+    return _llm_plan_result(plan_json, (time.perf_counter() - start) * 1000)
+
+
+def _prepare_step(step: Dict[str, Any], state: AgentState) -> tuple[Any, Dict[str, Any]]:
+    """계획 단계의 도구를 찾고, 도구가 필요로 하는 컨텍스트(profile, user_query 등)를 인자에 주입합니다."""
+    tool_name = step.get("tool_name")
+    invoke_args = step.get("tool_input", {}).copy()
+
+    print(f"--- [실행] 도구: {tool_name} // 인자: {invoke_args} ---")
+    print(f"--- [사고 과정] {step.get('thought', 'N/A')} ---")
+
+    tool = tool_registry.get_tool(tool_name)
+
+    # 도구가 필요로 하는 컨텍스트(profile, user_query 등)를 동적으로 주입
+    tool_meta = tool_registry.get_tool_metadata(tool_name)
+    current_profile = state.get("current_profile")
+    if tool_meta.get("needs_profile") and current_profile:
+        invoke_args["profile"] = current_profile
+    if tool_meta.get("needs_user_query"):
+        invoke_args["user_query"] = state["messages"][-1].content
+    if tool_meta.get("needs_store_id") and current_profile:
+        invoke_args["store_id"] = current_profile.get("profile_id")
+    return tool, invoke_args
+
+
+def _trace_tool_output(span, tool_output: ToolOutput) -> ToolOutput:
+    span.set(result_chars=len(tool_output.content), sources=len(tool_output.sources),
+             is_final_answer=tool_output.is_final_answer, failed=tool_output.content.startswith("ERROR:"))
+    return tool_output
+
+
+def _run_step(step: Dict[str, Any], state: AgentState) -> ToolOutput:
+    """계획의 한 단계를 실행합니다. 실패 시 에러 메시지를 담은 ToolOutput을 반환합니다."""
+    with tracer.span(f"tool.{step.get('tool_name')}", step_id=str(step.get("id", ""))) as span:
+        try:
+            tool, invoke_args = _prepare_step(step, state)
+            tool_output_dict = tool.invoke(invoke_args)
+            return _trace_tool_output(span, ToolOutput.model_validate(tool_output_dict))
+
+        except Exception as e:
+            print(f"--- 🚨 EXECUTOR 예외 발생: {e} ---")
+            return _trace_tool_output(span, ToolOutput(content=create_tool_error(step.get("tool_name"), e)))
+
+
+async def _arun_step(step: Dict[str, Any], state: AgentState) -> ToolOutput:
+    """_run_step의 비동기 버전입니다. 비동기 구현이 없는 도구는 LangChain이 스레드 풀에서 실행합니다."""
+    with tracer.span(f"tool.{step.get('tool_name')}", step_id=str(step.get("id", ""))) as span:
+        try:
+            tool, invoke_args = _prepare_step(step, state)
+            tool_output_dict = await tool.ainvoke(invoke_args)
+            return _trace_tool_output(span, ToolOutput.model_validate(tool_output_dict))
+
+        except Exception as e:
+            print(f"--- 🚨 EXECUTOR 예외 발생: {e} ---")
+            return _trace_tool_output(span, ToolOutput(content=create_tool_error(step.get("tool_name"), e)))
+
+
+def _step_dependencies(plan: List[Dict[str, Any]]) -> tuple[List[str], List[set]]:
+    """
+    계획의 각 단계에 대한 id와 선행 단계(depends_on) 집합을 계산합니다.
+    id가 없으면 'step{순번}'을 부여하며, depends_on에는 단계 id 또는 0부터 시작하는 순번을 사용할 수 있습니다.
+    """
+    step_ids = [str(step.get("id") or f"step{i + 1}") for i, step in enumerate(plan)]
+    known_ids = set(step_ids)
+    dependencies = []
+    for i, step in enumerate(plan):
+        deps = set()
+        for dep in step.get("depends_on") or []:
+            dep_id = step_ids[dep] if isinstance(dep, int) and 0 <= dep < len(plan) else str(dep)
+            # 존재하지 않거나 자기 자신을 가리키는 의존성은 무시합니다.
+            if dep_id in known_ids and dep_id != step_ids[i]:
+                deps.add(dep_id)
+        dependencies.append(deps)
+    return step_ids, dependencies
+
+
+def _next_ready_steps(plan: List[Dict[str, Any]], step_ids: List[str], dependencies: List[set],
+                      results: Dict[int, ToolOutput], done_ids: set) -> List[int]:
+    """선행 단계가 모두 끝나 지금 실행할 수 있는 단계들의 순번을 반환합니다."""
+    pending = [i for i in range(len(plan)) if i not in results]
+    ready = [i for i in pending if dependencies[i] <= done_ids]
+    if not ready:
+        # 순환 의존성 등으로 더 이상 진행할 수 없으면 남은 단계 중 첫 번째를 실행합니다.
+        print("--- ⚠️ [Executor] 의존성을 해소할 수 없어 남은 단계를 순서대로 실행합니다. ---")
+        ready = pending[:1]
+    print(f"--- [Executor] 동시 실행 단계: {[step_ids[i] for i in ready]} ---")
+    return ready
+
+
+def _merge_step_results(state: AgentState, plan: List[Dict[str, Any]], results: Dict[int, ToolOutput],
+                        final_index: int | None) -> dict:
+    """실행된 단계들의 결과를 계획 순서대로 past_steps와 sources에 병합합니다."""
+    past_steps = list(state.get("past_steps") or [])
+    sources = list(state.get("sources") or [])
+    for i in sorted(results):
+        past_steps.append((json.dumps(plan[i], ensure_ascii=False), results[i].content))
+        sources.extend(results[i].sources)
+
+    updated_state = {"past_steps": past_steps, "sources": sources, "plan": []}
+    if final_index is not None:
+        final_output = results[final_index]
+        updated_state.update({
+            "is_final_answer": True,
+            "final_output": final_output.content,
+            "messages": state["messages"] + [AIMessage(content=final_output.content)],
+        })
+    return updated_state
+
+
+def _may_finish(step: Dict[str, Any]) -> bool:
+    """최종 답변을 돌려줄 수 있는 도구(final_answer=True로 등록)의 단계인지 확인합니다."""
+    return bool(tool_registry.get_tool_metadata(step.get("tool_name")).get("final_answer"))
+
+
+def _uses_dependencies(plan: List[Dict[str, Any]]) -> bool:
+    """계획이 depends_on으로 단계 간 관계를 명시했는지 확인합니다. (명시하지 않은 계획은 기존처럼 순서대로 실행)"""
+    return any("depends_on" in step for step in plan)
+
+
+def _split_wave(plan: List[Dict[str, Any]], ready: List[int]) -> tuple[List[int], List[int]]:
+    """
+    실행 가능한 단계를 (동시에 실행할 단계, 최종 답변을 낼 수 있는 단계)로 나눕니다.
+    최종 답변을 낼 수 있는 단계는 같은 묶음의 다른 단계가 끝난 뒤 계획 순서대로 하나씩 실행하여,
+    기존 순차 실행처럼 첫 최종 답변에서 멈추고 불필요한 LLM 호출(예: 실행 카드 생성)을 하지 않습니다.
+    """
+    finishing = [i for i in ready if _may_finish(plan[i])]
+    return [i for i in ready if i not in finishing], finishing
+
+
+def _execute_plan_dag(state: AgentState, plan: List[Dict[str, Any]]) -> dict:
+    """
+    depends_on 관계를 따라 실행 가능한(선행 단계가 모두 끝난) 단계들을 스레드 풀에서 동시에 실행합니다.
+    모든 단계를 한 번의 노드 실행 안에서 처리하며, past_steps와 sources는 계획 순서대로 병합합니다.
+    """
+    step_ids, dependencies = _step_dependencies(plan)
+    results: Dict[int, ToolOutput] = {}
+    done_ids: set = set()
+    final_index = None
+
+    while len(results) < len(plan) and final_index is None:
+        ready = _next_ready_steps(plan, step_ids, dependencies, results, done_ids)
+        parallel, finishing = _split_wave(plan, ready)
+        # 트레이싱 스팬의 부모(현재 노드)가 풀 스레드에도 전달되도록 컨텍스트를 복사해서 실행합니다.
+        futures = {i: _executor_pool.submit(contextvars.copy_context().run, _run_step, plan[i], state) for i in parallel}
+        for i in parallel:
+            results[i] = futures[i].result()
+            done_ids.add(step_ids[i])
+
+        # 최종 답변을 만든 단계가 있으면 (계획 순서상 첫 번째 것을 기준으로) 실행을 종료합니다.
+        finals = [i for i in parallel if results[i].is_final_answer]
+        if finals:
+            final_index = min(finals)
+            break
+        for i in finishing:
+            results[i] = _run_step(plan[i], state)
+            done_ids.add(step_ids[i])
+            if results[i].is_final_answer:
+                final_index = i
+                break
+        if final_index is None and _budget_exceeded():
+            break
+
+    return _merge_step_results(state, plan, results, final_index)
+
+
+async def _aexecute_plan_dag(state: AgentState, plan: List[Dict[str, Any]]) -> dict:
+    """_execute_plan_dag의 비동기 버전입니다. 동시 실행 수는 세마포어로 EXECUTOR_MAX_WORKERS개로 제한합니다."""
+    step_ids, dependencies = _step_dependencies(plan)
+    results: Dict[int, ToolOutput] = {}
+    done_ids: set = set()
+    final_index = None
+    semaphore = asyncio.Semaphore(EXECUTOR_MAX_WORKERS)
+
+    async def _bounded_run(step: Dict[str, Any]) -> ToolOutput:
+        async with semaphore:
+            return await _arun_step(step, state)
+
+    while len(results) < len(plan) and final_index is None:
+        ready = _next_ready_steps(plan, step_ids, dependencies, results, done_ids)
+        parallel, finishing = _split_wave(plan, ready)
+        outputs = await asyncio.gather(*[_bounded_run(plan[i]) for i in parallel])
+        for i, output in zip(parallel, outputs):
+            results[i] = output
+            done_ids.add(step_ids[i])
+
+        finals = [i for i in parallel if results[i].is_final_answer]
+        if finals:
+            final_index = min(finals)
+            break
+        for i in finishing:
+            results[i] = await _arun_step(plan[i], state)
+            done_ids.add(step_ids[i])
+            if results[i].is_final_answer:
+                final_index = i
+                break
+        if final_index is None and _budget_exceeded():
+            break
+
+    return _merge_step_results(state, plan, results, final_index)
+
+
+def _apply_single_step(state: AgentState, plan: List[Dict[str, Any]], tool_output: ToolOutput) -> dict:
+    """단일 단계 실행 결과를 상태에 반영하고, 계획을 한 단계 진행합니다."""
+    step = plan[0]
+    past_steps = (state.get("past_steps") or []) + [(json.dumps(step, ensure_ascii=False), tool_output.content)]
+    sources = (state.get("sources") or []) + tool_output.sources
+    updated_state = {"past_steps": past_steps, "sources": sources}
+
+    # 도구가 '최종 답변'을 생성했는지 여부에 따라 상태를 업데이트
+    if tool_output.is_final_answer:
+        updated_state.update({
+            "is_final_answer": True,
+            "final_output": tool_output.content,
+            "messages": state["messages"] + [AIMessage(content=tool_output.content)],
+            "plan": []  # 계획 종료
+        })
+    else:
+        updated_state["plan"] = plan[1:]  # 다음 계획으로 이동
+
+    return updated_state
 
 
 def executor_node(state: AgentState) -> dict:
-    """계획(plan)의 첫 번째 단계를 실행하고, 그 결과를 상태(state)에 추가합니다."""
+    """
+    계획(plan)의 첫 번째 단계를 실행하고, 그 결과를 상태(state)에 추가합니다.
+    병렬 실행 모드에서는 depends_on을 명시한 다단계 계획 전체를 의존성 그래프(DAG) 순서로 한 번에 실행합니다.
+    """
     print("--- ⚙️ Executor 활동 시작 ---")
     plan = state.get("plan", [])
     if not plan:
         return {}
 
-    step = plan[0]
-    tool_name = step.get("tool_name")
-    invoke_args = step.get("tool_input", {}).copy()
+    if PARALLEL_EXECUTOR_ENABLED and len(plan) > 1 and _uses_dependencies(plan):
+        return _execute_plan_dag(state, plan)
 
-    print(f"--- [실행] 도구: {tool_name} // 인자: {invoke_args} ---")
-    print(f"--- [사고 과정] {step.get('thought', 'N/A')} ---")
+    return _apply_single_step(state, plan, _run_step(plan[0], state))
 
-    try:
-        tool = tool_registry.get_tool(tool_name)
-
-        # 도구가 필요로 하는 컨텍스트(profile, user_query 등)를 동적으로 주입
-        tool_meta = tool_registry.get_tool_metadata(tool_name)
-        current_profile = state.get("current_profile")
-        if tool_meta.get("needs_profile") and current_profile:
-            invoke_args["profile"] = current_profile
-        if tool_meta.get("needs_user_query"):
-            invoke_args["user_query"] = state["messages"][-1].content
-        if tool_meta.get("needs_store_id") and current_profile:
-            invoke_args["store_id"] = current_profile.get("profile_id")
-
-        tool_output_dict = tool.invoke(invoke_args)
-        tool_output = ToolOutput.model_validate(tool_output_dict)
-
-        past_steps = state.get("past_steps", []) + [(json.dumps(step, ensure_ascii=False), tool_output.content)]
-        sources = state.get("sources", []) + tool_output.sources
-        updated_state = {"past_steps": past_steps, "sources": sources}
-
-        # 도구가 '최종 답변'을 생성했는지 여부에 따라 상태를 업데이트
-        if tool_output.is_final_answer:
-            updated_state.update({
-                "is_final_answer": True,
-                "final_output": tool_output.content,
-                "messages": state["messages"] + [AIMessage(content=tool_output.content)],
-                "plan": []  # 계획 종료
-            })
-        else:
-            updated_state["plan"] = plan[1:]  # 다음 계획으로 이동
 
-        return updated_state
+async def aexecutor_node(state: AgentState) -> dict:
+    """executor_node의 비동기 버전입니다."""
+    print("--- ⚙️ Executor 활동 시작 ---")
+    plan = state.get("plan", [])
+    if not plan:
+        return {}
+
+    if PARALLEL_EXECUTOR_ENABLED and len(plan) > 1 and _uses_dependencies(plan):
+        return await _aexecute_plan_dag(state, plan)
 
-    except Exception as e:
-        print(f"--- 🚨 EXECUTOR 예외 발생: {e} ---")
-        error_message = create_tool_error(tool_name, e)
-        past_steps = state.get("past_steps", []) + [(json.dumps(step, ensure_ascii=False), error_message)]
-        return {"plan": plan[1:], "past_steps": past_steps}
+    return _apply_single_step(state, plan, await _arun_step(plan[0], state))
 
 
-def synthesizer_node(state: AgentState) -> dict:
-    """지금까지 수집된 모든 정보(past_steps)를 종합하여 최종 답변을 생성합니다."""
-    print("--- ✍️ Synthesizer 최종 답변 작성 ---")
+def _build_synthesizer_prompt(state: AgentState) -> Tuple[str, dict]:
+    """
+    지금까지 수집된 근거, 대화 기록, 프로필을 토큰 예산 안으로 패킹하여 최종 답변용 프롬프트를 만듭니다.
+    (프롬프트, 패킹 보고서)를 반환합니다.
+    """
     user_query = state['messages'][-1].content
-    conversation_history = "\n".join([f"- {msg.type}: {msg.content}" for msg in state.get('messages', [])[:-1]])
-    profile_json_str = json.dumps(state.get('current_profile'), ensure_ascii=False, indent=2)
+    packed = pack_context(user_query, state.get('messages', [])[:-1], state.get("past_steps") or [],
+                          state.get('current_profile'), memory=state.get("conversation_memory"))
+    report = packed["report"]
+    print(f"🧮 컨텍스트 패킹: {report['tokens_before']} → {report['tokens_after']} 토큰 "
+          f"({report['tokens_saved']} 토큰 절약, 예산 {report['budget']})")
 
     if state.get("past_steps"):
-        evidence = "\n\n".join([f"**실행 내용:** {step}\n**결과:**\n{str(result)[:1000]}..." for step, result in state.get("past_steps")])
-        base_context = f"**[수집된 근거 자료]**\n{evidence}\n\n**[참고: 가맹점 프로필]**\n{profile_json_str}"
+        base_context = f"**[수집된 근거 자료]**\n{packed['evidence']}\n\n**[참고: 가맹점 프로필]**\n{packed['profile']}"
     else:
-        base_context = f"**[가맹점 프로필 정보]**\n{profile_json_str}"
+        base_context = f"**[가맹점 프로필 정보]**\n{packed['profile']}"
 
     prompt = f"""당신은 전문 컨설턴트입니다. 아래 [사용자 질문]에 대해, 주어진 [핵심 근거]와 [이전 대화 내용]을 종합적으로 고려하여 친절하고 명확하게 최종 답변을 작성해주세요.
 만약 [핵심 근거]에 [출처]나 [참고 자료]가 포함되어 있다면, 해당 내용을 인용하여 답변의 신뢰도를 높여주세요.
 
 **[이전 대화 내용]**
-{conversation_history}
+{packed['history']}
 
 **[사용자 질문]**
 {user_query}
@@ -184,18 +589,50 @@ def synthesizer_node(state: AgentState) -> dict:
 
 **[최종 답변]**
 """
-    response = llm.invoke(prompt)
+    return prompt, report
+
+
+def _synthesizer_result(content: str, context_report: dict) -> dict:
     return {
-        "messages": [AIMessage(content=response.content)],
-        "final_output": response.content
+        "messages": [AIMessage(content=content)],
+        "final_output": content,
+        "context_report": context_report,
     }
 
 
+def synthesizer_node(state: AgentState) -> dict:
+    """지금까지 수집된 모든 정보(past_steps)를 종합하여 최종 답변을 생성합니다."""
+    print("--- ✍️ Synthesizer 최종 답변 작성 ---")
+    # 토큰 단위로 스트리밍하여 UI가 첫 토큰부터 바로 표시할 수 있게 합니다.
+    prompt, context_report = _build_synthesizer_prompt(state)
+    return _synthesizer_result(stream_llm_text(llm, prompt), context_report)
+
+
+async def asynthesizer_node(state: AgentState) -> dict:
+    """synthesizer_node의 비동기 버전입니다."""
+    print("--- ✍️ Synthesizer 최종 답변 작성 ---")
+    prompt, context_report = _build_synthesizer_prompt(state)
+    return _synthesizer_result(await astream_llm_text(llm, prompt), context_report)
+
+
+def _budget_exceeded() -> bool:
+    """이번 턴의 토큰 예산을 다 썼으면 남은 계획 단계를 건너뛰도록 True를 반환합니다."""
+    budget = turn_budgets.current()
+    if budget is None or not budget.exceeded:
+        return False
+    print(f"--- 🪙 턴 토큰 예산({budget.max_tokens}) 초과: 남은 계획 단계를 건너뛰고 답변을 종합합니다. ---")
+    return True
+
+
 def after_executor_logic(state: AgentState) -> str:
     """Executor 노드 실행 후, 다음으로 이동할 경로를 결정하는 조건부 로직"""
     if state.get("is_final_answer"):
         # 도구가 최종 답변을 생성했으므로 워크플로우를 즉시 종료
         return "end"
+    elif state.get("plan") and (state.get("turn_usage") or {}).get("exceeded"):
+        # 토큰 예산을 다 썼으므로 남은 단계는 건너뛰고, 지금까지 수집된 정보로 답변을 종합
+        print("--- 🪙 턴 토큰 예산 초과: 남은 계획 단계를 건너뜁니다. ---")
+        return "synthesize"
     elif state.get("plan"):
         # 아직 실행할 계획이 남아있으므로 Executor를 다시 실행
         return "continue"
@@ -204,16 +641,58 @@ def after_executor_logic(state: AgentState) -> str:
         return "synthesize"
 
 
+def _traced_node(name: str, func):
+    """
+    노드 함수를 'node.<이름>' 트레이싱 스팬으로 감싸고, 실행 중에는 이번 턴의 토큰 예산을 현재 예산으로 지정합니다.
+    노드 출력에는 지금까지의 턴 사용량(turn_usage)을 덧붙여 AgentState와 UI에서 볼 수 있게 합니다.
+    스팬을 thread_id로 묶기 위해 래퍼는 항상 config를 받고, 원래 함수에는 받는 경우에만 넘깁니다.
+    """
+    accepts_config = "config" in inspect.signature(func).parameters
+
+    if asyncio.iscoroutinefunction(func):
+        async def awrapper(state: AgentState, config: RunnableConfig) -> dict:
+            thread_id = _thread_id(config)
+            with tracer.span(f"node.{name}", thread_id=thread_id) as span, turn_budgets.bind(thread_id) as budget:
+                result = await (func(state, config) if accepts_config else func(state))
+                span.set(output_keys=",".join(result or {}))
+                return _with_turn_usage(result, budget)
+        awrapper.__name__, awrapper.__doc__ = func.__name__, func.__doc__
+        return awrapper
+
+    def wrapper(state: AgentState, config: RunnableConfig) -> dict:
+        thread_id = _thread_id(config)
+        with tracer.span(f"node.{name}", thread_id=thread_id) as span, turn_budgets.bind(thread_id) as budget:
+            result = func(state, config) if accepts_config else func(state)
+            span.set(output_keys=",".join(result or {}))
+            return _with_turn_usage(result, budget)
+    wrapper.__name__, wrapper.__doc__ = func.__name__, func.__doc__
+    return wrapper
+
+
+def _with_turn_usage(result: dict | None, budget) -> dict | None:
+    if budget is None or not isinstance(result, dict):
+        return result
+    return {**result, "turn_usage": budget.to_dict()}
+
+
+def _node(name: str, func, afunc) -> RunnableLambda:
+    return RunnableLambda(_traced_node(name, func), afunc=_traced_node(name, afunc))
+
+
 # --- 3. 그래프(Graph) 구성 및 컴파일 ---
 
 workflow = StateGraph(AgentState)
 
-# 그래프에 각 노드를 추가
-workflow.add_node("router", router_node)
-workflow.add_node("planner", planner_node)
-workflow.add_node("executor", executor_node)
-workflow.add_node("synthesizer", synthesizer_node)
-workflow.add_node("simple_responder", simple_responder_node)
+# 그래프 노드 이름 목록 (스트림 이벤트에서 노드 출력을 구분할 때 사용)
+NODE_NAMES = ("router", "planner", "executor", "synthesizer", "simple_responder")
+
+# 그래프에 각 노드를 추가 (graph.stream은 동기 함수를, graph.astream은 비동기 함수를 사용)
+# 각 노드는 트레이싱 스팬(node.<이름>)으로 감싸서 등록합니다.
+workflow.add_node("router", _node("router", router_node, arouter_node))
+workflow.add_node("planner", _node("planner", planner_node, aplanner_node))
+workflow.add_node("executor", _node("executor", executor_node, aexecutor_node))
+workflow.add_node("synthesizer", _node("synthesizer", synthesizer_node, asynthesizer_node))
+workflow.add_node("simple_responder", _node("simple_responder", simple_responder_node, asimple_responder_node))
 
 # 워크플로우의 시작점을 'router'로 설정
 workflow.set_entry_point("router")
@@ -242,8 +721,161 @@ workflow.add_conditional_edges(
 workflow.add_edge("synthesizer", END)
 workflow.add_edge("simple_responder", END) # simple_responder는 항상 마지막
 
-# 대화 기록을 관리하기 위한 메모리 세이버를 설정
-memory = MemorySaver()
+# 대화 기록을 관리하기 위한 체크포인터를 설정 (SQLite 파일에 델타 저장, 오래된 스레드는 자동 축출)
+memory = DeltaSqliteSaver(
+    CHECKPOINT_DB_PATH,
+    keep_per_thread=CHECKPOINT_KEEP_PER_THREAD,
+    max_idle_seconds=CHECKPOINT_MAX_IDLE_SECONDS,
+    max_db_bytes=CHECKPOINT_MAX_DB_MB * 1024 * 1024,
+    touch_interval=CHECKPOINT_TOUCH_INTERVAL_SECONDS,
+)
 
 # 최종적으로 그래프를 컴파일하여 실행 가능한 객체를 생성
-graph = workflow.compile(checkpointer=memory)
\ No newline at end of file
+graph = workflow.compile(checkpointer=memory)
+
+
+def load_session(thread_id: str) -> Dict[str, Any] | None:
+    """
+    저장된 스레드의 최신 그래프 상태(messages, current_profile 등)를 반환합니다. 없으면 None을 반환합니다.
+    체크포인트의 대화 요약 스냅샷을 대화 메모리에 복원하고, 그 이후의 메시지 요약을 백그라운드에 예약합니다.
+    """
+    if not thread_id or not memory.thread_exists(thread_id):
+        return None
+    values = graph.get_state({"configurable": {"thread_id": thread_id}}).values or None
+    if values:
+        conversation_memory.restore(thread_id, values.get("conversation_memory"))
+        conversation_memory.schedule_update(thread_id, values.get("messages", []))
+    return values
+
+
+def stream_graph(inputs: Dict[str, Any], config: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    그래프를 실행하며 노드별 출력을 순서대로 반환하는 동기 이터레이터입니다.
+    비동기 모드에서는 공용 이벤트 루프에서 graph.astream을 실행하여, 여러 세션이 하나의 루프를 공유합니다.
+    """
+    turn, error = _TurnRecorder(inputs, config, "stream"), None
+    try:
+        if ASYNC_GRAPH_ENABLED:
+            chunks = iterate_async(graph.astream(inputs, config=turn.config))
+        else:
+            chunks = graph.stream(inputs, config=turn.config)
+        for chunk in chunks:
+            turn.observe(chunk)
+            yield chunk
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        turn.end(error)
+    turn.complete()
+
+
+def iter_answer_events(inputs: Dict[str, Any], config: Dict[str, Any]) -> Iterator[tuple[str, Any]]:
+    """
+    graph.astream_events를 공용 이벤트 루프에서 실행하며, UI에 필요한 이벤트만 골라 동기적으로 반환합니다.
+    - ("node", {노드 이름: 노드 출력}): graph.stream의 청크와 같은 형식의 노드 완료 이벤트
+    - ("token", 텍스트): 최종 답변 LLM(FINAL_ANSWER_TAG)이 생성한 토큰
+    - ("card", 마크다운): 파싱이 끝난 실행 카드 한 장
+    """
+    turn, error = _TurnRecorder(inputs, config, "events"), None
+    events = graph.astream_events(inputs, config=turn.config, version="v2")
+    try:
+        for event in iterate_async(events):
+            kind, name = event["event"], event.get("name")
+            if kind == "on_chat_model_stream" and FINAL_ANSWER_TAG in event.get("tags", []):
+                chunk = event["data"]["chunk"]
+                text = chunk.content if isinstance(chunk.content, str) else ""
+                if text:
+                    turn.span.incr("streamed_chars", len(text))
+                    yield "token", text
+            elif kind == "on_custom_event" and name == ACTION_CARD_EVENT:
+                yield "card", event["data"]["markdown"]
+            elif kind == "on_chain_end" and name in NODE_NAMES and isinstance(event["data"].get("output"), dict):
+                chunk = {name: event["data"]["output"]}
+                turn.observe(chunk)
+                yield "node", chunk
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        turn.end(error)
+    turn.complete()
+
+
+class _TurnRecorder:
+    """
+    대화 한 턴의 루트 트레이싱 스팬, 토큰 예산(LLM 호출별 토큰/지연 시간), 의도/사용 도구를 모으고,
+    턴이 끝나면 사용량을 출력한 뒤 대화 로그에 한 줄로 남깁니다.
+    """
+    def __init__(self, inputs: Dict[str, Any], config: Dict[str, Any], mode: str):
+        messages = inputs.get("messages") or []
+        self.user_input = messages[-1].content if messages else ""
+        self.thread_id = _thread_id(config)
+        self.span = tracer.start_turn(self.thread_id, mode=mode, query_chars=len(self.user_input))
+        self.budget = turn_budgets.start(self.thread_id)
+        self.started = time.perf_counter()
+        self.intent = ""
+        self.intent_source = ""
+        self.answered_by = ""
+        self.tools: List[str] = []
+        self.config = self._with_callbacks(config)
+
+    def _with_callbacks(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """토큰 예산 집계와 LLM 스팬 기록(llm_tracing_callback) 콜백을 실행 config에 추가합니다."""
+        callbacks = config.get("callbacks")
+        if not (callbacks is None or isinstance(callbacks, list)):
+            return config
+        extra = [self.budget, llm_tracing_callback] if tracer.enabled else [self.budget]
+        return {**config, "callbacks": [*(callbacks or []), *extra]}
+
+    def observe(self, chunk: Dict[str, Any]) -> None:
+        """노드 출력에서 의도, 실행된 도구, 최종 답변을 만든 노드를 기록합니다."""
+        for node, output in chunk.items():
+            if not isinstance(output, dict):
+                continue
+            if node == "router" and output.get("intent"):
+                self.intent = output["intent"]
+                self.intent_source = output.get("intent_source", "")
+            if node == "executor" and output.get("past_steps") is not None:
+                self.tools = [json.loads(step).get("tool_name", "") for step, _ in output["past_steps"]]
+            if output.get("final_output"):
+                self.answered_by = node
+
+    def end(self, error: BaseException | None) -> None:
+        """턴 스팬과 토큰 예산을 닫습니다. (오류로 끝난 턴도 호출됩니다)"""
+        turn_budgets.end(self.thread_id, self.budget)
+        self.span.set(input_tokens=self.budget.input_tokens, output_tokens=self.budget.output_tokens)
+        tracer.end_turn(self.span, error)
+
+    def complete(self) -> None:
+        """
+        턴이 끝까지 실행되면 이번 턴까지의 대화로 대화 메모리 요약 갱신을 백그라운드에 예약하고,
+        턴 기록(의도, 도구, 지연 시간, 토큰 수)을 대화 로그에 남깁니다.
+        """
+        latency_ms = (time.perf_counter() - self.started) * 1000
+        usage = self.budget.to_dict()
+        print(f"--- 🪙 턴 사용량: LLM {usage['llm_calls']}회, 토큰 입력 {usage['input_tokens']} / 출력 {usage['output_tokens']}, "
+              f"LLM {usage['llm_latency_ms']:.0f}ms / 전체 {latency_ms:.0f}ms"
+              f"{' (예산 초과)' if usage['exceeded'] else ''} ---")
+        try:
+            values = graph.get_state(self.config).values
+            conversation_memory.schedule_update(self.thread_id, values.get("messages", []))
+        except Exception as e:
+            print(f"⚠️ 대화 메모리 갱신 예약 실패: {e}")
+            return
+        if not CONVERSATION_LOG_ENABLED:
+            return
+        conversation_logger.log_turn(
+            self.user_input,
+            values.get("final_output") or "",
+            agent_used=self.answered_by,
+            intent=self.intent,
+            intent_source=self.intent_source,
+            tools_used=self.tools,
+            latency_ms=latency_ms,
+            input_tokens=usage["input_tokens"],
+            output_tokens=usage["output_tokens"],
+            llm_calls=usage["llm_calls"],
+            llm_latency_ms=usage["llm_latency_ms"],
+            thread_id=self.thread_id,
+        )
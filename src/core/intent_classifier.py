@@ -1,11 +1,9 @@
 # src/core/intent_classifier.py
 
-import os
 import re
-from typing import List, Dict
+import unicodedata
+from typing import List, Dict, Any, Tuple
 
-import streamlit as st
-from dotenv import load_dotenv
 from langchain_core.output_parsers import StrOutputParser
 from langchain_core.prompts import (
     ChatPromptTemplate,
@@ -13,21 +11,25 @@ from langchain_core.prompts import (
     HumanMessagePromptTemplate,
     SystemMessagePromptTemplate,
 )
-from langchain_google_genai import ChatGoogleGenerativeAI
 
-from src.config import PRIMARY_MODEL_NAME
+from src.config import (
+    LOCAL_INTENT_CONFIDENCE_THRESHOLD,
+    INTENT_CACHE_MAXSIZE,
+    INTENT_CACHE_TTL_SECONDS,
+)
+from src.core.llm_factory import llm_factory
+from src.core.local_intent_classifier import (
+    INTENT_LABELS,
+    LLM_LABEL_SOURCE,
+    LocalIntentClassifier,
+    load_labelled_examples_from_log,
+)
+from src.utils.cache import TTLCache
 
 # --- 1. 설정 및 초기화 ---
-load_dotenv()
-google_api_key = st.secrets.get("GOOGLE_API_KEY", os.getenv("GOOGLE_API_KEY"))
-
-# 의도 분류를 위한 전용 LLM 인스턴스
+# 의도 분류를 위한 전용 LLM 인스턴스 (llm_factory가 관리하는 공용 클라이언트)
 try:
-    INTENT_LLM = ChatGoogleGenerativeAI(
-        model=PRIMARY_MODEL_NAME,
-        temperature=0.0,  
-        google_api_key=google_api_key
-    )
+    INTENT_LLM = llm_factory.get("intent")
 except Exception as e:
     print(f"❌ Intent LLM 초기화 오류: {e}")
     INTENT_LLM = None
@@ -125,25 +127,148 @@ def _fallback_logic(query: str) -> str:
     return "unknown"
 
 
-def classify_intent(user_query: str) -> str:
+# 의도 출처: 대화 로그의 'IntentSource' 컬럼에 남고, 로컬 분류기는 LLM이 분류한(llm) 행만 학습합니다.
+# (로컬 분류기/캐시/폴백의 결과로 다시 학습하면 자기 자신의 오분류를 강화하기 때문)
+INTENT_SOURCE_CACHE = "cache"
+INTENT_SOURCE_LOCAL = "local"
+INTENT_SOURCE_LLM = LLM_LABEL_SOURCE
+INTENT_SOURCE_FALLBACK = "fallback"
+
+_local_classifier: LocalIntentClassifier | None = None
+
+# 정규화된 질문을 키로 하는 의도 캐시 (여러 가맹점의 같은 질문 패턴을 재사용)
+_intent_cache = TTLCache(maxsize=INTENT_CACHE_MAXSIZE, ttl_seconds=INTENT_CACHE_TTL_SECONDS)
+
+# 상호명 마스킹 패턴: '{고향***}' 또는 '고향***'
+_STORE_MASK_PATTERN = re.compile(r"\{[^{}]*\}|\S*\*+")
+
+
+def normalize_query(user_query: str) -> str:
+    """
+    의도 캐시의 키로 사용할 정규화된 질문을 만듭니다.
+    유니코드(NFKC), 대소문자, 공백, 상호명 마스킹 표기를 통일합니다.
+    """
+    text = unicodedata.normalize("NFKC", str(user_query)).lower()
+    text = _STORE_MASK_PATTERN.sub("{store}", text)
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def get_intent_cache_stats() -> Dict[str, Any]:
+    """의도 캐시의 크기와 적중/미스 횟수를 반환합니다."""
+    return _intent_cache.stats()
+
+
+def get_local_classifier() -> LocalIntentClassifier:
+    """Few-shot 예시와 대화 로그의 레이블 데이터로 학습된 로컬 분류기를 지연 생성합니다."""
+    global _local_classifier
+    if _local_classifier is None:
+        examples = FEW_SHOT_EXAMPLES + load_labelled_examples_from_log()
+        _local_classifier = LocalIntentClassifier().fit(examples)
+        print(f"✅ 로컬 의도 분류기 학습 완료 (예시 {len(examples)}건)")
+    return _local_classifier
+
+
+def _classify_with_llm(user_query: str) -> str:
+    """Few-shot 프롬프트로 LLM을 호출하여 의도를 분류합니다."""
+    chain = _build_intent_classifier_chain()
+    intent = chain.invoke({"user_query": user_query})
+    return intent.strip().lower()
+
+
+async def _aclassify_with_llm(user_query: str) -> str:
+    """_classify_with_llm의 비동기 버전입니다."""
+    chain = _build_intent_classifier_chain()
+    intent = await chain.ainvoke({"user_query": user_query})
+    return intent.strip().lower()
+
+
+def remember_intent(user_query: str, intent: str) -> bool:
+    """
+    LLM 분류나 다른 경로(예: Router+Planner 통합 호출)에서 얻은 의도를 캐시에 저장합니다.
+    INTENT_LABELS에 없는(형식이 잘못된) 의도는 저장하지 않고 False를 반환합니다.
     """
-    사용자 질문의 의도를 분류합니다.
+    if intent not in INTENT_LABELS:
+        print(f"⚠️ 알 수 없는 의도 '{intent}'는 캐시하지 않습니다.")
+        return False
+    _intent_cache.set(normalize_query(user_query), intent)
+    return True
 
-    LLM을 사용한 분류를 우선 시도하고, 실패 시 폴백 로직을 사용합니다.
+
+def classify_intent_fast(user_query: str) -> Tuple[str, str] | None:
+    """
+    LLM을 호출하지 않는 경로(의도 캐시, 로컬 분류기)만으로 의도를 분류하여 (의도, 출처)를 반환합니다.
+    확신할 수 없으면 None을 반환합니다.
+    """
+    cache_key = normalize_query(user_query)
+    cached_intent = _intent_cache.get(cache_key)
+    if cached_intent:
+        print(f"--- 💾 의도 캐시 적중: {cached_intent} ---")
+        return cached_intent, INTENT_SOURCE_CACHE
+
+    local_intent, confidence = get_local_classifier().predict(user_query)
+    if confidence >= LOCAL_INTENT_CONFIDENCE_THRESHOLD:
+        print(f"--- ⚡ 로컬 의도 분류: {local_intent} (신뢰도 {confidence:.2f}) ---")
+        _intent_cache.set(cache_key, local_intent)
+        return local_intent, INTENT_SOURCE_LOCAL
+    return None
+
+
+def classify_intent_with_source(user_query: str) -> Tuple[str, str]:
+    """
+    사용자 질문의 의도를 분류하여 (의도, 출처)를 반환합니다.
+
+    정규화된 질문이 의도 캐시에 있으면 바로 반환합니다.
+    그 다음 로컬 분류기의 신뢰도가 임계값 이상이면 즉시 반환하고,
+    그렇지 않으면 LLM을 사용한 분류를 시도하며, 실패 시 폴백 로직을 사용합니다.
 
     Args:
         user_query: 사용자가 입력한 원본 질문 문자열.
 
     Returns:
-        분류된 의도 키워드 문자열 (예: 'profile_query').
+        (분류된 의도 키워드 문자열 (예: 'profile_query'), 출처 ('cache'/'local'/'llm'/'fallback')).
     """
+    fast = classify_intent_fast(user_query)
+    if fast:
+        return fast
+
+    if not INTENT_LLM:
+        return _fallback_logic(user_query), INTENT_SOURCE_FALLBACK
+
+    try:
+        intent = _classify_with_llm(user_query)
+        # 폴백 추정치는 캐시하지 않고, 정상적으로 분류된 결과만 저장합니다. (알 수 없는 레이블이면 폴백)
+        if not remember_intent(user_query, intent):
+            return _fallback_logic(user_query), INTENT_SOURCE_FALLBACK
+        return intent, INTENT_SOURCE_LLM
+    except Exception as e:
+        print(f"❌ 의도 분류 중 오류 발생: {e}")
+        return _fallback_logic(user_query), INTENT_SOURCE_FALLBACK
+
+
+async def aclassify_intent_with_source(user_query: str) -> Tuple[str, str]:
+    """classify_intent_with_source의 비동기 버전입니다. 캐시/로컬 분류는 즉시 끝나므로 LLM 호출만 비동기로 대기합니다."""
+    fast = classify_intent_fast(user_query)
+    if fast:
+        return fast
+
     if not INTENT_LLM:
-        return _fallback_logic(user_query)
+        return _fallback_logic(user_query), INTENT_SOURCE_FALLBACK
 
     try:
-        chain = _build_intent_classifier_chain()
-        intent = chain.invoke({"user_query": user_query})
-        return intent.strip().lower()
+        intent = await _aclassify_with_llm(user_query)
+        if not remember_intent(user_query, intent):
+            return _fallback_logic(user_query), INTENT_SOURCE_FALLBACK
+        return intent, INTENT_SOURCE_LLM
     except Exception as e:
         print(f"❌ 의도 분류 중 오류 발생: {e}")
-        return _fallback_logic(user_query)
\ No newline at end of file
+        return _fallback_logic(user_query), INTENT_SOURCE_FALLBACK
+
+
+def classify_intent(user_query: str) -> str:
+    """사용자 질문의 의도 키워드만 반환합니다. (출처가 필요 없는 호출용, classify_intent_with_source 참고)"""
+    return classify_intent_with_source(user_query)[0]
+
+
+async def aclassify_intent(user_query: str) -> str:
+    """classify_intent의 비동기 버전입니다."""
+    return (await aclassify_intent_with_source(user_query))[0]
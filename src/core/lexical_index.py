@@ -0,0 +1,158 @@
+# src/core/lexical_index.py
+
+import json
+import math
+import os
+import re
+import shutil
+import time
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from src.core.near_duplicate import INTERNAL_METADATA_KEYS
+
+# BM25 파라미터
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+_WORD = re.compile(r"\w+")
+_ARRAYS = ("terms", "offsets", "postings_doc", "postings_tf", "doc_norm")
+
+
+def tokenize(text: str) -> List[int]:
+    """
+    텍스트를 문자 bigram 코드 목록으로 바꿉니다. (형태소 분석기 없이도 '성동구', '희망리턴패키지' 같은 한국어 고유명사가 맞춰집니다)
+    - NFKC 정규화 + 소문자화 후, 단어(\\w+)마다 인접한 두 글자를 (앞 글자 << 21 | 뒤 글자) 정수 하나로 만듭니다.
+    - 한 글자 단어는 그 글자 코드 자체를 사용합니다. (bigram 코드와 겹치지 않습니다)
+    """
+    codes = []
+    for word in _WORD.findall(unicodedata.normalize("NFKC", text).lower()):
+        if len(word) == 1:
+            codes.append(ord(word))
+        else:
+            codes.extend((ord(a) << 21) | ord(b) for a, b in zip(word, word[1:]))
+    return codes
+
+
+def document_text(document: str, metadata: Dict[str, Any] | None) -> str:
+    """색인할 텍스트: 본문 + 문자열 메타데이터 값(공고명, 문서 제목 등 본문에 없는 고유명사 포함, 중복 탐지용 서명 제외)"""
+    values = [v for k, v in (metadata or {}).items() if isinstance(v, str) and k not in INTERNAL_METADATA_KEYS]
+    return " ".join([document or "", *values])
+
+
+def build_index(index_dir: str, ids: Sequence[str], texts: Iterable[str]) -> int:
+    """
+    문서들로 BM25 역색인을 만들어 index_dir에 저장하고, 색인한 문서 수를 반환합니다.
+    배열은 .npy 파일로 저장하여 조회 시 메모리 매핑(np.load(mmap_mode="r"))으로 바로 열 수 있습니다.
+    임시 디렉토리에 다 쓴 뒤 교체하므로, 색인을 다시 만드는 동안에도 기존 색인을 읽을 수 있습니다.
+    """
+    postings: Dict[int, List[Tuple[int, int]]] = {}
+    doc_len = []
+    for doc_index, text in enumerate(texts):
+        counts = Counter(tokenize(text))
+        doc_len.append(sum(counts.values()))
+        for code, tf in counts.items():
+            postings.setdefault(code, []).append((doc_index, tf))
+
+    n_docs = len(doc_len)
+    if n_docs != len(ids):
+        raise ValueError(f"문서 ID 수({len(ids)})와 문서 수({n_docs})가 다릅니다.")
+    terms = np.array(sorted(postings), dtype=np.uint64)
+    offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(postings[int(t)]) for t in terms])
+    postings_doc = np.empty(int(offsets[-1]), dtype=np.int32)
+    postings_tf = np.empty(int(offsets[-1]), dtype=np.float32)
+    for i, term in enumerate(terms):
+        entries = postings[int(term)]
+        postings_doc[offsets[i]:offsets[i + 1]] = [d for d, _ in entries]
+        postings_tf[offsets[i]:offsets[i + 1]] = [tf for _, tf in entries]
+    lengths = np.array(doc_len, dtype=np.float32)
+    avgdl = float(lengths.mean()) if n_docs else 0.0
+    # BM25 분모의 문서 길이 항을 미리 계산해 둡니다: k1 * (1 - b + b * dl / avgdl)
+    doc_norm = (BM25_K1 * (1 - BM25_B + BM25_B * lengths / avgdl)) if avgdl else np.full(n_docs, BM25_K1, np.float32)
+
+    tmp_dir = f"{index_dir}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    for name, arr in zip(_ARRAYS, (terms, offsets, postings_doc, postings_tf, doc_norm.astype(np.float32))):
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), arr)
+    with open(os.path.join(tmp_dir, "ids.json"), "w", encoding="utf-8") as f:
+        json.dump(list(ids), f, ensure_ascii=False)
+    with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"n_docs": n_docs, "n_terms": len(terms), "avgdl": avgdl, "k1": BM25_K1, "b": BM25_B,
+                   "built_at": time.time()}, f)
+    # 이미 열려 있는 색인의 파일은 삭제되어도 매핑이 유지되므로, 기존 디렉토리를 지우고 바꿔 끼웁니다.
+    shutil.rmtree(index_dir, ignore_errors=True)
+    os.replace(tmp_dir, index_dir)
+    return n_docs
+
+
+def build_index_from_collection(collection, index_dir: str, batch_size: int = 1000) -> int:
+    """ChromaDB 컬렉션의 전체 문서(본문 + 메타데이터)를 읽어 색인을 다시 만듭니다."""
+    ids, texts = [], []
+    total = collection.count()
+    for offset in range(0, total, batch_size):
+        batch = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+        ids.extend(batch["ids"])
+        texts.extend(document_text(doc, meta) for doc, meta in zip(batch["documents"], batch["metadatas"]))
+    return build_index(index_dir, ids, texts)
+
+
+class LexicalIndex:
+    """메모리 매핑한 BM25 역색인입니다. 열 때 배열을 읽지 않으므로 문서 수와 관계없이 바로 열립니다."""
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        with open(os.path.join(index_dir, "meta.json"), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        with open(os.path.join(index_dir, "ids.json"), encoding="utf-8") as f:
+            self.ids: List[str] = json.load(f)
+        arrays = {name: np.load(os.path.join(index_dir, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+        self.terms = arrays["terms"]
+        self.offsets = arrays["offsets"]
+        self.postings_doc = arrays["postings_doc"]
+        self.postings_tf = arrays["postings_tf"]
+        self.doc_norm = arrays["doc_norm"]
+        self.n_docs = int(self.meta["n_docs"])
+        self.k1 = float(self.meta["k1"])
+
+    @classmethod
+    def open(cls, index_dir: str) -> "LexicalIndex | None":
+        """색인이 없으면 None을 반환합니다."""
+        if not os.path.exists(os.path.join(index_dir, "meta.json")):
+            return None
+        return cls(index_dir)
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """BM25 점수가 높은 순으로 (문서 ID, 점수)를 최대 k개 반환합니다."""
+        codes = np.array(sorted(set(tokenize(query))), dtype=np.uint64)
+        if not len(codes) or not self.n_docs or not len(self.terms):
+            return []
+        positions = np.searchsorted(self.terms, codes)
+        in_range = positions < len(self.terms)
+        positions, codes = positions[in_range], codes[in_range]
+        scores = np.zeros(self.n_docs, dtype=np.float32)
+        for pos in positions[self.terms[positions] == codes]:
+            start, end = int(self.offsets[pos]), int(self.offsets[pos + 1])
+            df = end - start
+            idf = math.log(1 + (self.n_docs - df + 0.5) / (df + 0.5))
+            docs = self.postings_doc[start:end]
+            tf = self.postings_tf[start:end]
+            scores[docs] += idf * tf * (self.k1 + 1) / (tf + self.doc_norm[docs])
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.ids[i], float(scores[i])) for i in ranked]
+
+
+def reciprocal_rank_fusion(rankings: Iterable[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """여러 순위 목록을 RRF(점수 = Σ 1 / (k + 순위))로 합쳐 (ID, 점수)를 점수순으로 반환합니다. 동점이면 먼저 나온 목록의 순서를 따릅니다."""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: -item[1])
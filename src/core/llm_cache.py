@@ -0,0 +1,179 @@
+# src/core/llm_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from src.config import (
+    LLM_CACHE_MODE,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MAX_AGE_SECONDS,
+    LLM_CACHE_MAX_MB,
+)
+from src.utils.tracing import tracer
+
+SCHEMA = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+# 캐시 모드
+# - off: 사용하지 않음
+# - on: 온도 0(결정적) 호출만 캐시하고, 없으면 실제로 호출한 뒤 저장
+# - record: 모든 호출을 캐시/저장 (replay용 응답 녹화)
+# - replay: 저장된 응답만 사용하고, 없으면 LLMReplayMissError 발생 (네트워크 없이 재현 가능한 실행용)
+CACHE_MODES = ("off", "on", "record", "replay")
+
+
+class LLMReplayMissError(RuntimeError):
+    """replay 모드에서 녹화되지 않은 프롬프트로 LLM을 호출했을 때 발생합니다."""
+
+
+def make_key(prompt: str, llm_string: str) -> str:
+    """모델/파라미터 문자열과 정확한 프롬프트로 만든 내용 기반(content-addressed) 키"""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class DiskLLMCache(BaseCache):
+    """
+    LLM 응답을 SQLite 파일에 저장하는 LangChain 캐시입니다. (ChatModel의 cache= 인자로 연결)
+    오래된 응답(max_age_seconds)과 전체 크기 한도(max_bytes)를 넘는 응답은 마지막 사용 시각이 오래된 것부터 지웁니다.
+    replay 모드에서는 녹화된 응답을 지우지 않으며, 새로 저장하지도 않습니다.
+    """
+    def __init__(self, path: str, mode: str = "on", max_age_seconds: float = 7 * 24 * 3600,
+                 max_bytes: int = 256 * 1024 * 1024, evict_every: int = 100):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"알 수 없는 LLM 캐시 모드입니다: {mode} (가능한 값: {CACHE_MODES})")
+        self.path = path
+        self.mode = mode
+        self.max_age_seconds = max_age_seconds
+        self.max_bytes = max_bytes
+        self.evict_every = evict_every
+        self._lock = threading.RLock()
+        self._conn: sqlite3.Connection | None = None
+        self._updates_since_evict = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # 캐시를 쓰지 않는 실행에서는 파일을 만들지 않도록 처음 사용할 때 연결합니다.
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def applies_to(self, temperature: float) -> bool:
+        """이 온도의 호출에 캐시를 적용할지 여부"""
+        if self.mode == "off":
+            return False
+        if self.mode == "on":
+            return temperature == 0
+        return True
+
+    # --- 1. 원시 텍스트 조회/저장 (LangChain 외의 SDK 호출에서도 사용) ---
+
+    def lookup_text(self, prompt: str, llm_string: str) -> Optional[str]:
+        key = make_key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute("SELECT value, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is not None and (self.mode == "replay" or now - row[1] <= self.max_age_seconds):
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                self.hits += 1
+                tracer.current_span().incr("llm_cache_hits")
+                return row[0]
+            self.misses += 1
+            tracer.current_span().incr("llm_cache_misses")
+        if self.mode == "replay":
+            raise LLMReplayMissError(f"replay 모드: 녹화된 응답이 없습니다. (key={key[:12]}…, {llm_string[:80]})")
+        return None
+
+    def update_text(self, prompt: str, llm_string: str, value: str) -> None:
+        if self.mode == "replay":
+            return
+        now = time.time()
+        with self._lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size_bytes, created_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (make_key(prompt, llm_string), value, len(value.encode("utf-8")), now, now),
+            )
+            self.conn.commit()
+            self._updates_since_evict += 1
+            if self._updates_since_evict >= self.evict_every:
+                self.evict()
+
+    # --- 2. LangChain BaseCache 인터페이스 ---
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        value = self.lookup_text(prompt, llm_string)
+        if value is None:
+            return None
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return loads(value)
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        self.update_text(prompt, llm_string, dumps(list(return_val)))
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM responses")
+            self.conn.commit()
+
+    # --- 3. 축출 ---
+
+    def evict(self) -> int:
+        """만료된 응답을 지우고, 전체 크기가 한도를 넘으면 가장 오래 전에 사용된 응답부터 지웁니다."""
+        if self.mode == "replay":
+            return 0
+        with self._lock:
+            self._updates_since_evict = 0
+            cur = self.conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.max_age_seconds,))
+            removed = cur.rowcount
+            total = self.conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in self.conn.execute("SELECT key, size_bytes FROM responses ORDER BY last_access").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    self.conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    total -= size
+                    removed += 1
+            self.conn.commit()
+            return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+llm_response_cache = DiskLLMCache(
+    LLM_CACHE_PATH,
+    mode=LLM_CACHE_MODE,
+    max_age_seconds=LLM_CACHE_MAX_AGE_SECONDS,
+    max_bytes=LLM_CACHE_MAX_MB * 1024 * 1024,
+)
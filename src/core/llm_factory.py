@@ -0,0 +1,138 @@
+# src/core/llm_factory.py
+
+import os
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Tuple
+
+import streamlit as st
+from dotenv import load_dotenv
+from langchain_core.messages import HumanMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from src.config import (
+    LLM_ROLES,
+    LLM_WARMUP_PING,
+    LLM_BACKEND,
+    FAKE_LLM_LATENCY_MS,
+    FAKE_LLM_CHUNK_DELAY_MS,
+)
+from src.core.llm_cache import llm_response_cache
+
+load_dotenv()
+
+
+class LLMFactory:
+    """
+    프로젝트 전역의 LLM 클라이언트를 (모델, 온도, 역할)별로 한 번만 생성하여 재사용하는 팩토리입니다.
+    클라이언트는 내부 gRPC 채널을 계속 유지하므로, 호출마다 연결 수립/인증 비용을 다시 내지 않습니다.
+    역할별 기본 모델/온도는 config.LLM_ROLES에서 관리합니다.
+    """
+    def __init__(self, roles: Dict[str, Tuple[str, float]], backend: str = "gemini"):
+        self.roles = roles
+        self.backend = backend
+        self._clients: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+        self._genai_configured = False
+        self.created = 0
+        self.reused = 0
+        # 역할 -> 워밍업 호출 지연 시간(ms)
+        self.warmup_ms: Dict[str, float] = {}
+
+    @staticmethod
+    def api_key() -> str | None:
+        try:
+            return st.secrets.get("GOOGLE_API_KEY", os.getenv("GOOGLE_API_KEY"))
+        except Exception:
+            # secrets.toml이 없는 환경(스크립트 실행 등)에서는 환경 변수만 사용합니다.
+            return os.getenv("GOOGLE_API_KEY")
+
+    def _get_or_create(self, key: Hashable, create) -> Any:
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.reused += 1
+                return client
+            client = create()
+            self._clients[key] = client
+            self.created += 1
+            return client
+
+    def get(self, role: str, model: str | None = None, temperature: float | None = None) -> ChatGoogleGenerativeAI:
+        """역할에 해당하는 LangChain 채팅 모델을 반환합니다. model/temperature를 지정하면 역할 기본값을 덮어씁니다."""
+        default_model, default_temperature = self.roles.get(role, self.roles["default"])
+        model = model or default_model
+        temperature = default_temperature if temperature is None else temperature
+        # 모델/파라미터/프롬프트가 같은 호출은 디스크 캐시(llm_cache)의 응답을 재사용합니다.
+        cache = llm_response_cache if llm_response_cache.applies_to(temperature) else None
+
+        def create():
+            if self.backend == "fake":
+                from src.core.fake_llm import FakeChatModel
+                return FakeChatModel(model=model, temperature=temperature, latency_ms=FAKE_LLM_LATENCY_MS,
+                                     chunk_delay_ms=FAKE_LLM_CHUNK_DELAY_MS, cache=cache)
+            return ChatGoogleGenerativeAI(model=model, google_api_key=self.api_key(), temperature=temperature,
+                                          cache=cache)
+
+        return self._get_or_create(("chat", model, temperature, role), create)
+
+    def get_genai_model(self, role: str, model_name: str, generation_config: Dict[str, Any],
+                        safety_settings: List[Dict[str, str]]) -> Any:
+        """
+        google.generativeai의 GenerativeModel을 반환합니다. (스트리밍 카드 파싱 등 SDK를 직접 쓰는 경우)
+        genai.configure는 전역 클라이언트를 다시 만들기 때문에 프로세스에서 한 번만 호출합니다.
+        """
+        def create():
+            if self.backend == "fake":
+                from src.core.fake_llm import FakeGenerativeModel
+                return FakeGenerativeModel(model_name, latency_ms=FAKE_LLM_LATENCY_MS,
+                                           chunk_delay_ms=FAKE_LLM_CHUNK_DELAY_MS)
+            import google.generativeai as genai
+            if not self._genai_configured:
+                api_key = self.api_key()
+                if not api_key:
+                    raise ValueError('GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.')
+                genai.configure(api_key=api_key)
+                self._genai_configured = True
+            return genai.GenerativeModel(
+                model_name=model_name,
+                generation_config=generation_config,
+                safety_settings=safety_settings
+            )
+
+        key = ("genai", model_name, generation_config.get("temperature"), role)
+        return self._get_or_create(key, create)
+
+    def warm_up(self, roles: List[str] | None = None, ping: bool = LLM_WARMUP_PING) -> Dict[str, float]:
+        """
+        역할별 클라이언트를 미리 생성하고, ping이 True이면 짧은 호출로 연결/인증까지 미리 맺어둡니다.
+        같은 (모델, 온도) 조합은 연결을 공유하지 않으므로 역할마다 한 번씩 호출합니다.
+        """
+        if llm_response_cache.mode == "replay":
+            ping = False  # replay 모드는 네트워크 없이 실행하므로 연결을 미리 맺지 않습니다.
+        for role in roles or [r for r in self.roles if r != "default"]:
+            start = time.perf_counter()
+            try:
+                client = self.get(role)
+                if ping:
+                    # invoke는 응답 캐시(온도 0 역할)에서 답해 네트워크 호출 없이 끝날 수 있으므로, 캐시를 거치지 않는 _generate로 호출합니다.
+                    client._generate([HumanMessage(content="ping")], generation_config={"max_output_tokens": 1})
+            except Exception as e:
+                print(f"⚠️ LLM 워밍업 실패 (역할: {role}): {e}")
+                continue
+            self.warmup_ms[role] = round((time.perf_counter() - start) * 1000, 1)
+        print(f"✅ LLM 클라이언트 워밍업 완료: {self.warmup_ms}")
+        return self.warmup_ms
+
+    def warm_up_in_background(self) -> None:
+        """앱 시작을 막지 않도록 워밍업을 데몬 스레드에서 실행합니다."""
+        threading.Thread(target=self.warm_up, name="llm-warmup", daemon=True).start()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"backend": self.backend, "clients": len(self._clients), "created": self.created, "reused": self.reused,
+                    "warmup_ms": dict(self.warmup_ms), "response_cache": llm_response_cache.stats()}
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+llm_factory = LLMFactory(LLM_ROLES, backend=LLM_BACKEND)
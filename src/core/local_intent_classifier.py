@@ -0,0 +1,160 @@
+# src/core/local_intent_classifier.py
+
+import csv
+import math
+import os
+import re
+import unicodedata
+from collections import Counter, defaultdict
+from typing import Dict, List, Tuple
+
+from src.utils.logger import LOG_FILE, rotated_log_files
+
+# 로컬 분류기가 예측할 수 있는 의도 키워드 목록 (intent_classifier의 카테고리와 동일)
+INTENT_LABELS = (
+    "profile_query",
+    "general_rag_search",
+    "bigcon_request",
+    "data_analysis",
+    "marketing_idea",
+    "video_recommendation",
+    "policy_recommendation",
+    "greeting",
+    "unknown",
+)
+
+# 대화 로그 파일 경로 (src/utils/logger.py가 기록하는 파일)
+CONVERSATION_LOG_PATH = LOG_FILE
+# 학습에 사용할 행의 의도 출처('IntentSource' 컬럼 값): LLM이 분류한 의도만 정답 레이블로 봅니다.
+LLM_LABEL_SOURCE = "llm"
+
+
+def _normalize(text: str) -> str:
+    """NFKC 정규화, 소문자화, 공백 정리를 수행합니다."""
+    text = unicodedata.normalize("NFKC", str(text)).lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def _char_ngrams(text: str, ngram_range: Tuple[int, int]) -> Counter:
+    """공백 경계를 포함한 문자 n-gram 빈도를 계산합니다. (한국어 조사/어미 변화에 강함)"""
+    padded = f" {_normalize(text)} "
+    low, high = ngram_range
+    grams = Counter()
+    for n in range(low, high + 1):
+        for i in range(len(padded) - n + 1):
+            grams[padded[i:i + n]] += 1
+    return grams
+
+
+class LocalIntentClassifier:
+    """
+    문자 n-gram TF-IDF + 가중 kNN 기반의 경량 의도 분류기입니다.
+    외부 라이브러리 없이 프로세스 내에서 동작하며, 예시 수십~수천 건 규모에서
+    질의 1건당 1ms 미만으로 (의도, 신뢰도)를 반환합니다.
+    """
+    def __init__(self, ngram_range: Tuple[int, int] = (1, 3), k: int = 5, min_similarity: float = 0.2):
+        self.ngram_range = ngram_range
+        self.k = k
+        self.min_similarity = min_similarity
+        self._idf: Dict[str, float] = {}
+        self._vectors: List[Dict[str, float]] = []
+        self._labels: List[str] = []
+        # 역색인: n-gram -> [(예시 인덱스, 가중치)]. 질의와 겹치는 예시만 점수를 계산합니다.
+        self._postings: Dict[str, List[Tuple[int, float]]] = defaultdict(list)
+
+    @property
+    def is_fitted(self) -> bool:
+        return bool(self._vectors)
+
+    def fit(self, examples: List[Dict[str, str]]) -> "LocalIntentClassifier":
+        """{'input': 질문, 'output': 의도} 형식의 예시 목록으로 분류기를 학습합니다."""
+        docs = [(_char_ngrams(ex["input"], self.ngram_range), ex["output"])
+                for ex in examples if ex.get("input") and ex.get("output") in INTENT_LABELS]
+
+        doc_freq = Counter()
+        for grams, _ in docs:
+            doc_freq.update(grams.keys())
+        n_docs = len(docs)
+        self._idf = {g: math.log((1 + n_docs) / (1 + df)) + 1.0 for g, df in doc_freq.items()}
+
+        self._vectors, self._labels = [], []
+        self._postings = defaultdict(list)
+        for idx, (grams, label) in enumerate(docs):
+            vec = self._weigh(grams)
+            self._vectors.append(vec)
+            self._labels.append(label)
+            for g, w in vec.items():
+                self._postings[g].append((idx, w))
+        return self
+
+    def _weigh(self, grams: Counter) -> Dict[str, float]:
+        """sublinear TF * IDF 가중치를 계산하고 L2 정규화합니다. 학습 어휘에 없는 n-gram은 무시합니다."""
+        vec = {g: (1.0 + math.log(tf)) * self._idf[g] for g, tf in grams.items() if g in self._idf}
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        return {g: w / norm for g, w in vec.items()} if norm else {}
+
+    def predict(self, query: str) -> Tuple[str, float]:
+        """
+        질문의 의도와 신뢰도(0~1)를 반환합니다.
+        신뢰도는 상위 k개 이웃의 유사도 가중 투표에서 1위 의도가 차지하는 비율이며,
+        가장 가까운 예시조차 충분히 유사하지 않으면 0을 반환합니다.
+        """
+        if not self.is_fitted:
+            return "unknown", 0.0
+
+        query_vec = self._weigh(_char_ngrams(query, self.ngram_range))
+        scores: Dict[int, float] = defaultdict(float)
+        for g, w in query_vec.items():
+            for idx, dw in self._postings.get(g, ()):
+                scores[idx] += w * dw
+        if not scores:
+            return "unknown", 0.0
+
+        neighbours = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:self.k]
+        if neighbours[0][1] < self.min_similarity:
+            return self._labels[neighbours[0][0]], 0.0
+
+        votes: Dict[str, float] = defaultdict(float)
+        for idx, sim in neighbours:
+            votes[self._labels[idx]] += sim
+        best_label, best_score = max(votes.items(), key=lambda item: item[1])
+        return best_label, best_score / sum(votes.values())
+
+
+def _read_log_rows(path: str) -> List[Dict[str, str]]:
+    if path.endswith(".parquet"):
+        import pandas as pd
+
+        return pd.read_parquet(path).astype(str).to_dict("records")
+    with open(path, mode="r", newline="", encoding="utf-8-sig") as f:
+        return list(csv.DictReader(f))
+
+
+def load_labelled_examples_from_log(log_path: str = CONVERSATION_LOG_PATH) -> List[Dict[str, str]]:
+    """
+    대화 로그 CSV(와 회전되어 보관 중인 세그먼트)에서 의도 레이블이 붙은 행을 학습 예시로 읽어옵니다.
+    - 'IntentSource' 컬럼이 있으면 LLM이 분류한(llm) 행의 'Intent'만 사용합니다. (캐시/로컬 분류기/폴백 결과는 제외)
+    - 출처 없이 'Intent'만 있는 예전 형식의 행은 로컬 분류기의 예측이 섞여 있을 수 있어 사용하지 않습니다.
+    - 둘 다 없는 기존 로그는 'AgentUsed' 값이 의도 키워드인 행만 사용합니다.
+    """
+    paths = rotated_log_files(log_path) + ([log_path] if os.path.isfile(log_path) else [])
+
+    examples = []
+    for path in paths:
+        try:
+            for row in _read_log_rows(path):
+                query = (row.get("UserInput") or "").strip()
+                if "IntentSource" in row:
+                    if (row.get("IntentSource") or "").strip() != LLM_LABEL_SOURCE:
+                        continue
+                    label = row.get("Intent") or ""
+                elif "Intent" in row:
+                    continue
+                else:
+                    label = row.get("AgentUsed") or ""
+                label = label.strip().lower()
+                if query and label in INTENT_LABELS:
+                    examples.append({"input": query, "output": label})
+        except Exception as e:
+            print(f"⚠️ 대화 로그에서 의도 예시를 읽는 중 오류 발생 ({path}): {e}")
+    return examples
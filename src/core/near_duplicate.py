@@ -0,0 +1,153 @@
+# src/core/near_duplicate.py
+
+import base64
+import re
+import zlib
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# MinHash 순열 수와 LSH 밴드 구성 (밴드 8개 x 행 8개: 추정 Jaccard 약 0.77 이상인 쌍을 후보로 찾습니다)
+NUM_PERM = 64
+LSH_BANDS = 8
+SHINGLE_SIZE = 3
+
+# 청크 메타데이터에 저장하는 키: MinHash 서명(base64) / 대표 청크 ID(cluster 모드)
+SIGNATURE_KEY = "minhash"
+CLUSTER_KEY = "dup_cluster"
+# 검색 색인(BM25)과 검색 결과(프롬프트)에서 제외할 내부용 메타데이터 키
+INTERNAL_METADATA_KEYS = frozenset({SIGNATURE_KEY, CLUSTER_KEY})
+
+_rng = np.random.default_rng(20240901)
+# 프로세스/실행과 관계없이 같은 서명이 나오도록 고정 시드의 해시 계수를 사용합니다. (서명을 메타데이터에 저장하기 때문)
+# multiply-shift 해시: 홀수 a, 임의 b에 대해 ((a·x + b) mod 2^64) >> 32
+_PERM_A = _rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+_PERM_B = _rng.integers(0, 1 << 63, size=NUM_PERM, dtype=np.uint64)
+_SHIFT = np.uint64(32)
+
+
+def _shingle_hashes(text: str, n: int = SHINGLE_SIZE) -> np.ndarray:
+    """공백을 없앤 소문자 텍스트의 문자 n-gram을 crc32로 해시합니다. (context_packer의 중복 판정과 같은 방식의 shingle)"""
+    compact = re.sub(r"\s+", "", text.lower())
+    grams = {compact[i:i + n] for i in range(max(1, len(compact) - n + 1))} if compact else set()
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    텍스트의 MinHash 서명(uint32 NUM_PERM개)을 계산합니다. 두 서명에서 같은 값의 비율이 문자 n-gram Jaccard 유사도의 추정치입니다.
+    해시 함수 NUM_PERM개를 모든 shingle에 한 번에 적용하여(NumPy) 계산합니다.
+    """
+    hashes = _shingle_hashes(text)
+    if not len(hashes):
+        return np.full(NUM_PERM, np.iinfo(np.uint32).max, dtype=np.uint32)
+    # uint64 곱셈/덧셈의 오버플로(mod 2^64)를 그대로 이용하고, 섞임이 좋은 상위 32비트만 사용합니다.
+    permuted = (hashes[:, None] * _PERM_A[None, :] + _PERM_B[None, :]) >> _SHIFT
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def encode_signature(signature: np.ndarray) -> str:
+    """ChromaDB 메타데이터(문자열)에 넣을 수 있도록 서명을 base64 문자열로 바꿉니다."""
+    return base64.b64encode(signature.astype("<u4").tobytes()).decode("ascii")
+
+
+def decode_signature(value: str) -> np.ndarray | None:
+    try:
+        signature = np.frombuffer(base64.b64decode(value), dtype="<u4")
+    except (ValueError, TypeError):
+        return None
+    return signature if len(signature) == NUM_PERM else None
+
+
+def estimated_jaccard(a: np.ndarray, b: np.ndarray) -> float:
+    return float(np.mean(a == b))
+
+
+class NearDuplicateIndex:
+    """
+    MinHash LSH로 거의 같은 문서를 찾는 인메모리 색인입니다. (적재 시 청크 중복 제거/클러스터링용)
+    밴드별 버킷에서 후보를 찾은 뒤, 서명 일치율이 threshold 이상인 후보만 중복으로 판정합니다.
+    """
+    def __init__(self, threshold: float = 0.8, bands: int = LSH_BANDS):
+        if NUM_PERM % bands:
+            raise ValueError(f"NUM_PERM({NUM_PERM})은 밴드 수({bands})로 나누어 떨어져야 합니다.")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = NUM_PERM // bands
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._clusters: Dict[str, str] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def find(self, signature: np.ndarray) -> Tuple[str, float] | None:
+        """이미 추가된 문서 중 가장 비슷한 중복 문서의 (키, 추정 유사도)를 반환합니다. 없으면 None."""
+        best = None
+        seen = set()
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            for key in bucket.get(band_key, ()):
+                if key in seen:
+                    continue
+                seen.add(key)
+                similarity = estimated_jaccard(signature, self._signatures[key])
+                if similarity >= self.threshold and (best is None or similarity > best[1]):
+                    best = (key, similarity)
+        return best
+
+    def add(self, key: str, signature: np.ndarray, cluster: str | None = None) -> None:
+        self._signatures[key] = signature
+        self._clusters[key] = cluster or key
+        for bucket, band_key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(band_key, []).append(key)
+
+    def cluster_of(self, key: str) -> str:
+        return self._clusters.get(key, key)
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+
+def index_from_collection(collection, threshold: float, batch_size: int = 1000) -> NearDuplicateIndex:
+    """컬렉션에 이미 저장된 청크의 서명(메타데이터)으로 색인을 채웁니다. 서명이 없는 청크는 본문으로 계산합니다."""
+    index = NearDuplicateIndex(threshold)
+    total = collection.count()
+    for offset in range(0, total, batch_size):
+        batch = collection.get(include=["documents", "metadatas"], limit=batch_size, offset=offset)
+        for chunk_id, doc, meta in zip(batch["ids"], batch["documents"], batch["metadatas"]):
+            meta = meta or {}
+            signature = decode_signature(meta.get(SIGNATURE_KEY, ""))
+            index.add(chunk_id, signature if signature is not None else minhash_signature(doc or ""), meta.get(CLUSTER_KEY))
+    return index
+
+
+def dedupe_chunks(ids: Sequence[str], chunks: Sequence[str], metadatas: Sequence[Dict[str, Any]],
+                  index: NearDuplicateIndex, mode: str = "drop") -> Tuple[List[str], List[str], List[Dict[str, Any]], int]:
+    """
+    적재할 청크마다 MinHash 서명을 계산해 메타데이터에 저장하고, 이미 색인된(앞선 청크 포함) 청크와 거의 같은 청크를 처리합니다.
+    - mode="drop": 중복 청크를 버립니다.
+    - mode="cluster": 모두 적재하되, 대표 청크 ID를 CLUSTER_KEY에 기록합니다. (검색 시 같은 클러스터는 하나만 사용)
+    같은 ID의 기존 청크(재적재)와 일치하는 것은 중복으로 보지 않습니다. (kept_ids, kept_chunks, kept_metadatas, 중복 수)를 반환합니다.
+    """
+    if mode not in ("drop", "cluster"):
+        raise ValueError(f"알 수 없는 중복 처리 방식입니다: {mode} (drop 또는 cluster)")
+    kept_ids, kept_chunks, kept_metadatas = [], [], []
+    duplicates = 0
+    for chunk_id, chunk, meta in zip(ids, chunks, metadatas):
+        signature = minhash_signature(chunk)
+        meta = {**meta, SIGNATURE_KEY: encode_signature(signature)}
+        match = index.find(signature)
+        cluster = chunk_id
+        if match is not None:
+            cluster = index.cluster_of(match[0])
+            if match[0] != chunk_id:
+                duplicates += 1
+                if mode == "drop":
+                    continue
+        if mode == "cluster":
+            meta[CLUSTER_KEY] = cluster
+        index.add(chunk_id, signature, cluster)
+        kept_ids.append(chunk_id)
+        kept_chunks.append(chunk)
+        kept_metadatas.append(meta)
+    return kept_ids, kept_chunks, kept_metadatas, duplicates
@@ -0,0 +1,190 @@
+# src/core/plan_templates.py
+
+import re
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.core.tool_registry import tool_registry
+
+# 계획 템플릿 빌더의 시그니처: (사용자 질문, AgentState) -> 계획(단계 목록)
+PlanBuilder = Callable[[str, Dict[str, Any]], List[Dict[str, Any]]]
+
+# --- 1. 질문 특징(Feature) 정의 ---
+
+# RAG 컬렉션 타입별 대표 키워드. 질문에 포함된 키워드로 검색 범위를 결정합니다.
+COLLECTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "trend": ("트렌드", "요즘", "최신", "유행", "동향", "시장"),
+    "strategy": ("전략", "이론", "기법", "브랜딩", "포지셔닝"),
+    "guide": ("방법", "가이드", "하는 법", "노하우", "운영", "팁"),
+    "case": ("사례", "성공", "정책", "지원사업"),
+}
+
+# 여러 도구의 결과를 엮어야 하는 복합 요청의 신호. 이런 질문은 LLM Planner에게 맡깁니다.
+COMPOSITE_KEYWORDS = ("그리고", "하고 나서", "바탕으로", "비교해서", "분석해서", "결합", "종합")
+
+
+# 템플릿으로 처리할 단순 요청의 형태. 이 패턴에 맞는 짧은 질문만 템플릿을 쓰고, 나머지는 모두 LLM Planner에게 맡깁니다.
+# 마케팅 아이디어: "<홍보 대상/채널> 아이디어/문구 <요청>" (예: "인스타 이벤트 아이디어 좀 줘")
+MARKETING_IDEA_PATTERN = re.compile(
+    r"(이벤트|프로모션|홍보|마케팅|sns|인스타|인스타그램|쿠폰)\S*\s*(아이디어|문구|기획)\S*\s*(좀\s*)?(줘|주세요|추천|제안|알려|만들어|짜)"
+)
+# 데이터 분석: "<지표 대상> <통계 유형> <요청>" (예: "우리 동네 카페 재방문 비율 분석해줘")
+DATA_ANALYSIS_PATTERN = re.compile(
+    r"(매출|방문|재방문|고객|배달|객단가|연령|성별|업종|상권|가맹점)\S*\s*(비율|비중|평균|분포|추이|순위|통계|현황)\S*\s*(좀\s*)?(분석|알려|보여|조회|계산)"
+)
+# 템플릿을 적용할 질문의 최대 길이(글자 수). 긴 질문은 여러 요구가 섞여 있을 가능성이 높습니다.
+TEMPLATE_MAX_QUERY_CHARS = 60
+
+
+def _is_simple_request(query: str, pattern: re.Pattern) -> bool:
+    """짧고, 복합 요청 신호가 없으며, 요청 형태 패턴에 맞는 질문인지 확인합니다."""
+    return (len(query) <= TEMPLATE_MAX_QUERY_CHARS and not _contains_any(query, COMPOSITE_KEYWORDS)
+            and pattern.search(query.lower()) is not None)
+
+
+def _contains_any(text: str, keywords: Tuple[str, ...]) -> bool:
+    return any(k in text for k in keywords)
+
+
+def _matched_collections(query: str) -> List[str]:
+    return [ctype for ctype, keywords in COLLECTION_KEYWORDS.items() if _contains_any(query, keywords)]
+
+
+def _store_context(state: Dict[str, Any]) -> str:
+    basic = (state.get("current_profile") or {}).get("core_data", {}).get("basic_info", {})
+    parts = [basic.get("address_district"), basic.get("industry_main")]
+    return " ".join(p for p in parts if p)
+
+
+# --- 2. 템플릿 정의 ---
+
+class PlanTemplate:
+    """의도 + 질문 특징 조건을 만족할 때 LLM 없이 고정된 형태의 계획을 만들어내는 규칙입니다."""
+    def __init__(self, name: str, intent: str, condition: Callable[[str], bool], build: PlanBuilder):
+        self.name = name
+        self.intent = intent
+        self.condition = condition
+        self.build = build
+
+    def matches(self, intent: str, query: str) -> bool:
+        return intent == self.intent and self.condition(query)
+
+
+def _build_rag_plan(query: str, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    collection_types = _matched_collections(query)[:2]
+    return [{
+        "tool_name": "rag_searcher",
+        "tool_input": {"query": query, "collection_types": collection_types},
+        "thought": f"질문의 핵심 키워드에 맞춰 {collection_types} 자료에서 관련 정보를 검색합니다.",
+    }]
+
+
+def _build_marketing_idea_plan(query: str, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    store_context = _store_context(state)
+    topic = f"{store_context} 가맹점의 요청: {query}" if store_context else query
+    return [{
+        "tool_name": "marketing_idea_generator",
+        "tool_input": {"topic": topic},
+        "thought": "가맹점 업종/위치와 요청 내용을 바탕으로 마케팅 아이디어를 생성합니다.",
+    }]
+
+
+def _build_data_analysis_plan(query: str, state: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{
+        "tool_name": "data_analyzer",
+        "tool_input": {"query": query},
+        "thought": "원본 데이터에서 요청된 조건을 직접 분석합니다.",
+    }]
+
+
+PLAN_TEMPLATES: List[PlanTemplate] = [
+    PlanTemplate(
+        name="rag_by_collection_keywords",
+        intent="general_rag_search",
+        condition=lambda q: 1 <= len(_matched_collections(q)) <= 2 and not _contains_any(q, COMPOSITE_KEYWORDS),
+        build=_build_rag_plan,
+    ),
+    PlanTemplate(
+        name="single_marketing_idea",
+        intent="marketing_idea",
+        condition=lambda q: _is_simple_request(q, MARKETING_IDEA_PATTERN),
+        build=_build_marketing_idea_plan,
+    ),
+    PlanTemplate(
+        name="single_data_analysis",
+        intent="data_analysis",
+        condition=lambda q: _is_simple_request(q, DATA_ANALYSIS_PATTERN),
+        build=_build_data_analysis_plan,
+    ),
+]
+
+
+# --- 3. 템플릿 엔진 ---
+
+class PlanTemplateEngine:
+    """
+    반복적으로 나타나는 요청 형태에 대해 결정론적인 계획을 즉시 생성하는 엔진입니다.
+    일치하는 템플릿이 없으면 None을 반환하여 LLM Planner로 폴백하게 하며,
+    템플릿 적중률과 LLM 호출 생략으로 절약된 시간을 집계합니다.
+    """
+    def __init__(self, templates: List[PlanTemplate]):
+        self.templates = templates
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.total_saved_ms = 0.0
+        # LLM Planner 호출 지연 시간의 이동 평균 (템플릿 사용 시 절약 시간 추정에 사용)
+        self.avg_llm_latency_ms: float | None = None
+
+    def _is_valid(self, plan: List[Dict[str, Any]], allowed_tools: List[str] | None) -> bool:
+        """계획의 각 단계가 등록된 도구를 사용하고 도구 입력 스키마를 통과하는지 검증합니다."""
+        for step in plan:
+            tool_name = step.get("tool_name")
+            if allowed_tools and tool_name not in allowed_tools:
+                return False
+            try:
+                tool = tool_registry.get_tool(tool_name)
+                if tool.args_schema is not None:
+                    tool.args_schema(**step.get("tool_input", {}))
+            except Exception:
+                return False
+        return True
+
+    def match(self, intent: str, user_query: str, state: Dict[str, Any],
+              allowed_tools: List[str] | None = None) -> Tuple[str, List[Dict[str, Any]]] | None:
+        """일치하는 첫 번째 템플릿의 (이름, 검증된 계획)을 반환합니다. 없으면 None을 반환합니다."""
+        for template in self.templates:
+            if not template.matches(intent, user_query):
+                continue
+            plan = template.build(user_query, state)
+            if self._is_valid(plan, allowed_tools):
+                with self._lock:
+                    self.hits += 1
+                    self.total_saved_ms += self.avg_llm_latency_ms or 0.0
+                return template.name, plan
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def record_llm_latency(self, latency_ms: float, alpha: float = 0.2) -> None:
+        """LLM Planner의 실제 지연 시간을 지수 이동 평균으로 기록합니다."""
+        with self._lock:
+            if self.avg_llm_latency_ms is None:
+                self.avg_llm_latency_ms = latency_ms
+            else:
+                self.avg_llm_latency_ms = (1 - alpha) * self.avg_llm_latency_ms + alpha * latency_ms
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "avg_llm_latency_ms": round(self.avg_llm_latency_ms or 0.0, 1),
+                "total_saved_ms": round(self.total_saved_ms, 1),
+            }
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+plan_template_engine = PlanTemplateEngine(PLAN_TEMPLATES)
@@ -2,9 +2,7 @@
 
 import json
 from typing import Dict, Any
-from src.services.data_service import data_service
-
-from typing import Dict, Any
+from src.config import CONTEXT_RECENT_MESSAGES
 from src.services.data_service import data_service
 
 # --- 1. 프롬프트 템플릿 상수 정의 ---
@@ -18,46 +16,80 @@ SYSTEM_MESSAGE = """
 
 # Planner가 계획을 수립할 때 반드시 따라야 할 핵심 규칙입니다.
 PLANNING_RULES = """
-**[계획 수립 4원칙 (매우 중요)]**
+**[계획 수립 5원칙 (매우 중요)]**
 1.  **목표 지향:** 사용자의 최종 목표를 달성하기 위한 가장 효율적인 경로를 설계해야 합니다.
 2.  **도구 전문성 활용:** 각 도구의 전문 분야를 정확히 이해하고, 문제에 가장 적합한 전문가(도구)에게 임무를 할당해야 합니다.
 3.  **신중한 전문가 호출:** `action_card_generator`는 매우 유능하지만 비용이 높은 전문가입니다. 사용자가 명시적으로 "실행 카드", "n주 플랜", "종합 솔루션", "전략 제안" 등을 요구할 때만 호출하세요. 일반적인 분석이나 검색 요청에 남용해서는 안 됩니다.
 4.  **출력 형식 준수:** 당신의 최종 출력물은 오직 JSON 배열이어야 합니다. 서론, 결론, 부연 설명 등은 절대 포함하지 마세요.
+5.  **의존 관계 명시:** 각 단계에 고유한 `id`를 부여하고, 다른 단계의 결과가 반드시 먼저 필요할 때만 `depends_on`에 그 단계의 `id`를 적으세요. 서로 독립적인 단계(예: RAG 검색과 데이터 분석)는 `depends_on`을 빈 배열로 두면 동시에 실행됩니다.
 """
 
 # Planner가 생성해야 할 최종 JSON 출력의 스키마 예시입니다.
 PLAN_JSON_SCHEMA = """
 [
   {
+    "id": "step1",
     "tool_name": "사용할 도구의 이름",
     "tool_input": {
       "도구의 Pydantic 스키마에 맞는 인자들": "값"
     },
+    "depends_on": ["(선택) 먼저 완료되어야 하는 단계의 id"],
     "thought": "이 도구를 왜, 어떤 목적으로 사용하는지에 대한 나의 생각"
   }
 ]
 """
 
-# --- 2. 프롬프트 빌더 함수 ---
+# Router+Planner 통합 모드에서 의도와 계획을 함께 출력하기 위한 스키마입니다.
+FUSED_OUTPUT_SCHEMA = """
+{
+  "intent": "아래 [의도 카테고리] 중 하나의 키워드",
+  "plan": [
+    {
+      "id": "step1",
+      "tool_name": "사용할 도구의 이름",
+      "tool_input": {
+        "도구의 Pydantic 스키마에 맞는 인자들": "값"
+      },
+      "depends_on": ["(선택) 먼저 완료되어야 하는 단계의 id"],
+      "thought": "이 도구를 왜, 어떤 목적으로 사용하는지에 대한 나의 생각"
+    }
+  ]
+}
+"""
 
-def build_planner_prompt(state: Dict[str, Any], effective_tool_descriptions: str) -> str:
-    """
-    AgentState와 사용 가능한 도구 설명을 바탕으로 Planner LLM을 위한 최종 프롬프트를 생성합니다.
+# 통합 모드에서 LLM이 함께 판단해야 하는 의도 카테고리입니다. (intent_classifier의 카테고리와 동일)
+FUSED_INTENT_RULES = """
+**[의도 카테고리]**
+- `profile_query`: 특정 가맹점의 기본 현황이나 프로필을 조회.
+- `general_rag_search`: "요즘 트렌드", "마케팅 기법" 등 특정 가게와 무관한 일반적인 지식이나 정보를 검색 요청. (`rag_searcher`만 사용 가능)
+- `bigcon_request`: 특정 가맹점에 대한 심층 진단, 실행 카드, 솔루션, n주 플랜 등 구체적인 해결책을 요청.
+- `data_analysis`: 일반적인 조건으로 데이터를 분석 요청.
+- `marketing_idea`: 창의적인 마케팅 아이디어를 생성 요청.
+- `video_recommendation`: 주제와 관련된 학습용 동영상 추천을 요청.
+- `policy_recommendation`: 정부 지원사업, 보조금, 혜택 추천을 요청.
+- `greeting`: 간단한 인사나 대화 시작.
+- `unknown`: 위 카테고리에 해당하지 않는 질문.
+
+**[계획 수립 대상]**
+- 의도가 `data_analysis`, `marketing_idea`, `general_rag_search`인 경우에만 `plan`을 작성하세요.
+- 그 외의 의도라면 `plan`은 반드시 빈 배열(`[]`)로 두세요.
+"""
 
-    Args:
-        state: 현재 대화의 AgentState 딕셔너리.
-        effective_tool_descriptions: 이번 턴에 사용 가능한 도구들의 설명 문자열.
+# --- 2. 프롬프트 빌더 함수 ---
 
-    Returns:
-        LLM에 전달될 전체 프롬프트 문자열.
-    """
+def _build_context_section(state: Dict[str, Any]) -> str:
+    """AgentState에서 대화 요약, 최근 대화 기록, 최근 요청, 프로필 요약을 추출하여 [상황 정보] 섹션을 만듭니다."""
     # 1. 상태(State)에서 컨텍스트 정보 추출
     try:
         profile = state.get("current_profile", {})
         store_id = profile.get("profile_id")
-        recent_messages = state.get('messages', [])[-5:]
+        # 최근 N개 메시지 + 이번 요청만 그대로 넣고, 그 이전 대화는 대화 메모리의 누적 요약으로 대신합니다.
+        recent_messages = state.get('messages', [])[-(CONTEXT_RECENT_MESSAGES + 1):]
         user_query = recent_messages[-1].content if recent_messages else "질문을 찾을 수 없음"
         conversation_history = "\n".join([f"- {msg.type}: {msg.content}" for msg in recent_messages])
+        summary = (state.get("conversation_memory") or {}).get("summary")
+        if summary:
+            conversation_history = f"(이전 대화 요약)\n{summary}\n(최근 대화)\n{conversation_history}"
     except (IndexError, KeyError) as e:
         print(f"경고: State에서 정보 추출 중 오류 발생 - {e}")
         store_id = None
@@ -71,8 +103,7 @@ def build_planner_prompt(state: Dict[str, Any], effective_tool_descriptions: str
     else:
         available_info_str = "현재 조회된 가맹점 프로필 정보가 없습니다."
 
-    # 3. 프롬프트의 각 섹션을 조합
-    context_section = f"""
+    return f"""
 **[상황 정보]**
 1.  **최근 대화 기록:**
     {conversation_history}
@@ -85,6 +116,22 @@ def build_planner_prompt(state: Dict[str, Any], effective_tool_descriptions: str
     {available_info_str}
 """
 
+
+def build_planner_prompt(state: Dict[str, Any], effective_tool_descriptions: str) -> str:
+    """
+    AgentState와 사용 가능한 도구 설명을 바탕으로 Planner LLM을 위한 최종 프롬프트를 생성합니다.
+
+    Args:
+        state: 현재 대화의 AgentState 딕셔너리.
+        effective_tool_descriptions: 이번 턴에 사용 가능한 도구들의 설명 문자열.
+
+    Returns:
+        LLM에 전달될 전체 프롬프트 문자열.
+    """
+    # 1. 상황 정보 섹션 구성
+    context_section = _build_context_section(state)
+
+    # 2. 도구 및 출력 형식 섹션 구성
     tools_section = f"""
 **[이번 작업에서 사용 가능한 도구 목록]**
 {effective_tool_descriptions}
@@ -101,7 +148,7 @@ def build_planner_prompt(state: Dict[str, Any], effective_tool_descriptions: str
 ```
 """
 
-    # 4. 모든 섹션을 결합하여 최종 프롬프트 완성
+    # 3. 모든 섹션을 결합하여 최종 프롬프트 완성
     final_prompt = (
         f"{SYSTEM_MESSAGE}\n"
         f"{context_section}\n"
@@ -110,4 +157,43 @@ def build_planner_prompt(state: Dict[str, Any], effective_tool_descriptions: str
         f"{output_instruction_section}"
     )
 
-    return final_prompt
\ No newline at end of file
+    return final_prompt
+
+
+def build_fused_router_planner_prompt(state: Dict[str, Any], tool_descriptions: str) -> str:
+    """
+    의도 분류와 실행 계획 수립을 한 번의 LLM 호출로 처리하기 위한 통합 프롬프트를 생성합니다.
+
+    Args:
+        state: 현재 대화의 AgentState 딕셔너리.
+        tool_descriptions: 등록된 모든 도구들의 설명 문자열.
+
+    Returns:
+        {"intent": ..., "plan": [...]} 형식의 JSON 객체를 요구하는 프롬프트 문자열.
+    """
+    context_section = _build_context_section(state)
+
+    tools_section = f"""
+**[사용 가능한 도구 목록]**
+{tool_descriptions}
+"""
+
+    output_instruction_section = f"""
+---
+먼저 사용자의 가장 최근 요청의 의도를 [의도 카테고리] 중 하나로 분류하고, 필요한 경우 실행 계획을 함께 수립하세요.
+아래 JSON 스키마를 준수하는 JSON 객체 하나만 출력하고, 다른 어떤 설명도 추가하지 마세요.
+
+**[JSON 스키마]**
+```json
+{FUSED_OUTPUT_SCHEMA}
+```
+"""
+
+    return (
+        f"{SYSTEM_MESSAGE}\n"
+        f"{context_section}\n"
+        f"{FUSED_INTENT_RULES}\n"
+        f"{tools_section}\n"
+        f"{PLANNING_RULES}\n"
+        f"{output_instruction_section}"
+    )
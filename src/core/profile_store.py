@@ -0,0 +1,185 @@
+# src/core/profile_store.py
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Any, Dict, Iterable, List, Tuple
+
+SCHEMA = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+CREATE TABLE IF NOT EXISTS profiles (
+    store_id TEXT PRIMARY KEY,
+    payload BLOB NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def encode_profile(profile: Dict[str, Any]) -> bytes:
+    """프로필을 공백 없는 JSON으로 직렬화한 뒤 zlib으로 압축한 바이너리로 변환합니다."""
+    return zlib.compress(json.dumps(profile, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 6)
+
+
+def decode_profile(payload: bytes) -> Dict[str, Any]:
+    return json.loads(zlib.decompress(payload))
+
+
+class ProfileStore:
+    """
+    가맹점 프로필 전용 키-값 저장소입니다. (SQLite WAL, 기본 키 = ENCODED_MCT)
+    ChromaDB 메타데이터에 JSON 문자열로 넣어 두던 프로필을 기본 키 조회 한 번으로 읽습니다.
+    - WITHOUT ROWID 테이블이라 store_id 조회가 B-트리 한 번으로 끝나고, 본문은 압축 바이너리로 저장되어 파일이 작습니다.
+    - 스레드마다 연결을 따로 열어, 여러 세션의 조회가 서로 기다리지 않습니다. (WAL: 읽기는 쓰기를 막지 않음)
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialized = False
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            with self._init_lock:
+                if not self._initialized:
+                    os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                    init_conn = sqlite3.connect(self.path)
+                    init_conn.executescript(SCHEMA)
+                    init_conn.close()
+                    self._initialized = True
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # --- 1. 조회 ---
+
+    def get(self, store_id: str) -> Dict[str, Any] | None:
+        row = self.conn.execute("SELECT payload FROM profiles WHERE store_id = ?", (str(store_id),)).fetchone()
+        return decode_profile(row[0]) if row else None
+
+    def get_many(self, store_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        ids = [str(i) for i in store_ids]
+        if not ids:
+            return {}
+        placeholders = ",".join("?" * len(ids))
+        rows = self.conn.execute(f"SELECT store_id, payload FROM profiles WHERE store_id IN ({placeholders})", ids)
+        return {store_id: decode_profile(payload) for store_id, payload in rows}
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    # --- 2. 저장 ---
+
+    def put(self, store_id: str, profile: Dict[str, Any]) -> None:
+        self.put_many([(store_id, profile)])
+
+    def put_many(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        """여러 프로필을 한 트랜잭션으로 저장(덮어쓰기)하고, 저장한 개수를 반환합니다."""
+        now = time.time()
+        rows = [(str(store_id), encode_profile(profile), now) for store_id, profile in items]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO profiles (store_id, payload, updated_at) VALUES (?, ?, ?)", rows
+            )
+        return len(rows)
+
+    def delete(self, store_id: str) -> None:
+        with self.conn:
+            self.conn.execute("DELETE FROM profiles WHERE store_id = ?", (str(store_id),))
+
+
+class ProfileWriteBehind:
+    """
+    프로필 업데이트를 모아서 쓰는 write-behind 대기열입니다.
+    - 같은 가맹점에 대한 여러 업데이트는 마지막 프로필 하나로 합쳐지고(merge), 백그라운드 스레드가
+      flush_interval초마다 또는 max_batch개가 모이면 한 트랜잭션(put_many)으로 저장합니다.
+    - 아직 저장되지 않은 프로필은 get()으로 조회할 수 있어, 호출자는 항상 최신 값을 읽습니다.
+    대기 중인 프로필은 읽기 전용(freeze)으로 보관하여 저장 중에 다른 스레드가 수정하지 못하게 합니다.
+    """
+    def __init__(self, store: ProfileStore, flush_interval: float = 1.0, max_batch: int = 500):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._pending: Dict[str, Any] = {}
+        self._cond = threading.Condition()
+        self._flushing = False
+        self._thread: threading.Thread | None = None
+        self.enqueued = 0
+        self.merged = 0
+        self.batches = 0
+        self.written = 0
+        self.failures = 0
+
+    def put(self, store_id: str, frozen_profile: Any) -> None:
+        with self._cond:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._flush_loop, name="profile-write-behind", daemon=True)
+                self._thread.start()
+            if store_id in self._pending:
+                self.merged += 1
+            self._pending[store_id] = frozen_profile
+            self.enqueued += 1
+            if len(self._pending) >= self.max_batch:
+                self._cond.notify_all()
+
+    def get(self, store_id: str) -> Any:
+        with self._cond:
+            return self._pending.get(store_id)
+
+    def _flush_loop(self) -> None:
+        failures = 0
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: len(self._pending) >= self.max_batch, timeout=self.flush_interval)
+            try:
+                self.flush()
+                failures = 0
+            except Exception as e:
+                # 저장에 실패한 프로필은 대기열에 남아 있으므로, 잠시 기다렸다가(최대 30초까지 점점 길게) 다시 저장합니다.
+                failures += 1
+                delay = min(30.0, self.flush_interval * 2 ** failures)
+                print(f"⚠️ 프로필 일괄 저장 실패 ({failures}회 연속, {delay:.1f}초 후 재시도): {e}")
+                time.sleep(delay)
+
+    def flush(self) -> int:
+        """
+        대기 중인 프로필을 한 번에 저장하고, 저장한 개수를 반환합니다.
+        저장에 실패하면 예외를 그대로 올리고, 대기열의 프로필은 지우지 않아 다음 flush에서 다시 저장합니다.
+        """
+        with self._cond:
+            # 다른 스레드가 저장 중이면 끝날 때까지 기다려, 같은 가맹점의 이전 값이 나중에 저장되지 않도록 합니다.
+            self._cond.wait_for(lambda: not self._flushing)
+            if not self._pending:
+                return 0
+            batch = dict(self._pending)
+            self._flushing = True
+        saved = False
+        try:
+            self.store.put_many(batch.items())
+            saved = True
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            with self._cond:
+                # 저장하는 동안 새로 들어온 업데이트는 남겨 두고, 저장된 값만 대기열에서 지웁니다.
+                if saved:
+                    for store_id, profile in batch.items():
+                        if self._pending.get(store_id) is profile:
+                            del self._pending[store_id]
+                self._flushing = False
+                self._cond.notify_all()
+        self.batches += 1
+        self.written += len(batch)
+        return len(batch)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"pending": len(self._pending), "enqueued": self.enqueued, "merged": self.merged,
+                    "batches": self.batches, "written": self.written, "failures": self.failures}
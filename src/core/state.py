@@ -13,6 +13,9 @@ class AgentState(TypedDict):
     # 기존 대화 기록 
     messages: Annotated[list, add_messages]
     
+    # 대화 메모리 스냅샷 (summary: 오래된 대화의 누적 요약, covered: 요약에 반영된 앞쪽 메시지 수)
+    conversation_memory: NotRequired[Dict[str, Any]]
+
     # 현재 사용자 프로필
     current_profile: NotRequired[Dict[str, Any]]
 
@@ -22,6 +25,21 @@ class AgentState(TypedDict):
     # Executor가 실행한 단계와 그 결과 (수집된 근거 자료)
     past_steps: NotRequired[List[tuple]]
     
+    # Router가 이번 턴에 분류한 의도 (이후 노드는 재분류하지 않고 이 값을 사용)
+    intent: NotRequired[str]
+
+    # 의도의 출처 (cache/local/llm/fallback). 대화 로그에 남아 로컬 분류기의 학습 데이터를 고를 때 사용합니다.
+    intent_source: NotRequired[str]
+
+    # 이번 턴의 계획 출처 보고 (source: template/llm, 템플릿 이름, 지연/절약 시간(ms), 템플릿 적중률)
+    planner_report: NotRequired[Dict[str, Any]]
+
+    # Synthesizer 컨텍스트 패킹 보고 (토큰 예산, 패킹 전/후 추정 토큰 수, 절약된 토큰 수)
+    context_report: NotRequired[Dict[str, Any]]
+
+    # 이번 턴의 LLM 사용량 (호출 수, 입력/출력 토큰, LLM 지연 시간, 모델별 집계, 토큰 예산 초과 여부)
+    turn_usage: NotRequired[Dict[str, Any]]
+
     # 다음으로 실행할 노드의 이름 (조건부 엣지에서 사용)
     next_node: NotRequired[str]
 
@@ -0,0 +1,61 @@
+# src/core/streaming.py
+
+from typing import Any, Dict
+
+from langchain_core.caches import BaseCache
+from langchain_core.callbacks.manager import dispatch_custom_event
+
+# 최종 답변을 만드는 LLM 호출에 붙이는 태그. UI는 이 태그가 붙은 토큰 이벤트만 화면에 흘려보냅니다.
+FINAL_ANSWER_TAG = "final_answer"
+
+# 실행 카드가 하나 파싱될 때마다 발생시키는 커스텀 이벤트 이름
+ACTION_CARD_EVENT = "action_card"
+
+
+def _chunk_text(chunk: Any) -> str:
+    """LLM 스트림 청크에서 텍스트만 추출합니다. (content가 파트 리스트인 경우도 처리)"""
+    content = getattr(chunk, "content", chunk)
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "".join(part if isinstance(part, str) else part.get("text", "") for part in content)
+    return str(content or "")
+
+
+def _uses_response_cache(llm) -> bool:
+    return isinstance(getattr(llm, "cache", None), BaseCache)
+
+
+def stream_llm_text(llm, prompt: Any) -> str:
+    """
+    최종 답변용 LLM 호출을 스트리밍 모드로 실행하고 전체 텍스트를 반환합니다.
+    각 토큰은 그래프의 스트림 이벤트(on_chat_model_stream)로 전달되어 UI가 즉시 표시할 수 있습니다.
+    """
+    tagged = llm.with_config(tags=[FINAL_ANSWER_TAG])
+    if _uses_response_cache(llm):
+        # .stream()은 응답 캐시를 거치지 않으므로 invoke를 사용합니다.
+        # 그래프 스트림 이벤트 안에서는 invoke도 캐시 미스일 때 토큰을 그대로 흘려보냅니다.
+        return _chunk_text(tagged.invoke(prompt))
+    return "".join(_chunk_text(chunk) for chunk in tagged.stream(prompt))
+
+
+async def astream_llm_text(llm, prompt: Any) -> str:
+    """stream_llm_text의 비동기 버전입니다."""
+    if _uses_response_cache(llm):
+        return _chunk_text(await llm.with_config(tags=[FINAL_ANSWER_TAG]).ainvoke(prompt))
+    parts = []
+    async for chunk in llm.with_config(tags=[FINAL_ANSWER_TAG]).astream(prompt):
+        parts.append(_chunk_text(chunk))
+    return "".join(parts)
+
+
+def emit_event(name: str, data: Dict[str, Any]) -> None:
+    """
+    그래프 실행 중이면 커스텀 스트림 이벤트를 발생시킵니다.
+    그래프 밖(단독 호출, 테스트 등)에서는 조용히 무시합니다.
+    """
+    try:
+        dispatch_custom_event(name, data)
+    except Exception:
+        pass
+
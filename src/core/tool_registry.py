@@ -15,11 +15,13 @@ class ToolRegistry:
         description: str,
         needs_profile: bool = False,
         needs_user_query: bool = False,
-        needs_store_id: bool = False
+        needs_store_id: bool = False,
+        final_answer: bool = False
     ):
         """
         도구를 레지스트리에 등록하는 데코레이터.
         실행에 필요한 컨텍스트 메타데이터도 함께 등록합니다.
+        final_answer=True는 최종 답변(is_final_answer)을 돌려줄 수 있는 도구임을 뜻합니다. (병렬 Executor가 따로 순서대로 실행)
         """
         def decorator(tool_obj: BaseTool):
             if not isinstance(tool_obj, BaseTool):
@@ -31,11 +33,24 @@ class ToolRegistry:
                 "needs_profile": needs_profile,
                 "needs_user_query": needs_user_query,
                 "needs_store_id": needs_store_id,
+                "final_answer": final_answer,
             }
             print(f"✅ Tool '{name}' registered with metadata.")
             return tool_obj
         return decorator
 
+    @classmethod
+    def register_coroutine(cls, name: str):
+        """
+        이미 등록된 도구에 비동기 구현(coroutine)을 연결하는 데코레이터.
+        연결된 도구는 ainvoke 시 스레드 풀 대신 이 코루틴을 직접 실행합니다.
+        """
+        def decorator(coroutine):
+            tool_obj = cls.get_tool(name)
+            tool_obj.coroutine = coroutine
+            return coroutine
+        return decorator
+
     @classmethod
     def get_tool(cls, name: str) -> BaseTool:
         if name not in cls._tools:
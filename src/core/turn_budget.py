@@ -0,0 +1,141 @@
+# src/core/turn_budget.py
+
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.config import TURN_TOKEN_BUDGET
+
+
+class TurnBudget(BaseCallbackHandler):
+    """
+    대화 한 턴 동안의 LLM 호출(모델, 입력/출력 토큰, 지연 시간)을 모으고, 토큰 예산 초과 여부를 판단합니다.
+    - LangChain 채팅 모델 호출은 실행 config의 콜백으로 자동 기록됩니다.
+    - LangChain을 거치지 않는 SDK 호출(실행 카드 Agent2의 Gemini 호출 등)은 record()로 직접 기록합니다.
+    max_tokens가 0이면 예산 제한 없이 집계만 합니다.
+    """
+    def __init__(self, max_tokens: int = 0):
+        self.max_tokens = max_tokens
+        self.calls: List[Dict[str, Any]] = []
+        self._starts: Dict[UUID, tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    # --- 1. 기록 ---
+
+    def record(self, model: str, input_tokens: int, output_tokens: int, latency_ms: float) -> None:
+        with self._lock:
+            self.calls.append({"model": model, "input_tokens": int(input_tokens or 0),
+                               "output_tokens": int(output_tokens or 0), "latency_ms": round(latency_ms, 1)})
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, metadata=None, **kwargs) -> None:
+        model = (kwargs.get("invocation_params") or {}).get("model") or (metadata or {}).get("ls_model_name")
+        with self._lock:
+            self._starts[run_id] = (time.perf_counter(), str(model))
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs) -> None:
+        with self._lock:
+            started = self._starts.pop(run_id, None)
+        if started is None:
+            return
+        try:
+            usage = getattr(response.generations[0][0].message, "usage_metadata", None) or {}
+        except (AttributeError, IndexError):
+            usage = {}
+        self.record(started[1], usage.get("input_tokens", 0), usage.get("output_tokens", 0),
+                    (time.perf_counter() - started[0]) * 1000)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs) -> None:
+        with self._lock:
+            self._starts.pop(run_id, None)
+
+    # --- 2. 집계 ---
+
+    @property
+    def input_tokens(self) -> int:
+        with self._lock:
+            return sum(c["input_tokens"] for c in self.calls)
+
+    @property
+    def output_tokens(self) -> int:
+        with self._lock:
+            return sum(c["output_tokens"] for c in self.calls)
+
+    @property
+    def exceeded(self) -> bool:
+        """토큰 예산을 다 썼는지 여부 (이후 단계는 추가 LLM 호출을 줄여 답변을 마무리합니다)"""
+        return self.max_tokens > 0 and self.input_tokens + self.output_tokens >= self.max_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        """AgentState(turn_usage)와 대화 로그에 담을 수 있는 집계 결과"""
+        with self._lock:
+            calls = list(self.calls)
+        by_model: Dict[str, Dict[str, Any]] = {}
+        for c in calls:
+            m = by_model.setdefault(c["model"], {"calls": 0, "input_tokens": 0, "output_tokens": 0, "latency_ms": 0.0})
+            m["calls"] += 1
+            m["input_tokens"] += c["input_tokens"]
+            m["output_tokens"] += c["output_tokens"]
+            m["latency_ms"] = round(m["latency_ms"] + c["latency_ms"], 1)
+        input_tokens = sum(c["input_tokens"] for c in calls)
+        output_tokens = sum(c["output_tokens"] for c in calls)
+        return {
+            "llm_calls": len(calls),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "llm_latency_ms": round(sum(c["latency_ms"] for c in calls), 1),
+            "max_tokens": self.max_tokens,
+            "exceeded": self.max_tokens > 0 and input_tokens + output_tokens >= self.max_tokens,
+            "by_model": by_model,
+        }
+
+
+_current_budget: contextvars.ContextVar[TurnBudget | None] = contextvars.ContextVar("current_turn_budget", default=None)
+
+
+class TurnBudgetRegistry:
+    """
+    진행 중인 턴의 TurnBudget을 thread_id별로 보관합니다.
+    노드 실행 중에는 bind()로 현재 턴의 예산을 contextvar에 올려, 도구 안의 SDK 호출도 current()로 기록할 수 있게 합니다.
+    """
+    def __init__(self, max_tokens: int = 0):
+        self.max_tokens = max_tokens
+        self._budgets: Dict[str, TurnBudget] = {}
+        self._lock = threading.Lock()
+
+    def start(self, thread_id: str | None) -> TurnBudget:
+        budget = TurnBudget(self.max_tokens)
+        if thread_id:
+            with self._lock:
+                self._budgets[thread_id] = budget
+        return budget
+
+    def end(self, thread_id: str | None, budget: TurnBudget) -> None:
+        if not thread_id:
+            return
+        with self._lock:
+            if self._budgets.get(thread_id) is budget:
+                del self._budgets[thread_id]
+
+    def current(self) -> TurnBudget | None:
+        return _current_budget.get()
+
+    @contextmanager
+    def bind(self, thread_id: str | None) -> Iterator[TurnBudget | None]:
+        """thread_id의 진행 중인 턴 예산을 블록 안의 현재 예산으로 지정합니다. (턴 밖에서 실행되면 None)"""
+        with self._lock:
+            budget = self._budgets.get(thread_id) if thread_id else None
+        token = _current_budget.set(budget)
+        try:
+            yield budget
+        finally:
+            _current_budget.reset(token)
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+turn_budgets = TurnBudgetRegistry(max_tokens=TURN_TOKEN_BUDGET)
@@ -2,13 +2,20 @@
 import os
 import json
 import re
+import time
 import traceback
 from pathlib import Path
+from typing import Callable
 from jsonschema import Draft7Validator, ValidationError
 from dotenv import load_dotenv
 import streamlit as st
 import os
-    
+
+from src.core.context_packer import estimate_tokens
+from src.core.llm_cache import LLMReplayMissError, llm_response_cache
+from src.core.llm_factory import llm_factory
+from src.core.turn_budget import turn_budgets
+
 load_dotenv()
 
 # --- 경로 설정 ---
@@ -110,21 +117,36 @@ def _extract_text_from_gemini_response(resp):
             pass
     return (text or "").strip()
 
-def call_gemini_for_action_card(prompt_text: str, model_name='gemini-2.5-flash') -> dict:
+def _generate_text(model, prompt_text: str):
+    """Gemini를 호출하여 (응답 객체, 응답 텍스트)를 반환합니다."""
+    response = model.generate_content(prompt_text)
+    return response, _extract_text_from_gemini_response(response)
+
+
+def _record_usage(model_name: str, response, prompt_text: str, text: str, latency_ms: float) -> None:
+    """Gemini SDK 호출의 토큰 사용량을 이번 턴의 예산에 기록합니다. (응답에 사용량이 없으면 추정치 사용)"""
+    budget = turn_budgets.current()
+    if budget is None:
+        return
+    usage = getattr(response, "usage_metadata", None)
+    input_tokens = getattr(usage, "prompt_token_count", None) or estimate_tokens(prompt_text)
+    output_tokens = getattr(usage, "candidates_token_count", None) or estimate_tokens(text)
+    budget.record(model_name, input_tokens, output_tokens, latency_ms)
+
+
+def call_gemini_for_action_card(prompt_text: str, model_name='gemini-2.5-flash',
+                                on_card: Callable[[dict], None] | None = None) -> dict:
     """
     주어진 프롬프트로 Gemini API를 호출하고, 스키마에 맞는 JSON 결과를 반환합니다.
     #1의 call_gemini_agent2 함수와 동일한 로직입니다.
+    on_card를 지정하면, 응답이 스키마 검증을 통과하고 추가 정보 요청(tool_calls)이 없는 최종 카드일 때만
+    카드를 한 장씩 콜백으로 전달합니다. (검증 실패로 폴백을 반환하거나 Agent2 루프가 이어지는 응답의 카드는 화면에 보내지 않습니다)
     """
     try:
         import google.generativeai as genai
     except ImportError:
         raise ImportError("Gemini API를 사용하려면 'pip install google-generativeai'를 설치해야 합니다.")
 
-    api_key = st.secrets.get("GOOGLE_API_KEY", os.getenv("GOOGLE_API_KEY"))
-    if not api_key:
-        raise ValueError('GEMINI_API_KEY 환경 변수가 설정되지 않았습니다.')
-    genai.configure(api_key=api_key)
-
     safety_settings = [
         {"category": "HARM_CATEGORY_HARASSMENT", "threshold": "BLOCK_NONE"},
         {"category": "HARM_CATEGORY_HATE_SPEECH", "threshold": "BLOCK_NONE"},
@@ -141,13 +163,20 @@ def call_gemini_for_action_card(prompt_text: str, model_name='gemini-2.5-flash')
 
     last_error = "알 수 없는 오류"
     try:
-        model = genai.GenerativeModel(
-            model_name=model_name,
-            generation_config=generation_config,
-            safety_settings=safety_settings
-        )
-        response = model.generate_content(prompt_text)
-        text = _extract_text_from_gemini_response(response)
+        use_cache = llm_response_cache.applies_to(generation_config["temperature"])
+        cache_llm_string = f"genai:{llm_factory.backend}:{model_name}:{sorted(generation_config.items())}"
+        cached_text = llm_response_cache.lookup_text(prompt_text, cache_llm_string) if use_cache else None
+        if cached_text is not None:
+            # 녹화된 응답을 재사용합니다.
+            response, text = None, cached_text
+        else:
+            # genai.configure/GenerativeModel 생성은 llm_factory에서 한 번만 수행하고 재사용합니다.
+            model = llm_factory.get_genai_model("action_card", model_name, generation_config, safety_settings)
+            started = time.perf_counter()
+            response, text = _generate_text(model, prompt_text)
+            _record_usage(model_name, response, prompt_text, text, (time.perf_counter() - started) * 1000)
+            if use_cache and text:
+                llm_response_cache.update_text(prompt_text, cache_llm_string, text)
 
         if not text:
             finish_reason = "N/A"
@@ -168,12 +197,18 @@ def call_gemini_for_action_card(prompt_text: str, model_name='gemini-2.5-flash')
                     if schema_validator:
                         schema_validator.validate(core_json)
                     
-                    # 모든 검증 통과: 성공적으로 결과 반환
+                    # 모든 검증 통과: 최종 카드이면 화면에 전달하고 결과 반환
                     print('--- ✅ Agent2: 실행 카드 생성 및 유효성 검사 완료 ---')
+                    if on_card is not None and isinstance(core_json, dict) and not core_json.get("tool_calls"):
+                        for card in core_json.get("recommendations") or []:
+                            if isinstance(card, dict):
+                                on_card(card)
                     return core_json
                 except (json.JSONDecodeError, ValidationError) as e:
                     last_error = f"JSON 처리/유효성 검사 실패: {e}\n--- 원본 JSON 텍스트 ---\n{json_text[:500]}..."
 
+    except LLMReplayMissError:
+        raise  # replay 모드의 미스는 폴백으로 가리지 않고 그대로 알립니다.
     except Exception as e:
         last_error = f"Gemini API 호출 실패: {type(e).__name__} - {e}"
         print(traceback.format_exc())
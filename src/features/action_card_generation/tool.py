@@ -13,37 +13,70 @@ from src.core.common_tools.rag_search_tool import rag_search_tool
 from src.features.profile_management.tool import get_profile
 from src.services.data_service import data_service 
 from src.core.common_models import ToolOutput
+from src.core.streaming import ACTION_CARD_EVENT, emit_event
+from src.core.tool_registry import tool_registry
+from src.core.turn_budget import turn_budgets
 
 
 TOOL_DESCRIPTION = "수집된 모든 정보를 종합하여 구체적인 실행 방안이 담긴 '실행 카드'나 'n주 플랜'을 생성하는 '수석 컨설턴트'입니다. 가장 마지막에 호출되는 경우가 많습니다."
 
+# 실행 카드 결과(Markdown)의 제목. 스트리밍으로 보낸 카드와 최종 답변이 같은 문자열이 되도록 함께 사용합니다.
+ACTION_CARD_HEADER = "### 💡 소상공인 맞춤 실행 카드 제안\n\n"
+
 class ActionCardGeneratorInput(BaseModel):
     user_query: str = Field(..., description="사용자의 원본 질문")
     profile: dict = Field(..., description="현재 상담 중인 가맹점의 전체 프로필")
 
+def _format_card(card: dict) -> str:
+    """실행 카드 한 장을 Markdown 문자열로 변환합니다."""
+    output = f"#### **{card.get('title', '제목 없음')}**\n"
+    output += f"- **🎯 타겟:** {card.get('what', '—')}\n"
+    output += f"- **📢 채널:** {', '.join(card.get('where', [])) if isinstance(card.get('where'), list) else card.get('where', '—')}\n"
+    output += f"- **📝 방법:** {', '.join(card.get('how', [])) if isinstance(card.get('how'), list) else card.get('how', '—')}\n"
+    output += f"- **✍️ 카피 예시:** {' / '.join(card.get('copy', [])) if isinstance(card.get('copy'), list) else card.get('copy', '—')}\n"
+    
+    kpi = card.get('kpi', {})
+    kpi_text = f"측정 지표: {kpi.get('target', '—')}"
+    if kpi.get('range'):
+        kpi_text += f", 목표 구간: {kpi['range'][0]} ~ {kpi['range'][1]}"
+    output += f"- **📈 KPI:** {kpi_text}\n"
+    
+    output += f"- **🔍 근거:** {', '.join(card.get('evidence', [])) if isinstance(card.get('evidence'), list) else card.get('evidence', '—')}\n\n"
+    return output
+
 def _format_action_card_result(agent2_json: dict) -> str:
     """Agent-2의 JSON 출력을 Streamlit에서 보여주기 좋은 Markdown 문자열로 변환합니다."""
     if not agent2_json or "recommendations" not in agent2_json or not agent2_json["recommendations"]:
         return "실행 카드를 생성하는 데 실패했거나, 추가 정보가 필요하여 생성을 보류했습니다. (오류 또는 tool_calls 확인 필요)"
 
-    output = "### 💡 소상공인 맞춤 실행 카드 제안\n\n"
+    output = ACTION_CARD_HEADER
     for card in agent2_json.get("recommendations", []):
-        output += f"#### **{card.get('title', '제목 없음')}**\n"
-        output += f"- **🎯 타겟:** {card.get('what', '—')}\n"
-        output += f"- **📢 채널:** {', '.join(card.get('where', [])) if isinstance(card.get('where'), list) else card.get('where', '—')}\n"
-        output += f"- **📝 방법:** {', '.join(card.get('how', [])) if isinstance(card.get('how'), list) else card.get('how', '—')}\n"
-        output += f"- **✍️ 카피 예시:** {' / '.join(card.get('copy', [])) if isinstance(card.get('copy'), list) else card.get('copy', '—')}\n"
-        
-        kpi = card.get('kpi', {})
-        kpi_text = f"측정 지표: {kpi.get('target', '—')}"
-        if kpi.get('range'):
-            kpi_text += f", 목표 구간: {kpi['range'][0]} ~ {kpi['range'][1]}"
-        output += f"- **📈 KPI:** {kpi_text}\n"
-        
-        output += f"- **🔍 근거:** {', '.join(card.get('evidence', [])) if isinstance(card.get('evidence'), list) else card.get('evidence', '—')}\n\n"
+        output += _format_card(card)
     
     return output
 
+def _card_emitter():
+    """
+    Agent2 호출 한 번의 최종 카드를 UI로 스트리밍하는 콜백을 만듭니다.
+    첫 카드 앞에 제목을 보내, 화면에 표시된 내용이 _format_action_card_result의 최종 답변과 같게 합니다.
+    """
+    emitted = []
+
+    def emit(card: dict) -> None:
+        if not emitted:
+            emit_event(ACTION_CARD_EVENT, {"markdown": ACTION_CARD_HEADER})
+        emitted.append(card)
+        emit_event(ACTION_CARD_EVENT, {"markdown": _format_card(card)})
+
+    return emit
+
+@tool_registry.register(
+    name="action_card_generator",
+    description=TOOL_DESCRIPTION,
+    needs_profile=True,
+    needs_user_query=True,
+    final_answer=True
+)
 @tool(args_schema=ActionCardGeneratorInput)
 def generate_action_card(user_query: str, profile: dict) -> ToolOutput:
     """
@@ -67,10 +100,15 @@ def generate_action_card(user_query: str, profile: dict) -> ToolOutput:
         initial_rag_context = data_service.search_for_context(query=rag_query)
 
         for i in range(max_turns):
+            budget = turn_budgets.current()
+            if i > 0 and budget is not None and budget.exceeded:
+                # 토큰 예산을 다 썼으면 추가 정보 수집 턴을 건너뛰고, 지금까지 모은 정보로 마지막 생성만 시도합니다.
+                print(f"--- [Agent2 Loop] 턴 토큰 예산({budget.max_tokens}) 초과. 남은 Agent2 턴을 건너뜁니다. ---")
+                break
             print(f"--- [Agent2 Loop] Turn {i+1}/{max_turns} ---")
 
             prompt = build_agent2_prompt(agent1_like_json, initial_rag_context, collected_data)
-            agent2_result = call_gemini_for_action_card(prompt)
+            agent2_result = call_gemini_for_action_card(prompt, on_card=_card_emitter())
             
             tool_calls = agent2_result.get("tool_calls")
             if not tool_calls:
@@ -98,9 +136,9 @@ def generate_action_card(user_query: str, profile: dict) -> ToolOutput:
                 
                 collected_data.append((f"[Tool: {tool_name}] {query}", result))
 
-        print("--- [Agent2 Loop] 최대 턴 도달. 마지막 생성 시도. ---")
+        print("--- [Agent2 Loop] 최대 턴 도달(또는 예산 초과). 마지막 생성 시도. ---")
         final_prompt = build_agent2_prompt(agent1_like_json, initial_rag_context, collected_data)
-        final_result = call_gemini_for_action_card(final_prompt)
+        final_result = call_gemini_for_action_card(final_prompt, on_card=_card_emitter())
         formatted_content = _format_action_card_result(final_result)
         return ToolOutput(content=formatted_content, is_final_answer=True, sources=None).model_dump()
     except Exception as e:
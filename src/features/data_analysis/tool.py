@@ -2,21 +2,16 @@
 
 import os, pandas as pd, traceback
 from langchain_experimental.agents import create_pandas_dataframe_agent
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.runnables import RunnableLambda
-from src.config import PRIMARY_MODEL_NAME
-from dotenv import load_dotenv
-import streamlit as st
+from src.core.common_models import ToolOutput
+from src.core.llm_factory import llm_factory
+from src.services.data_service import data_service
 from src.utils.errors import create_tool_error
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 from .prompts import create_pandas_agent_prompt
 from src.core.tool_registry import tool_registry
 
-load_dotenv()
-google_api_key = st.secrets.get("GOOGLE_API_KEY", os.getenv("GOOGLE_API_KEY"))
-
-
 TOOL_DESCRIPTION = "프로필에 없는 상세 수치 데이터(예: 시간대별, 메뉴별, 고객 세그먼트별)를 원본 CSV 파일에서 직접 심층 분석하는 '데이터 과학자'입니다."
 
 class DataAnalysisInput(BaseModel):
@@ -40,7 +35,7 @@ def data_analysis_tool(query: str, store_id: str | None = None) -> dict:
             return ToolOutput(content="오류: 분석할 데이터프레임이 없습니다.").model_dump()
 
         agent_prefix = create_pandas_agent_prompt(df_map, store_id)
-        llm = ChatGoogleGenerativeAI(model=PRIMARY_MODEL_NAME, google_api_key=google_api_key, temperature=0)
+        llm = llm_factory.get("data_analysis")
         
         pandas_agent = create_pandas_dataframe_agent(
             llm, dataframes, prefix=agent_prefix,
@@ -4,6 +4,7 @@ from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 from typing import Dict, Any
 
+from src.core.tool_registry import tool_registry
 from src.services.profile_service import profile_manager
 from src.utils.errors import create_tool_error
 from src.core.common_models import ToolOutput
@@ -26,7 +27,8 @@ class UpdateProfileInput(BaseModel):
 
 @tool_registry.register(
     name="get_profile",
-    description=GET_PROFILE_TOOL_DESCRIPTION
+    description=GET_PROFILE_TOOL_DESCRIPTION,
+    final_answer=True
 )
 @tool(args_schema=GetProfileInput)
 def get_profile(store_id: str) -> dict:
@@ -45,7 +47,8 @@ def get_profile(store_id: str) -> dict:
 
 @tool_registry.register(
     name="update_profile",
-    description=UPDATE_PROFILE_TOOL_DESCRIPTION
+    description=UPDATE_PROFILE_TOOL_DESCRIPTION,
+    final_answer=True
 )
 @tool(args_schema=UpdateProfileInput)
 def update_profile(store_id: str, section: str, key: str, data_to_update: dict) -> dict:
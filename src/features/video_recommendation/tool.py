@@ -3,22 +3,41 @@
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
-import streamlit as st
-import os
-from dotenv import load_dotenv
 
+from src.core.llm_factory import llm_factory
+from src.core.tool_registry import tool_registry
 from src.services.data_service import data_service
 from src.utils.errors import create_tool_error
-from src.config import PRIMARY_MODEL_NAME
 from .prompts import create_video_recommendation_prompt
 from src.core.common_models import ToolOutput
-
-load_dotenv()
-google_api_key = st.secrets.get("GOOGLE_API_KEY", os.getenv("GOOGLE_API_KEY"))
+from src.core.streaming import astream_llm_text, stream_llm_text
 
 TOOL_DESCRIPTION = "사용자의 질문과 프로필에 맞춰 관련된 학습 영상을 검색하고, 각 영상의 내용을 요약하여 맞춤 추천하는 '미디어 큐레이터'입니다. 텍스트 설명 외에 시청각 자료가 필요할 때 사용하세요."
 
+def _build_search_query(user_query: str, profile: Dict[str, Any]) -> str:
+    """가맹점 업종을 질문과 결합하여 영상 검색어를 만듭니다."""
+    industry = profile.get("core_data", {}).get("basic_info", {}).get("industry_main", "소상공인")
+    return f"{industry} {user_query}"
+
+
+# --- 동기/비동기 구현이 공유하는 부분 (검색 인자, 결과 포맷, 오류 처리) ---
+
+def _search_args(user_query: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+    return {"query": _build_search_query(user_query, profile), "collection_types": ("video",)}
+
+
+def _not_found_output(user_query: str) -> dict:
+    return ToolOutput(content=f"'{user_query}'에 대한 맞춤 추천 영상을 찾지 못했습니다.").model_dump()
+
+
+def _recommendation_output(recommendation: str, sources: list) -> dict:
+    return ToolOutput(content=recommendation, is_final_answer=True, sources=sources).model_dump()
+
+
+def _error_output(e: Exception, user_query: str) -> dict:
+    return ToolOutput(content=create_tool_error("video_recommender", e, query=user_query)).model_dump()
+
+
 class VideoRecommenderInput(BaseModel):
     user_query: str = Field(..., description="사용자의 원본 질문 또는 영상 추천을 위한 주제")
     profile: Dict[str, Any] = Field(..., description="추천의 개인화를 위한 현재 가맹점 프로필")
@@ -27,7 +46,8 @@ class VideoRecommenderInput(BaseModel):
     name="video_recommender",
     description=TOOL_DESCRIPTION,
     needs_profile=True,
-    needs_user_query=True
+    needs_user_query=True,
+    final_answer=True
 )
 @tool(args_schema=VideoRecommenderInput)
 def video_recommender_tool(user_query: str, profile: Dict[str, Any]) -> dict:
@@ -37,25 +57,26 @@ def video_recommender_tool(user_query: str, profile: Dict[str, Any]) -> dict:
     """
     print(f"--- ✨ Feature: video_recommender_tool (Agent-mode) 호출됨 ---")
     try:
-        industry = profile.get("core_data", {}).get("basic_info", {}).get("industry_main", "소상공인")
-        search_query = f"{industry} {user_query}"
-        
-        sources = data_service.search_for_sources(
-            query=search_query, 
-            collection_types=("video",)
-        )
-
+        sources = data_service.search_for_sources(**_search_args(user_query, profile))
         if not sources:
-            return ToolOutput(content=f"'{user_query}'에 대한 맞춤 추천 영상을 찾지 못했습니다.").model_dump()
-        
-        llm = ChatGoogleGenerativeAI(model=PRIMARY_MODEL_NAME, google_api_key=google_api_key, temperature=0.3)
-        
+            return _not_found_output(user_query)
+
         recommendation_prompt = create_video_recommendation_prompt(profile, sources, user_query)
-        
-        final_recommendation = llm.invoke(recommendation_prompt).content
-        
-        return ToolOutput(content=final_recommendation, is_final_answer=True, sources=sources).model_dump()
+        return _recommendation_output(stream_llm_text(llm_factory.get("video"), recommendation_prompt), sources)
+    except Exception as e:
+        return _error_output(e, user_query)
 
+
+@tool_registry.register_coroutine("video_recommender")
+async def avideo_recommender_tool(user_query: str, profile: Dict[str, Any]) -> dict:
+    """video_recommender_tool의 비동기 구현입니다. (RAG 검색과 LLM 호출을 비동기로 대기)"""
+    print(f"--- ✨ Feature: video_recommender_tool (async) 호출됨 ---")
+    try:
+        sources = await data_service.asearch_for_sources(**_search_args(user_query, profile))
+        if not sources:
+            return _not_found_output(user_query)
+
+        recommendation_prompt = create_video_recommendation_prompt(profile, sources, user_query)
+        return _recommendation_output(await astream_llm_text(llm_factory.get("video"), recommendation_prompt), sources)
     except Exception as e:
-        error_content = create_tool_error("video_recommender", e, query=user_query)
-        return ToolOutput(content=error_content).model_dump()
\ No newline at end of file
+        return _error_output(e, user_query)
@@ -2,16 +2,74 @@
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
 import uuid
-from src.core.graph_builder import graph
+from src.config import STREAMING_ENABLED
+from src.core.graph_builder import iter_answer_events, load_session, stream_graph
+from src.core.llm_factory import llm_factory
 from src.features.profile_management.resolver import resolve_store_id_from_name
 from src.services import profile_manager
 
 st.set_page_config(page_title="소상공인 AI 비밀상담사 🤖", layout="wide")
 st.title("🏪 소상공인 AI 비밀상담사")
 
+
+@st.cache_resource
+def _warm_up_llm_clients() -> bool:
+    """앱 프로세스에서 한 번만 역할별 LLM 클라이언트를 백그라운드에서 미리 준비합니다. (스크립트에서 그래프를 import할 때는 실행되지 않음)"""
+    llm_factory.warm_up_in_background()
+    return True
+
+
+_warm_up_llm_clients()
+
+def _update_status(status, chunk: dict) -> None:
+    """그래프 노드의 출력을 확인하고 진행 상황 패널(UI)을 업데이트합니다."""
+    if "router" in chunk:
+        status.update(label="의도를 파악하고 최적의 전문가를 찾는 중...")
+        if chunk["router"].get("plan"):
+            plan_steps = "\n".join(f"⏳ {step}" for step in chunk["router"]["plan"])
+            status.update(label=f"작업 계획 수립 완료!\n{plan_steps}")
+
+    if "planner" in chunk and chunk["planner"].get("plan"):
+        plan_steps = "\n".join(f"⏳ {step}" for step in chunk["planner"]["plan"])
+        status.update(label=f"작업 계획 수립 완료!\n{plan_steps}")
+        report = chunk["planner"].get("planner_report") or {}
+        if report.get("source") == "template":
+            status.caption(f"⚡ 계획 템플릿 `{report['template']}` 사용 (약 {report['saved_ms'] / 1000:.1f}초 절약, 적중률 {report['hit_rate']:.0%})")
+
+    if "executor" in chunk and chunk["executor"].get("past_steps"):
+        past_steps_str = "\n".join(f"✅ {step[0]}" for step in chunk["executor"]["past_steps"])
+        remaining_plan_str = "\n".join(f"⏳ {step}" for step in chunk["executor"].get("plan", []))
+        status.update(label=f"작업 수행 중...\n{past_steps_str}\n{remaining_plan_str}")
+
+    if "synthesizer" in chunk:
+        status.update(label="수집된 정보를 종합하여 최종 답변을 생성 중...")
+
+
+def _show_turn_usage(status, final_state: dict | None) -> None:
+    """이번 턴의 LLM 호출 수, 토큰 사용량, LLM 지연 시간을 진행 상황 패널에 표시합니다."""
+    if not final_state:
+        return
+    usage = next(iter(final_state.values()), {}).get("turn_usage") or {}
+    if not usage.get("llm_calls"):
+        return
+    status.caption(f"🪙 LLM {usage['llm_calls']}회 | 토큰 입력 {usage['input_tokens']:,} / 출력 {usage['output_tokens']:,} "
+                   f"| LLM 응답 시간 {usage['llm_latency_ms'] / 1000:.1f}초")
+    if usage.get("exceeded"):
+        status.caption(f"⚠️ 이번 턴의 토큰 예산({usage['max_tokens']:,})을 넘어 일부 단계를 생략하고 답변했습니다.")
+
+
 # --- 세션 상태 초기화 ---
 if "thread_id" not in st.session_state:
-    st.session_state.thread_id = str(uuid.uuid4())
+    # URL의 ?thread_id=... 로 저장된 대화를 이어갈 수 있습니다.
+    resume_id = st.query_params.get("thread_id")
+    saved = load_session(resume_id) if resume_id else None
+    if saved and saved.get("current_profile"):
+        st.session_state.thread_id = resume_id
+        st.session_state.current_profile = saved["current_profile"]
+        st.session_state.messages = list(saved.get("messages", []))
+    else:
+        st.session_state.thread_id = str(uuid.uuid4())
+    st.query_params["thread_id"] = st.session_state.thread_id
 if "current_profile" not in st.session_state:
     st.session_state.current_profile = None
 if "messages" not in st.session_state:
@@ -57,38 +115,42 @@ else:
             st.markdown(prompt)
 
         with st.chat_message("ai"):
-            with st.status("AI가 요청을 분석하고 있습니다...", expanded=True) as status:
-                inputs = {
-                    "messages": [HumanMessage(content=prompt)],
-                    "current_profile": st.session_state.current_profile
-                }
-                config = {"configurable": {"thread_id": st.session_state.thread_id}}
-                
-                # 최종 상태를 저장할 변수
-                final_state = None 
-                
-                for chunk in graph.stream(inputs, config=config):
-                    # 각 노드의 출력을 확인하고 UI 업데이트
-                    if "router" in chunk:
-                        status.update(label="의도를 파악하고 최적의 전문가를 찾는 중...")
-                    
-                    if "planner" in chunk and chunk["planner"].get("plan"):
-                        plan_steps = "\n".join(f"⏳ {step}" for step in chunk["planner"]["plan"])
-                        status.update(label=f"작업 계획 수립 완료!\n{plan_steps}")
-
-                    if "executor" in chunk and chunk["executor"].get("past_steps"):
-                        past_steps_str = "\n".join(f"✅ {step[0]}" for step in chunk["executor"]["past_steps"])
-                        remaining_plan_str = "\n".join(f"⏳ {step}" for step in chunk["executor"]["plan"])
-                        status.update(label=f"작업 수행 중...\n{past_steps_str}\n{remaining_plan_str}")
-
-                    if "synthesizer" in chunk:
-                        status.update(label="수집된 정보를 종합하여 최종 답변을 생성 중...")
-                        final_response = chunk["synthesizer"]["messages"][-1].content
-
+            status = st.status("AI가 요청을 분석하고 있습니다...", expanded=True)
+            inputs = {
+                "messages": [HumanMessage(content=prompt)],
+                "current_profile": st.session_state.current_profile
+            }
+            config = {"configurable": {"thread_id": st.session_state.thread_id}}
+
+            # 최종 상태를 저장할 변수
+            final_state = None
+            streamed_answer = ""
+            # 스트리밍으로 표시한 답변이 최종 답변과 다르면 이 자리를 최종 답변으로 바꿔 그립니다.
+            answer_box = st.empty()
+
+            if STREAMING_ENABLED:
+                # 노드 완료 이벤트로 진행 상황을 갱신하면서, 최종 답변 토큰/실행 카드는 도착하는 즉시 화면에 흘려보냅니다.
+                node_chunks = []
+
+                def _answer_stream():
+                    for kind, payload in iter_answer_events(inputs, config):
+                        if kind == "node":
+                            _update_status(status, payload)
+                            node_chunks.append(payload)
+                        else:
+                            yield payload
+
+                with answer_box.container():
+                    streamed_answer = st.write_stream(_answer_stream())
+                final_state = node_chunks[-1] if node_chunks else None
+            else:
+                for chunk in stream_graph(inputs, config):
+                    _update_status(status, chunk)
                     final_state = chunk
-                
-                status.update(label="답변이 완료되었습니다!", state="complete")
-            
+
+            status.update(label="답변이 완료되었습니다!", state="complete", expanded=False)
+            _show_turn_usage(status, final_state)
+
             # --- 최종 답변 추출 로직 ---
             final_response = ""
             final_sources = []
@@ -106,7 +168,11 @@ else:
                 final_sources = final_graph_state.get("sources", [])
 
             # --- 최종 답변 및 출처 UI 렌더링 ---
-            st.markdown(final_response or "죄송합니다, 답변을 생성하는 데 문제가 발생했습니다.")
+            # 스트리밍으로 이미 화면에 표시된 답변이 최종 답변과 같으면 다시 그리지 않습니다.
+            # (폴백/오류 답변처럼 스트리밍된 내용과 다르면, 화면과 대화 기록이 같도록 최종 답변으로 바꿉니다)
+            streamed_text = streamed_answer if isinstance(streamed_answer, str) else ""
+            if not streamed_text or streamed_text.strip() != (final_response or "").strip():
+                answer_box.markdown(final_response or "죄송합니다, 답변을 생성하는 데 문제가 발생했습니다.")
 
             if final_sources:
                 st.session_state["last_sources"] = final_sources 
@@ -1,5 +1,6 @@
 # src/services/data_service.py
 
+import asyncio
 import pandas as pd
 from functools import lru_cache
 from typing import Dict, Any, Tuple, List
@@ -8,6 +9,7 @@ import os
 # 서비스는 다른 서비스나 도구, 유틸리티를 '사용'하는 역할을 합니다.
 from .profile_service import profile_manager
 from src.services.rag_service import search_unified_rag_for_context, search_unified_rag_for_sources
+from src.utils.tracing import tracer
 
 class DataService:
     """
@@ -54,7 +56,8 @@ class DataService:
         LLM이 거대한 JSON 대신 소화하기 쉬운 정보만 받게 되어 판단 정확도가 올라갑니다.
         """
         print(f"--- [DataService] Planner용 프로필 요약 생성: {store_id} ---")
-        profile = self.get_profile(store_id)
+        # 요약은 읽기만 하므로, 캐시에 있는 파싱된 프로필을 복사 없이 그대로 사용합니다.
+        profile = self.profile_manager.get_profile_view(store_id)
         if not profile:
             return {"오류": "프로필을 찾을 수 없습니다."}
 
@@ -79,22 +82,49 @@ class DataService:
         
         return {k: v for k, v in summary.items() if v is not None and v != []}
 
-    @lru_cache(maxsize=256)
     def search_for_context(self, query: str, collection_types: tuple[str, ...] | None = None) -> str:
         """
         Synthesizer와 같이 단순 문자열 컨텍스트가 필요한 경우 사용합니다.
         """
-        print(f"--- [DataService] RAG 컨텍스트 검색 실행: {query} ---")
-        return search_unified_rag_for_context(query, list(collection_types) if collection_types else None)
+        with tracer.span("data_service.search_for_context", collections=",".join(collection_types or ())) as span:
+            hits_before = self._cached_search_for_context.cache_info().hits
+            result = self._cached_search_for_context(query, collection_types)
+            span.set(cache_hit=self._cached_search_for_context.cache_info().hits > hits_before, result_chars=len(result))
+            return result
 
-    @lru_cache(maxsize=128)
     def search_for_sources(self, query: str, collection_types: tuple[str, ...] | None = None) -> List[Dict[str, Any]]:
         """
         video_recommender와 같이 구조화된 전체 정보가 필요한 경우 사용합니다.
         """
+        with tracer.span("data_service.search_for_sources", collections=",".join(collection_types or ())) as span:
+            hits_before = self._cached_search_for_sources.cache_info().hits
+            result = self._cached_search_for_sources(query, collection_types)
+            span.set(cache_hit=self._cached_search_for_sources.cache_info().hits > hits_before, result_count=len(result))
+            return result
+
+    # 같은 질문의 반복 검색은 LRU 캐시로 재사용합니다. (캐시 적중 여부는 cache_info의 hits 증가로 판단)
+    @lru_cache(maxsize=256)
+    def _cached_search_for_context(self, query: str, collection_types: tuple[str, ...] | None = None) -> str:
+        print(f"--- [DataService] RAG 컨텍스트 검색 실행: {query} ---")
+        return search_unified_rag_for_context(query, list(collection_types) if collection_types else None)
+
+    @lru_cache(maxsize=128)
+    def _cached_search_for_sources(self, query: str, collection_types: tuple[str, ...] | None = None) -> List[Dict[str, Any]]:
         print(f"--- [DataService] RAG 소스 검색 실행: {query} ---")
         return search_unified_rag_for_sources(query, list(collection_types) if collection_types else None)
 
+    # --- 비동기 API ---
+    # ChromaDB 로컬 클라이언트는 동기 API만 제공하므로, 캐시된 동기 검색을 워커 스레드에서 실행하여
+    # 이벤트 루프가 블로킹되지 않도록 합니다.
+
+    async def asearch_for_context(self, query: str, collection_types: tuple[str, ...] | None = None) -> str:
+        """search_for_context의 비동기 버전입니다."""
+        return await asyncio.to_thread(self.search_for_context, query, collection_types)
+
+    async def asearch_for_sources(self, query: str, collection_types: tuple[str, ...] | None = None) -> List[Dict[str, Any]]:
+        """search_for_sources의 비동기 버전입니다."""
+        return await asyncio.to_thread(self.search_for_sources, query, collection_types)
+
 
 # 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스 생성
 data_service = DataService()
\ No newline at end of file
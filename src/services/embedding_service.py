@@ -0,0 +1,193 @@
+# src/services/embedding_service.py
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from array import array
+from typing import Any, Callable, Dict, List, Sequence
+
+from src.config import (
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_MAXSIZE,
+    EMBEDDING_CACHE_TTL_SECONDS,
+    EMBEDDING_CACHE_PATH,
+    EMBEDDING_CACHE_MAX_ENTRIES,
+)
+from src.utils.cache import TTLCache
+from src.utils.tracing import tracer
+
+SCHEMA = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+CREATE TABLE IF NOT EXISTS embeddings (
+    key TEXT PRIMARY KEY,
+    vector BLOB NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+"""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 정규화: 유니코드 NFKC + 앞뒤 공백 제거 + 연속 공백을 하나로 합칩니다. (대소문자는 모델에 맡깁니다)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def make_key(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{model_name}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class DiskEmbeddingCache:
+    """
+    임베딩 벡터를 float32 바이너리로 SQLite 파일에 저장합니다. 프로세스를 다시 시작해도 같은 질문은 모델을 호출하지 않습니다.
+    항목 수가 max_entries를 넘으면 가장 오래 전에 저장된 벡터부터 지웁니다.
+    """
+    def __init__(self, path: str, max_entries: int = 100_000, evict_every: int = 500):
+        self.path = path
+        self.max_entries = max_entries
+        self.evict_every = evict_every
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._updates_since_evict = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        # 캐시를 쓰지 않는 실행에서는 파일을 만들지 않도록 처음 사용할 때 연결합니다.
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        if not keys:
+            return {}
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(keys))})", list(keys)
+            ).fetchall()
+        return {key: array("f", blob).tolist() for key, blob in rows}
+
+    def put_many(self, items: Dict[str, Sequence[float]]) -> None:
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, created_at) VALUES (?, ?, ?)",
+                [(key, array("f", vector).tobytes(), now) for key, vector in items.items()],
+            )
+            self.conn.commit()
+            self._updates_since_evict += len(items)
+            if self._updates_since_evict >= self.evict_every:
+                self._evict()
+
+    def _evict(self) -> None:
+        self._updates_since_evict = 0
+        count = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count > self.max_entries:
+            self.conn.execute(
+                "DELETE FROM embeddings WHERE key IN (SELECT key FROM embeddings ORDER BY created_at LIMIT ?)",
+                (count - self.max_entries,),
+            )
+            self.conn.commit()
+
+
+class EmbeddingService:
+    """
+    RAG 컬렉션들이 공유하는 질의 임베딩 서비스입니다.
+    - 한 번 계산한 벡터를 모든 컬렉션 검색에 재사용합니다. (컬렉션마다 query_texts를 다시 임베딩하지 않습니다)
+    - 정규화한 텍스트를 키로 인메모리 LRU → 디스크 캐시 순으로 찾고, 둘 다 없을 때만 모델을 호출합니다.
+    embedding_function은 컬렉션을 만들 때 사용한 것과 같은 모델이어야 합니다. (기본값: ChromaDB 기본 임베딩 함수)
+    모델 호출이 실패하면(예: 오프라인에서 모델 다운로드 실패) retry_seconds 동안은 모델을 다시 부르지 않고 바로 실패합니다.
+    """
+    def __init__(self, embedding_function: Callable[[List[str]], Any] | None = None, model_name: str | None = None,
+                 cache: TTLCache | None = None, disk_cache: DiskEmbeddingCache | None = None, retry_seconds: float = 60.0):
+        self._embedding_function = embedding_function
+        self._model_name = model_name
+        self._cache = cache
+        self._disk_cache = disk_cache
+        self.retry_seconds = retry_seconds
+        self._failed_until = 0.0
+        self._init_lock = threading.Lock()
+        self.model_calls = 0
+        self.disk_hits = 0
+
+    @property
+    def embedding_function(self):
+        # 모델 로딩은 첫 임베딩 때 한 번만 합니다.
+        if self._embedding_function is None:
+            with self._init_lock:
+                if self._embedding_function is None:
+                    from chromadb.utils.embedding_functions import DefaultEmbeddingFunction
+                    self._embedding_function = DefaultEmbeddingFunction()
+        return self._embedding_function
+
+    @property
+    def model_name(self) -> str:
+        if self._model_name is None:
+            ef = self.embedding_function
+            self._model_name = ef.name() if hasattr(ef, "name") else type(ef).__name__
+        return self._model_name
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """여러 텍스트를 임베딩합니다. 캐시에 없는 텍스트만 한 번의 모델 호출로 계산합니다."""
+        keys = [make_key(self.model_name, text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        if self._cache is not None:
+            for key in keys:
+                cached = self._cache.get(key)
+                if cached is not None:
+                    vectors[key] = cached
+
+        missing = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if missing and self._disk_cache is not None:
+            found = self._disk_cache.get_many(missing)
+            self.disk_hits += len(found)
+            vectors.update(found)
+            if self._cache is not None:
+                for key, vector in found.items():
+                    self._cache.set(key, vector)
+
+        to_compute = {key: text for key, text in zip(keys, texts) if key not in vectors}
+        if to_compute:
+            if time.monotonic() < self._failed_until:
+                raise RuntimeError("임베딩 모델 호출이 최근 실패하여 재시도를 기다리는 중입니다.")
+            try:
+                computed = self.embedding_function([normalize_text(text) for text in to_compute.values()])
+            except Exception:
+                self._failed_until = time.monotonic() + self.retry_seconds
+                raise
+            self.model_calls += 1
+            new_vectors = {key: [float(x) for x in vector] for key, vector in zip(to_compute, computed)}
+            vectors.update(new_vectors)
+            if self._cache is not None:
+                for key, vector in new_vectors.items():
+                    self._cache.set(key, vector)
+            if self._disk_cache is not None:
+                self._disk_cache.put_many(new_vectors)
+
+        tracer.current_span().incr("embedding_cache_hits", len(texts) - len(to_compute))
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed([text])[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "model_calls": self.model_calls,
+            "disk_hits": self.disk_hits,
+            "memory": self._cache.stats() if self._cache is not None else None,
+        }
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+embedding_service = EmbeddingService(
+    cache=TTLCache(maxsize=EMBEDDING_CACHE_MAXSIZE, ttl_seconds=EMBEDDING_CACHE_TTL_SECONDS) if EMBEDDING_CACHE_ENABLED else None,
+    disk_cache=DiskEmbeddingCache(EMBEDDING_CACHE_PATH, max_entries=EMBEDDING_CACHE_MAX_ENTRIES) if EMBEDDING_CACHE_ENABLED else None,
+)
@@ -1,20 +1,42 @@
 # services/profile_service.py
 
-import threading
+import atexit
 import json
+from typing import Any, Dict
 from .rag_service import get_chroma_client 
+from src.core.profile_store import ProfileStore, ProfileWriteBehind
+from src.config import (
+    PROFILE_CACHE_ENABLED, PROFILE_CACHE_MAXSIZE, PROFILE_CACHE_TTL_SECONDS, PROFILE_STORE_PATH,
+    PROFILE_WRITE_BEHIND_ENABLED, PROFILE_WRITE_BEHIND_FLUSH_SECONDS, PROFILE_WRITE_BEHIND_MAX_BATCH,
+)
+from src.utils.cache import TTLCache, freeze, thaw
 from src.utils.errors import create_tool_error
+from src.utils.locks import KeyedRWLock
 
 class ProfileManager:
     """
     프로필 데이터에 대한 모든 CRUD(Create, Read, Update, Delete) 작업을 중앙에서 관리하고,
     스레드 안전성(Thread-Safety)을 보장하는 클래스.
+    - 프로필 본문은 전용 키-값 저장소(ProfileStore)에서 store_id 한 번으로 읽고, ChromaDB에는 검색용 문서만 둡니다.
+      저장소에 없는 프로필은 예전 방식(ChromaDB 메타데이터의 profile_json)으로 읽습니다.
+    - store_id별 읽기-쓰기 락을 사용하여, 조회는 동시에 진행되고 같은 가맹점에 대한 쓰기만 직렬화됩니다.
+    - 파싱된 프로필은 읽기 전용(FrozenDict)으로 LRU/TTL 캐시에 보관하고, update_profile이 새 값으로 갱신(write-through)합니다.
+    - 업데이트는 메타데이터(프로필 본문)만 바꾸며 검색용 문서를 다시 임베딩하지 않습니다.
+      write_behind를 지정하면 저장소 쓰기를 모아서 한 번에 처리합니다.
     """
-    def __init__(self):
+    def __init__(self, collection=None, cache: TTLCache | None = None, store: ProfileStore | None = None,
+                 write_behind: ProfileWriteBehind | None = None):
         """
-        초기화 시 스레드 잠금(Lock)과 ChromaDB 컬렉션을 설정합니다.
+        초기화 시 store_id별 읽기-쓰기 락, 프로필 캐시, 프로필 저장소와 ChromaDB 컬렉션을 설정합니다.
+        collection을 지정하면 ChromaDB에 연결하지 않고 그 컬렉션을 사용합니다. (벤치마크 등)
         """
-        self._lock = threading.Lock()
+        self._locks = KeyedRWLock()
+        self._cache = cache
+        self.store = store
+        self._write_behind = write_behind
+        if collection is not None:
+            self.client, self.collection = None, collection
+            return
         self.client = get_chroma_client()
         
         if self.client:
@@ -27,59 +49,121 @@ class ProfileManager:
         else:
             self.collection = None
 
+    def _load(self, store_id: str) -> dict | None:
+        """아직 저장되지 않은 업데이트, 프로필 저장소, ChromaDB 메타데이터 순으로 찾아 파싱합니다."""
+        if self._write_behind is not None:
+            pending = self._write_behind.get(store_id)
+            if pending is not None:
+                return thaw(pending)
+        if self.store is not None:
+            profile = self.store.get(store_id)
+            if profile is not None:
+                return profile
+        if self.collection:
+            result = self.collection.get(ids=[store_id], include=["metadatas"])
+            if result and result['ids'] and (result['metadatas'][0] or {}).get('profile_json'):
+                return json.loads(result['metadatas'][0]['profile_json'])
+        return None
+
     def get_profile(self, store_id: str) -> dict | None:
-        """ID로 단일 프로필을 안전하게 조회합니다."""
-        if not self.collection:
-            print("⚠️ ProfileManager: 컬렉션이 없어 프로필 조회를 건너뜁니다.")
+        """ID로 단일 프로필을 안전하게 조회합니다. 호출자가 수정해도 되는 복사본을 반환합니다."""
+        view = self.get_profile_view(store_id)
+        return thaw(view) if view is not None else None
+
+    def get_profile_view(self, store_id: str) -> Dict[str, Any] | None:
+        """
+        ID로 단일 프로필의 읽기 전용 뷰(FrozenDict)를 반환합니다. 캐시에 있으면 복사 없이 그대로 공유합니다.
+        프로필을 읽기만 하는 곳(Planner 요약 등)에서 사용하세요.
+        """
+        if self.store is None and not self.collection:
+            print("⚠️ ProfileManager: 프로필 저장소와 컬렉션이 없어 프로필 조회를 건너뜁니다.")
             return None
-            
-        print(f"--- 락(Lock) 획득 시도 (작업: get_profile, ID: {store_id}) ---")
-        with self._lock: 
-            print(f"--- 락(Lock) 획득 성공. 프로필 조회 시작 ---")
+
+        store_id = str(store_id)
+        if self._cache is not None:
+            cached = self._cache.get(store_id)
+            if cached is not None:
+                return cached
+
+        # 다른 조회와는 동시에, 같은 ID의 업데이트와는 배타적으로 실행됩니다.
+        with self._locks.read(store_id):
             try:
-                result = self.collection.get(ids=[str(store_id)], include=["metadatas"])
-                if result and result['ids']:
-                    profile_str = result['metadatas'][0]['profile_json']
-                    return json.loads(profile_str)
-                else:
+                profile = self._load(store_id)
+                if profile is None:
                     return None
+                profile = freeze(profile)
+                if self._cache is not None:
+                    self._cache.set(store_id, profile)
+                return profile
             except Exception as e:
                 print(f"⚠️ 프로필 조회 중 DB 오류 발생 (ID: {store_id}): {e}")
                 return None
-            finally:
-                print(f"--- 락(Lock) 해제 (작업: get_profile, ID: {store_id}) ---")
 
     def update_profile(self, store_id: str, section: str, key: str, data_to_update: dict) -> bool:
-        """특정 프로필의 일부를 안전하게 업데이트합니다."""
-        if not self.collection:
-            print("⚠️ ProfileManager: 컬렉션이 없어 프로필 업데이트를 건너뜁니다.")
+        """특정 프로필의 일부를 안전하게 업데이트합니다. (같은 ID의 조회/업데이트만 기다리게 합니다)"""
+        if self.store is None and not self.collection:
+            print("⚠️ ProfileManager: 프로필 저장소와 컬렉션이 없어 프로필 업데이트를 건너뜁니다.")
             return False
 
-        print(f"--- 락(Lock) 획득 시도 (작업: update_profile, ID: {store_id}) ---")
-        with self._lock: 
-            print(f"--- 락(Lock) 획득 성공. 프로필 업데이트 시작 ---")
+        store_id = str(store_id)
+        with self._locks.write(store_id):
             try:
-                original_data = self.collection.get(ids=[str(store_id)], include=["metadatas", "documents"])
-                if not original_data['ids']:
+                profile = self._load(store_id)
+                if profile is None:
                     print(f"⚠️ 업데이트할 프로필을 찾을 수 없음 (ID: {store_id})")
                     return False
-                
-                profile = json.loads(original_data['metadatas'][0]['profile_json'])
-                existing_doc = original_data['documents'][0]
-                
+
                 profile.setdefault(section, {}).setdefault(key, {}).update(data_to_update)
-                
-                self.collection.upsert(
-                    ids=[str(store_id)],
-                    documents=[existing_doc],
-                    metadatas=[{"profile_json": json.dumps(profile, ensure_ascii=False)}]
-                )
+
+                frozen = freeze(profile)
+                if self._write_behind is not None:
+                    # 저장은 백그라운드에서 모아서 처리하고, 대기 중인 값은 _load가 먼저 읽습니다.
+                    self._write_behind.put(store_id, frozen)
+                elif self.store is not None:
+                    # 프로필 본문만 저장소에 씁니다. (ChromaDB의 검색용 문서/임베딩은 건드리지 않습니다)
+                    self.store.put(store_id, profile)
+                else:
+                    # 문서를 다시 넘기면(upsert) 임베딩을 다시 계산하므로, 메타데이터만 바꿉니다.
+                    self.collection.update(
+                        ids=[store_id],
+                        metadatas=[{"profile_json": json.dumps(profile, ensure_ascii=False)}]
+                    )
+                # 쓰기 락을 쥔 채로 캐시를 새 값으로 바꾸므로, 이후의 조회는 항상 갱신된 프로필을 봅니다.
+                if self._cache is not None:
+                    self._cache.set(store_id, frozen)
                 return True
             except Exception as e:
                 print(f"⚠️ 프로필 업데이트 중 DB 오류 발생 (ID: {store_id}): {e}")
+                if self._cache is not None:
+                    self._cache.pop(store_id)
                 return False
-            finally:
-                print(f"--- 락(Lock) 해제 (작업: update_profile, ID: {store_id}) ---")
+
+    def flush(self) -> int:
+        """write-behind 대기열에 남은 업데이트를 바로 저장합니다. (종료 시 자동 호출)"""
+        if self._write_behind is None:
+            return 0
+        try:
+            return self._write_behind.flush()
+        except Exception as e:
+            print(f"⚠️ 대기 중인 프로필 업데이트 저장 실패: {e}")
+            return 0
+
+    def cache_stats(self) -> Dict[str, Any] | None:
+        return self._cache.stats() if self._cache is not None else None
+
+    def write_behind_stats(self) -> Dict[str, Any] | None:
+        return self._write_behind.stats() if self._write_behind is not None else None
+
+_profile_store = ProfileStore(PROFILE_STORE_PATH)
 
 # 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
-profile_manager = ProfileManager()
\ No newline at end of file
+profile_manager = ProfileManager(
+    cache=TTLCache(maxsize=PROFILE_CACHE_MAXSIZE, ttl_seconds=PROFILE_CACHE_TTL_SECONDS) if PROFILE_CACHE_ENABLED else None,
+    store=_profile_store,
+    write_behind=ProfileWriteBehind(
+        _profile_store,
+        flush_interval=PROFILE_WRITE_BEHIND_FLUSH_SECONDS,
+        max_batch=PROFILE_WRITE_BEHIND_MAX_BATCH,
+    ) if PROFILE_WRITE_BEHIND_ENABLED else None,
+)
+atexit.register(profile_manager.flush)
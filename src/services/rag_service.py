@@ -1,11 +1,44 @@
 # src/services/rag_service.py
 
 import chromadb
+import contextvars
+import heapq
+import math
 import os
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from pathlib import Path
 from typing import Dict, Any, List
 
+import numpy as np
+
+from src.config import (
+    RAG_MAX_WORKERS,
+    RAG_QUERY_TIMEOUT_SECONDS,
+    RAG_TOP_K,
+    RAG_CANDIDATE_FACTOR,
+    RAG_MMR_ENABLED,
+    RAG_MMR_LAMBDA,
+    HYBRID_SEARCH_ENABLED,
+    LEXICAL_INDEX_DIR,
+    HYBRID_CANDIDATE_MULTIPLIER,
+    RRF_K,
+    NEAR_DUP_ENABLED,
+    NEAR_DUP_THRESHOLD,
+)
+from src.core.lexical_index import LexicalIndex, reciprocal_rank_fusion
+from src.core.near_duplicate import (
+    CLUSTER_KEY,
+    INTERNAL_METADATA_KEYS,
+    SIGNATURE_KEY,
+    decode_signature,
+    minhash_signature,
+)
+from src.services.embedding_service import embedding_service
+from src.utils.tracing import tracer
+
 # 1. 설정 변수
 
 
@@ -35,6 +68,22 @@ COLLECTIONS = {
 # 클라이언트 객체를 캐싱하기 위한 전역 변수
 _client = None
 
+# 컬렉션 핸들 캐시 (검색마다 get_collection을 다시 호출하지 않습니다)
+_collections: Dict[str, Any] = {}
+_collections_client = None
+_collections_lock = threading.Lock()
+
+# 컬렉션별 BM25 역색인 캐시: 컬렉션 이름 -> (meta.json 수정 시각, 색인 또는 None)
+_lexical_indexes: Dict[str, tuple] = {}
+
+# 컬렉션별 검색을 동시에 실행하는 스레드 풀
+_query_pool = ThreadPoolExecutor(max_workers=RAG_MAX_WORKERS, thread_name_prefix="rag-query")
+
+# 시간 초과로 결과를 버렸지만 아직 풀 스레드에서 실행 중인 검색: 컬렉션 이름 -> Future
+# 실행 중인 검색은 멈출 수 없으므로, 끝날 때까지 같은 컬렉션에 새 검색을 보내지 않아 풀 스레드가 쌓이지 않게 합니다.
+_abandoned_queries: Dict[str, Future] = {}
+_abandoned_lock = threading.Lock()
+
 
 #  ChromaDB 클라이언트 생성 함수
 
@@ -68,42 +117,385 @@ def get_chroma_client():
     
     return _client
 
-def _perform_search(client, query: str, collection_types: list[str], n_results: int) -> list[dict]:
-    """ 실제 ChromaDB 검색을 수행하고 원본 결과 리스트를 반환합니다."""
-    all_results = []
-    seen_docs = set()
+def _get_collection(client, collection_name: str):
+    """컬렉션 핸들을 한 번만 가져와 캐시합니다. (클라이언트가 바뀌면 캐시를 비웁니다)"""
+    global _collections_client
+    with _collections_lock:
+        if _collections_client is not client:
+            _collections.clear()
+            _collections_client = client
+        collection = _collections.get(collection_name)
+    if collection is None:
+        collection = client.get_collection(name=collection_name)
+        with _collections_lock:
+            if _collections_client is client:
+                _collections[collection_name] = collection
+    return collection
+
+
+def _invalidate_collection(collection_name: str) -> None:
+    """컬렉션이 삭제/재생성된 경우를 대비해, 오류가 난 컬렉션의 핸들은 다음 검색에서 다시 가져옵니다."""
+    with _collections_lock:
+        _collections.pop(collection_name, None)
+
+
+def lexical_index_path(collection_name: str) -> str:
+    index_dir = LEXICAL_INDEX_DIR if os.path.isabs(LEXICAL_INDEX_DIR) else str(PROJECT_ROOT / LEXICAL_INDEX_DIR)
+    return os.path.join(index_dir, collection_name)
+
+
+def _get_lexical_index(collection_name: str) -> LexicalIndex | None:
+    """
+    컬렉션의 역색인을 메모리 매핑으로 엽니다. 색인이 없으면 None(벡터 검색만 사용)을 반환합니다.
+    적재 스크립트가 색인을 다시 만들면(meta.json 수정 시각 변경) 다음 검색에서 새 색인을 엽니다.
+    """
+    path = lexical_index_path(collection_name)
+    try:
+        mtime = os.path.getmtime(os.path.join(path, "meta.json"))
+    except OSError:
+        mtime = None
+    with _collections_lock:
+        cached = _lexical_indexes.get(collection_name)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    try:
+        index = LexicalIndex.open(path) if mtime is not None else None
+    except Exception as e:
+        print(f"⚠️ '{collection_name}' 역색인을 열 수 없어 벡터 검색만 사용합니다: {e}")
+        index = None
+    with _collections_lock:
+        _lexical_indexes[collection_name] = (mtime, index)
+    return index
+
+
+def _distance_space(collection) -> str:
+    """컬렉션의 거리 함수(l2 / cosine / ip)를 반환합니다. 설정을 알 수 없으면 ChromaDB 기본값인 l2로 봅니다."""
+    try:
+        space = ((getattr(collection, "configuration", None) or {}).get("hnsw") or {}).get("space")
+        return space or (getattr(collection, "metadata", None) or {}).get("hnsw:space") or "l2"
+    except Exception:
+        return "l2"
 
-    if collection_types is None:
-        collection_types = ["strategy", "guide", "trend", "case", "local"] 
 
-    for ctype in collection_types:
-        collection_name = COLLECTIONS.get(ctype)
-        if not collection_name: continue
+def _similarity(distance: float, space: str) -> float:
+    """
+    컬렉션의 거리 함수에 맞춰 거리를 0~1 유사도로 바꿉니다. (정규화된 임베딩 기준, 1이 가장 가까움)
+    모든 컬렉션이 같은 임베딩 모델을 쓰므로, 이렇게 바꾼 유사도는 컬렉션끼리 비교할 수 있습니다.
+    - l2(제곱 거리 0~4): 1 - d/4, cosine(0~2)/ip(1 - 내적): 1 - d/2
+    """
+    scale = 4.0 if space == "l2" else 2.0
+    return min(1.0, max(0.0, 1.0 - float(distance) / scale))
+
+
+def _query_similarity(query_embedding: List[float] | None, embedding: Any, space: str) -> float:
+    """질의 임베딩과 문서 임베딩의 거리를 컬렉션의 거리 함수로 계산해 _similarity와 같은 0~1 유사도로 바꿉니다."""
+    if query_embedding is None or embedding is None:
+        return 0.0
+    q = np.asarray(query_embedding, dtype=np.float32)
+    e = np.asarray(embedding, dtype=np.float32)
+    if space == "l2":
+        distance = float(np.sum((q - e) ** 2))
+    elif space == "cosine":
+        distance = 1.0 - float(q @ e) / (float(np.linalg.norm(q) * np.linalg.norm(e)) + 1e-9)
+    else:
+        distance = 1.0 - float(q @ e)
+    return _similarity(distance, space)
+
+
+def _fuse_with_lexical(collection, candidates: List[dict], lexical_ids: List[str], n_results: int,
+                       with_embeddings: bool = False, query_embedding: List[float] | None = None) -> List[dict]:
+    """
+    벡터 검색 후보와 BM25 결과를 RRF로 합쳐 상위 n_results개를 고릅니다. BM25에만 나온 문서는 컬렉션에서 가져와
+    질의 임베딩과의 유사도를 직접 계산합니다.
+    RRF 점수는 컬렉션 안에서만 의미가 있으므로 RRF는 어떤 문서를 남길지만 정하고, 반환 목록은 각 문서 자신의 벡터 유사도(score)
+    내림차순으로 정렬합니다. (컬렉션 간 병합 조건. 유사도가 같으면 RRF 순서를 유지)
+    """
+    rows = {c['id']: c for c in candidates}
+    fused = reciprocal_rank_fusion([list(rows), lexical_ids], k=RRF_K)[:n_results]
+    missing = [doc_id for doc_id, _ in fused if doc_id not in rows]
+    if missing:
+        extra = collection.get(ids=missing, include=["documents", "metadatas", "embeddings"])
+        embeddings = extra.get('embeddings')
+        space = _distance_space(collection)
+        for i, (doc_id, doc, meta) in enumerate(zip(extra['ids'], extra['documents'], extra['metadatas'])):
+            embedding = embeddings[i] if embeddings is not None else None
+            rows[doc_id] = {'id': doc_id, 'doc': doc, 'meta': meta,
+                            'score': _query_similarity(query_embedding, embedding, space),
+                            'embedding': embedding if with_embeddings else None}
+    # 색인 이후 컬렉션에서 삭제된 문서는 건너뜁니다.
+    results = [dict(rows[doc_id]) for doc_id, _ in fused if doc_id in rows]
+    return sorted(results, key=lambda c: -c['score'])
+
+
+def _embed_query(query: str) -> List[float] | None:
+    """질의 임베딩을 한 번 계산합니다. 실패하면 None을 반환하여 컬렉션별 임베딩(query_texts)으로 되돌아갑니다."""
+    try:
+        return embedding_service.embed_query(query)
+    except Exception as e:
+        print(f"⚠️ 질의 임베딩 실패, 컬렉션별 임베딩으로 검색합니다: {e}")
+        return None
+
+
+def _query_collection(client, collection_name: str, query: str, n_results: int,
+                      query_embedding: List[float] | None = None, with_embeddings: bool = False) -> List[dict] | None:
+    """
+    컬렉션 하나를 검색하여 관련도순 후보 목록({'id', 'doc', 'meta', 'score', 'embedding'})을 반환합니다.
+    score는 0~1 유사도입니다. 오류가 나면 None을 반환합니다. (스레드 풀에서 실행)
+    """
+    with tracer.span("chroma.query", collection=collection_name, n_results=n_results) as span:
         try:
-            collection = client.get_collection(name=collection_name)
-            results = collection.query(query_texts=[query], n_results=n_results, include=["documents", "metadatas"])
-            if results and results['documents']:
-                for doc, meta in zip(results['documents'][0], results['metadatas'][0]):
-                    if doc not in seen_docs:
-                        all_results.append({'doc': doc, 'meta': meta, 'collection': ctype})
-                        seen_docs.add(doc)
+            collection = _get_collection(client, collection_name)
+            if query_embedding is not None:
+                query_args = {"query_embeddings": [query_embedding]}
+            else:
+                query_args = {"query_texts": [query]}
+            index = _get_lexical_index(collection_name) if HYBRID_SEARCH_ENABLED else None
+            n_candidates = n_results * HYBRID_CANDIDATE_MULTIPLIER if index is not None else n_results
+            include = ["documents", "metadatas", "distances"] + (["embeddings"] if with_embeddings else [])
+            results = collection.query(**query_args, n_results=n_candidates, include=include)
+
+            candidates = []
+            if results and results.get('ids'):
+                space = _distance_space(collection)
+                embeddings = results.get('embeddings')
+                embeddings = embeddings[0] if with_embeddings and embeddings is not None else None
+                for i, (doc_id, doc, meta, distance) in enumerate(zip(
+                        results['ids'][0], results['documents'][0], results['metadatas'][0], results['distances'][0])):
+                    candidates.append({'id': doc_id, 'doc': doc, 'meta': meta, 'score': _similarity(distance, space),
+                                       'embedding': embeddings[i] if embeddings is not None else None})
+            if index is not None:
+                lexical_ids = [doc_id for doc_id, _ in index.search(query, n_candidates)]
+                span.set(lexical_hits=len(lexical_ids))
+                candidates = _fuse_with_lexical(collection, candidates, lexical_ids, n_results, with_embeddings,
+                                                query_embedding)
+            span.set(result_count=len(candidates))
+            return candidates
         except Exception as e:
+            span.set(error=f"{type(e).__name__}: {e}")
             print(f"⚠️ RAG 검색 중 '{collection_name}' 컬렉션에서 오류: {e}")
+            _invalidate_collection(collection_name)
+            return None
+
+
+def _mmr_select(candidates: List[dict], k: int, lambda_mult: float = RAG_MMR_LAMBDA) -> List[dict]:
+    """
+    MMR(Maximal Marginal Relevance)로 k개를 고릅니다: λ·관련도 - (1-λ)·이미 고른 문서와의 최대 코사인 유사도.
+    후보 간 유사도 행렬을 한 번에 계산하고, 고를 때마다 '고른 문서와의 최대 유사도' 벡터만 갱신합니다. (O(k·n))
+    임베딩이 없는 후보는 다른 문서와 유사도 0으로 봅니다.
+    """
+    if len(candidates) <= k:
+        return candidates
+    dim = next((len(c['embedding']) for c in candidates if c.get('embedding') is not None), 0)
+    if not dim:
+        return candidates[:k]
+    vectors = np.array([c['embedding'] if c.get('embedding') is not None else np.zeros(dim) for c in candidates],
+                       dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-9
+    similarity = vectors @ vectors.T
+    relevance = np.array([c['score'] for c in candidates], dtype=np.float32)
+
+    selected: List[int] = []
+    max_similarity = np.zeros(len(candidates), dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+    for _ in range(k):
+        mmr = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        mmr[~available] = -np.inf
+        chosen = int(np.argmax(mmr))
+        selected.append(chosen)
+        available[chosen] = False
+        max_similarity = np.maximum(max_similarity, similarity[:, chosen])
+    return [candidates[i] for i in selected]
+
+
+def _is_near_duplicate(result: dict, kept_signatures: List[np.ndarray], kept_clusters: set) -> bool:
+    """
+    이미 고른 결과와 거의 같은 결과인지 판정하고, 아니면 그 서명/클러스터를 기록합니다.
+    적재 시 메타데이터에 저장한 MinHash 서명(없으면 본문으로 계산)과 클러스터 ID를 사용하므로 임베딩을 비교하지 않습니다.
+    """
+    meta = result.get('meta') or {}
+    cluster = meta.get(CLUSTER_KEY)
+    if cluster and cluster in kept_clusters:
+        return True
+    signature = decode_signature(meta.get(SIGNATURE_KEY) or "")
+    if signature is None:
+        signature = minhash_signature(result.get('doc') or "")
+    if kept_signatures and np.mean(np.stack(kept_signatures) == signature, axis=1).max() >= NEAR_DUP_THRESHOLD:
+        return True
+    kept_signatures.append(signature)
+    if cluster:
+        kept_clusters.add(cluster)
+    return False
+
+
+def _is_stalled(collection_name: str) -> bool:
+    """이전에 시간 초과된 검색이 아직 실행 중인 컬렉션인지 확인합니다. (끝났으면 기록을 지웁니다)"""
+    with _abandoned_lock:
+        future = _abandoned_queries.get(collection_name)
+        if future is None:
+            return False
+        if future.done():
+            del _abandoned_queries[collection_name]
+            return False
+        return True
+
+
+def _abandon(collection_name: str, future: Future) -> None:
+    """시간 초과된 검색을 기록합니다. 아직 시작 전이면 취소되어 바로 풀에서 빠집니다."""
+    if not future.cancel():
+        with _abandoned_lock:
+            _abandoned_queries[collection_name] = future
+
+
+def _per_collection_fetch(top_k: int) -> int:
+    """
+    전체에서 top_k개를 고르기 위해 컬렉션마다 처음 가져올 후보 수입니다. (ceil(top_k * RAG_CANDIDATE_FACTOR), 최대 top_k)
+    상위 문서가 한 컬렉션에 몰려 이 수로 부족할 수 있는 컬렉션은 _perform_search가 top_k개까지 다시 가져옵니다.
+    """
+    return max(1, min(top_k, math.ceil(top_k * RAG_CANDIDATE_FACTOR)))
+
+
+def _gather_ranked_lists(client, targets: list[tuple[str, str]], query: str, n_results: int,
+                         query_embedding: List[float] | None, with_embeddings: bool, deadline: float) -> dict:
+    """
+    컬렉션들을 스레드 풀에서 동시에 검색하여 {(ctype, 컬렉션 이름): 점수순 후보 목록}을 반환합니다.
+    deadline(time.monotonic 기준)까지 끝나지 않은 컬렉션과 결과가 없는 컬렉션은 빠집니다.
+    """
+    # 트레이싱 스팬의 부모(현재 노드)가 풀 스레드에도 전달되도록 컨텍스트를 복사해서 실행합니다.
+    futures = [(ctype, collection_name,
+                _query_pool.submit(contextvars.copy_context().run, _query_collection,
+                                   client, collection_name, query, n_results, query_embedding, with_embeddings))
+               for ctype, collection_name in targets]
+
+    ranked_lists = {}
+    for ctype, collection_name, future in futures:
+        try:
+            candidates = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            # 실행 중인 검색은 멈출 수 없으므로 결과만 버리고, 끝날 때까지 이 컬렉션을 건너뛰도록 기록합니다.
+            _abandon(collection_name, future)
+            print(f"⚠️ RAG 검색 중 '{collection_name}' 컬렉션이 {RAG_QUERY_TIMEOUT_SECONDS}초 안에 응답하지 않아 건너뜁니다.")
+            continue
+        if candidates:
+            ranked_lists[(ctype, collection_name)] = [{**c, 'collection': ctype} for c in candidates]
+    return ranked_lists
+
+
+def _merge_ranked_lists(ranked_lists: list[list[dict]], limit: int | None) -> tuple[list[dict], int]:
+    """
+    점수순 목록들을 힙으로 병합(heapq.merge)하여 (상위 limit개, 거의 같은 문서로 제외한 수)를 반환합니다.
+    같은(거의 같은) 문서는 먼저(점수가 높게) 나온 것만 남깁니다.
+    """
+    merged = []
+    seen_docs = set()
+    kept_signatures, kept_clusters = [], set()
+    collapsed = 0
+    for result in heapq.merge(*ranked_lists, key=lambda c: -c['score']):
+        if result['doc'] in seen_docs:
+            continue
+        if NEAR_DUP_ENABLED and _is_near_duplicate(result, kept_signatures, kept_clusters):
+            collapsed += 1
+            continue
+        seen_docs.add(result['doc'])
+        merged.append(result)
+        if limit is not None and len(merged) >= limit:
+            break
+    return merged, collapsed
+
+
+def _collections_to_refill(ranked_lists: dict, merged: list[dict], n_results: int, top_k: int) -> list[tuple[str, str]]:
+    """
+    n_results개를 꽉 채워 돌려줬고 그 마지막 후보까지 전역 top_k 안에 드는 컬렉션을 고릅니다.
+    이런 컬렉션에만 아직 가져오지 않은 상위 문서가 남아 있을 수 있습니다. (top_k개가 안 모였으면 꽉 찬 컬렉션 전부)
+    """
+    threshold = merged[-1]['score'] if len(merged) >= top_k else float("-inf")
+    return [target for target, candidates in ranked_lists.items()
+            if len(candidates) >= n_results and candidates[-1]['score'] >= threshold]
+
+
+def _perform_search(client, query: str, collection_types: list[str], n_results: int,
+                    top_k: int | None = None, mmr: bool = False) -> list[dict]:
+    """
+    실제 ChromaDB 검색을 수행하고, 모든 컬렉션의 결과를 관련도(score) 순으로 합친 리스트를 반환합니다.
+    - 컬렉션들을 스레드 풀에서 동시에 검색하며, RAG_QUERY_TIMEOUT_SECONDS 안에 끝나지 않은 컬렉션은 건너뜁니다.
+      시간 초과된 검색이 아직 실행 중인 컬렉션은 그 검색이 끝날 때까지 검색하지 않습니다. (풀 스레드가 쌓여 모든 검색이 밀리지 않도록)
+    - 질의 임베딩은 검색 전에 한 번만 계산하여(캐시 사용) 모든 컬렉션에 같은 벡터를 넘깁니다.
+    - 컬렉션별로 n_results개씩 가져와, 이미 정렬된 목록들을 힙으로 병합(heapq.merge)합니다.
+      같은 문서가 여러 컬렉션에서 나오면 점수가 높은 쪽만 남깁니다.
+      NEAR_DUP_ENABLED이면 거의 같은 문서(MinHash 추정 유사도 NEAR_DUP_THRESHOLD 이상, 같은 클러스터)도 점수가 높은 쪽만 남깁니다.
+    - top_k를 지정하면 상위 top_k개만 반환하고, mmr=True이면 후보 전체에서 MMR로 top_k개를 고릅니다.
+      MMR이 아니고 n_results < top_k이면, 마지막 후보까지 전역 top_k에 든 컬렉션만 top_k개로 다시 검색해 전역 top_k를 채웁니다.
+      (두 번째 검색도 첫 검색과 같은 RAG_QUERY_TIMEOUT_SECONDS 안에서 끝나야 합니다)
+    """
+    if collection_types is None:
+        collection_types = ["strategy", "guide", "trend", "case", "local"] 
+
+    targets = [(ctype, COLLECTIONS[ctype]) for ctype in collection_types if COLLECTIONS.get(ctype)]
+    if not targets:
+        return []
+    mmr = mmr and top_k is not None
+
+    with tracer.span("rag.search", collections=len(targets), n_results=n_results, top_k=top_k or 0, mmr=mmr) as span:
+        start = time.perf_counter()
+        with tracer.span("rag.embed_query"):
+            query_embedding = _embed_query(query)
+        embed_ms = (time.perf_counter() - start) * 1000
+
+        stalled = [collection_name for _, collection_name in targets if _is_stalled(collection_name)]
+        if stalled:
+            span.set(stalled=len(stalled))
+            print(f"⚠️ RAG 검색: 이전 검색이 아직 끝나지 않은 컬렉션 {stalled}은 건너뜁니다.")
+        targets = [(ctype, collection_name) for ctype, collection_name in targets if collection_name not in stalled]
+
+        deadline = time.monotonic() + RAG_QUERY_TIMEOUT_SECONDS
+        ranked_lists = _gather_ranked_lists(client, targets, query, n_results, query_embedding, mmr, deadline)
+        limit = None if mmr else top_k
+        all_results, collapsed = _merge_ranked_lists(list(ranked_lists.values()), limit)
+
+        refill = _collections_to_refill(ranked_lists, all_results, n_results, top_k) \
+            if top_k is not None and not mmr and n_results < top_k else []
+        fetched = sum(len(candidates) for candidates in ranked_lists.values())
+        if refill:
+            # 상위 문서가 몰려 있을 수 있는 컬렉션만 top_k개로 다시 가져와 정확한 전역 top_k를 만듭니다.
+            refilled = _gather_ranked_lists(client, refill, query, top_k, query_embedding, mmr, deadline)
+            ranked_lists.update(refilled)
+            fetched += sum(len(candidates) for candidates in refilled.values())
+            all_results, collapsed = _merge_ranked_lists(list(ranked_lists.values()), limit)
+        if mmr:
+            all_results = _mmr_select(all_results, top_k)
+        for result in all_results:
+            result.pop('embedding', None)
+            # 중복 탐지용 메타데이터는 프롬프트/출처 목록에 넣지 않습니다.
+            if result.get('meta'):
+                result['meta'] = {k: v for k, v in result['meta'].items() if k not in INTERNAL_METADATA_KEYS}
+
+        search_ms = (time.perf_counter() - start) * 1000 - embed_ms
+        span.set(embed_ms=round(embed_ms, 2), search_ms=round(search_ms, 2), result_count=len(all_results),
+                 near_duplicates=collapsed, refilled=len(refill), fetched=fetched)
+        print(f"🔎 RAG 검색: 임베딩 {embed_ms:.1f}ms + 검색 {search_ms:.1f}ms (컬렉션 {len(targets)}개, "
+              f"재검색 {len(refill)}개, 후보 {fetched}건, 결과 {len(all_results)}건)")
     return all_results
 
-def search_unified_rag_for_context(query: str, collection_types: list[str] = None, n_results: int = 3) -> str:
+
+def _search_top_k(query: str, collection_types: list[str] | None, top_k: int) -> list[dict] | None:
+    client = get_chroma_client()
+    if not client:
+        return None
+    # MMR은 후보 묶음 전체에서 다양성을 보며 고르므로 재검색 없이 컬렉션마다 top_k개씩 가져옵니다.
+    n_results = top_k if RAG_MMR_ENABLED else _per_collection_fetch(top_k)
+    return _perform_search(client, query, collection_types, n_results, top_k=top_k, mmr=RAG_MMR_ENABLED)
+
+def search_unified_rag_for_context(query: str, collection_types: list[str] = None, top_k: int = RAG_TOP_K) -> str:
     """
     LLM 프롬프트에 넣기 좋은 '문자열 컨텍스트'만 생성하여 반환합니다.
+    모든 컬렉션에서 관련도가 가장 높은 top_k개를 사용합니다.
     """
-    client = get_chroma_client()
-    if not client: return "RAG 시스템에 연결할 수 없습니다."
-    
-    all_results = _perform_search(client, query, collection_types, n_results)
+    all_results = _search_top_k(query, collection_types, top_k)
+    if all_results is None: return "RAG 시스템에 연결할 수 없습니다."
     if not all_results: return "관련 정보를 찾을 수 없습니다."
 
     context_str = ""
-    for i, res in enumerate(all_results[:5]):
-        meta = res.get('meta', {})
+    for i, res in enumerate(all_results):
+        meta = res.get('meta') or {}
         doc = res.get('doc', '')
         ctype = res.get('collection', 'unknown')
         title = meta.get('title', meta.get('document_title', 'N/A'))
@@ -111,19 +503,17 @@ def search_unified_rag_for_context(query: str, collection_types: list[str] = Non
         context_str += f"{source_info}\n내용 요약: {doc[:200]}...\n\n"
     return context_str
 
-def search_unified_rag_for_sources(query: str, collection_types: list[str] = None, n_results: int = 3) -> List[Dict[str, Any]]:
+def search_unified_rag_for_sources(query: str, collection_types: list[str] = None, top_k: int = RAG_TOP_K) -> List[Dict[str, Any]]:
     """
     메타데이터와 본문(content)을 모두 포함한 '구조화된 소스 리스트'를 반환합니다.
+    모든 컬렉션에서 관련도가 가장 높은 top_k개를 관련도순으로 반환합니다.
     """
-    client = get_chroma_client()
-    if not client: return []
-    
-    all_results = _perform_search(client, query, collection_types, n_results)
+    all_results = _search_top_k(query, collection_types, top_k)
     if not all_results: return []
 
     sources_list = []
-    for res in all_results[:5]:
-        source_item = res.get('meta', {}).copy()
+    for res in all_results:
+        source_item = (res.get('meta') or {}).copy()
         source_item['content'] = res.get('doc', '')
         sources_list.append(source_item)
-    return sources_list
\ No newline at end of file
+    return sources_list
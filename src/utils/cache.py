@@ -0,0 +1,109 @@
+# src/utils/cache.py
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+class TTLCache:
+    """
+    크기 제한(LRU)과 만료 시간(TTL)을 함께 적용하는 스레드 안전한 인메모리 캐시입니다.
+    적중/미스 횟수를 기록하여 stats()로 노출합니다.
+    """
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 3600.0):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """키에 해당하는 값을 반환합니다. 없거나 만료되었으면 default를 반환합니다."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is not None:
+                expires_at, value = item
+                if expires_at > time.monotonic():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """값을 저장하고, 최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """키를 캐시에서 제거하고 저장되어 있던 값을 반환합니다."""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[1] if item is not None else default
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 크기와 적중/미스 횟수, 적중률을 반환합니다."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            }
+
+
+class FrozenDict(dict):
+    """
+    수정할 수 없는 dict입니다. 캐시에 보관한 값을 여러 호출자가 공유할 때, 한 호출자가 값을 바꿔 캐시를 오염시키지 않도록 합니다.
+    dict의 하위 클래스이므로 읽기 코드와 json.dumps는 그대로 동작합니다.
+    """
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("FrozenDict는 수정할 수 없습니다. thaw()로 복사한 뒤 수정하세요.")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __ior__(self, other):
+        self._readonly()
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+def freeze(value: Any) -> Any:
+    """JSON 형태의 값(dict/list/스칼라)을 공유해도 안전한 읽기 전용 값(FrozenDict/tuple)으로 변환합니다."""
+    if isinstance(value, dict):
+        return FrozenDict({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """freeze()한 값을 호출자가 자유롭게 수정할 수 있는 일반 dict/list 복사본으로 되돌립니다. (deepcopy보다 빠름)"""
+    if isinstance(value, dict):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
@@ -0,0 +1,82 @@
+# src/utils/locks.py
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterator
+
+
+class RWLock:
+    """
+    읽기는 여러 스레드가 동시에, 쓰기는 한 스레드만 수행하도록 하는 읽기-쓰기 락입니다.
+    쓰기를 기다리는 스레드가 있으면 새 읽기를 막아, 읽기가 많아도 쓰기가 굶지 않도록 합니다. (writer-preferring)
+    """
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = False
+        self._waiting_writers = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        with self._cond:
+            while self._writer or self._waiting_writers:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        with self._cond:
+            self._waiting_writers += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._waiting_writers -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class KeyedRWLock:
+    """
+    키(예: store_id)마다 별도의 RWLock을 사용합니다. 서로 다른 키의 읽기/쓰기는 서로 기다리지 않습니다.
+    사용 중인 키의 락만 보관하고, 마지막 사용자가 빠지면 제거하여 키가 늘어나도 메모리가 쌓이지 않습니다.
+    """
+    def __init__(self):
+        self._locks: Dict[Hashable, list] = {}  # key -> [RWLock, 사용 중인 스레드 수]
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def _acquire(self, key: Hashable) -> Iterator[RWLock]:
+        with self._guard:
+            entry = self._locks.setdefault(key, [RWLock(), 0])
+            entry[1] += 1
+        try:
+            yield entry[0]
+        finally:
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._locks[key]
+
+    @contextmanager
+    def read(self, key: Hashable) -> Iterator[None]:
+        with self._acquire(key) as lock, lock.read():
+            yield
+
+    @contextmanager
+    def write(self, key: Hashable) -> Iterator[None]:
+        with self._acquire(key) as lock, lock.write():
+            yield
+
+    def __len__(self) -> int:
+        return len(self._locks)
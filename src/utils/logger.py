@@ -1,34 +1,198 @@
 # src/utils/logger.py
 
+import atexit
 import csv
+import glob
+import importlib.util
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+from typing import Any, Dict, List
 
-LOG_DIR = "logs"
+from src.config import (
+    CONVERSATION_LOG_DIR,
+    CONVERSATION_LOG_QUEUE_SIZE,
+    CONVERSATION_LOG_BATCH_SIZE,
+    CONVERSATION_LOG_FLUSH_SECONDS,
+    CONVERSATION_LOG_MAX_MB,
+    CONVERSATION_LOG_PARQUET,
+)
+
+LOG_DIR = CONVERSATION_LOG_DIR
+# 현재 기록 중인 파일. 날짜가 바뀌거나 크기 한도를 넘으면 conversation_log_YYYYMMDD_N.csv(또는 .parquet)로 회전합니다.
 LOG_FILE = os.path.join(LOG_DIR, "conversation_log.csv")
 
-def log_to_csv(user_input, ai_output, agent_used):
+# 'Intent' 컬럼은 로컬 의도 분류기(local_intent_classifier)의 학습 레이블로도 사용됩니다.
+# 'IntentSource'(cache/local/llm/fallback)가 llm인 행만 학습하여, 로컬 분류기가 자기 예측을 다시 학습하지 않도록 합니다.
+LOG_COLUMNS = ["Timestamp", "ThreadId", "UserInput", "AI_Output", "AgentUsed", "Intent", "IntentSource", "ToolsUsed",
+               "LatencyMs", "InputTokens", "OutputTokens", "LlmCalls", "LlmLatencyMs"]
+
+
+def rotated_log_files(log_file: str = LOG_FILE) -> List[str]:
+    """회전되어 보관 중인 대화 로그 세그먼트(.csv / .parquet) 목록을 오래된 순서로 반환합니다."""
+    stem, _ = os.path.splitext(log_file)
+    return sorted(glob.glob(f"{stem}_*.csv") + glob.glob(f"{stem}_*.parquet"))
+
+
+class ConversationLogWriter:
     """
-    사용자의 질문, AI의 답변, 사용된 Agent를 CSV 파일에 기록합니다.
+    대화 로그를 백그라운드 스레드에서 모아 쓰는 비동기 로거입니다.
+    - 호출 측은 크기가 제한된 큐에 행을 넣기만 하고 바로 돌아갑니다. (큐가 가득 차면 버리고 dropped를 셉니다)
+    - 백그라운드 스레드가 batch_size개가 모이거나 flush_interval초가 지나면 파일을 한 번 열어 한꺼번에 씁니다.
+    - 날짜가 바뀌거나 파일이 max_bytes를 넘으면 현재 파일을 날짜가 붙은 세그먼트로 회전합니다.
+      parquet=True이고 pyarrow가 설치되어 있으면, 회전한 세그먼트를 zstd로 압축한 Parquet 파일로 변환해 보관합니다.
     """
-    # 1. 'logs' 폴더가 없으면 생성합니다.
-    os.makedirs(LOG_DIR, exist_ok=True)
-    
-    # 2. 파일이 존재하는지 확인합니다.
-    file_exists = os.path.isfile(LOG_FILE)
-    
-    try:
-        # 3. 파일을 추가 모드('a')로 열고, CSV writer를 설정합니다.
-        with open(LOG_FILE, mode='a', newline='', encoding='utf-8-sig') as f:
+    def __init__(self, log_file: str, queue_size: int = 10000, batch_size: int = 200,
+                 flush_interval: float = 2.0, max_bytes: int = 50 * 1024 * 1024, parquet: bool = False):
+        self.log_file = log_file
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.parquet = parquet and importlib.util.find_spec("pyarrow") is not None
+        if parquet and not self.parquet:
+            print("⚠️ pyarrow가 설치되어 있지 않아 대화 로그를 Parquet 세그먼트로 변환하지 않습니다.")
+        self._queue: "queue.Queue[List[Any]]" = queue.Queue(maxsize=queue_size)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+
+    # --- 1. 기록 (호출 측) ---
+
+    def log_turn(self, user_input: str, ai_output: str, agent_used: str = "", intent: str = "",
+                 intent_source: str = "", tools_used: List[str] | None = None, latency_ms: float | None = None,
+                 input_tokens: int | None = None, output_tokens: int | None = None,
+                 llm_calls: int | None = None, llm_latency_ms: float | None = None,
+                 thread_id: str | None = None) -> bool:
+        """대화 한 턴을 큐에 넣습니다. 파일 I/O는 백그라운드 스레드가 처리합니다. (큐가 가득 차면 False)"""
+        row = [
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            thread_id or "",
+            user_input,
+            ai_output,
+            agent_used,
+            intent,
+            intent_source,
+            ",".join(tools_used or []),
+            "" if latency_ms is None else round(latency_ms, 1),
+            "" if input_tokens is None else input_tokens,
+            "" if output_tokens is None else output_tokens,
+            "" if llm_calls is None else llm_calls,
+            "" if llm_latency_ms is None else round(llm_latency_ms, 1),
+        ]
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _ensure_started(self) -> None:
+        # 로그를 남기지 않는 실행(스크립트 등)에서는 스레드를 띄우지 않도록 처음 기록할 때 시작합니다.
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="conversation-log", daemon=True)
+                self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """큐에 쌓인 행이 모두 파일에 쓰일 때까지 기다립니다. (프로세스 종료 직전 등)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"queued": self._queue.qsize(), "written": self.written, "dropped": self.dropped}
+
+    # --- 2. 백그라운드 쓰기 ---
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+                self.written += len(batch)
+            except Exception as e:
+                print(f"--- 🚨 CSV 로깅 에러 발생: {e} ---")
+            for _ in batch:
+                self._queue.task_done()
+
+    def _write_batch(self, rows: List[List[Any]]) -> None:
+        os.makedirs(os.path.dirname(self.log_file) or ".", exist_ok=True)
+        self._rotate_if_needed()
+        file_exists = os.path.isfile(self.log_file)
+        with open(self.log_file, mode="a", newline="", encoding="utf-8-sig") as f:
             writer = csv.writer(f)
-            
-            # 4. 파일이 새로 생성되었다면, 헤더(제목 줄)를 먼저 씁니다.
             if not file_exists:
-                writer.writerow(["Timestamp", "UserInput", "AI_Output", "AgentUsed"])
-            
-            # 5. 현재 시간, 사용자 입력, AI 답변, 사용된 Agent를 한 줄로 기록합니다.
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            writer.writerow([timestamp, user_input, ai_output, agent_used])
-            
-    except Exception as e:
-        print(f"--- 🚨 CSV 로깅 에러 발생: {e} ---")
\ No newline at end of file
+                writer.writerow(LOG_COLUMNS)
+            writer.writerows(rows)
+
+    # --- 3. 회전 / Parquet 세그먼트 ---
+
+    def _rotate_if_needed(self) -> None:
+        if not os.path.isfile(self.log_file):
+            return
+        # 마지막으로 쓴 날짜가 오늘이 아니면 (자정 이후 첫 기록) 어제까지의 로그를 세그먼트로 넘깁니다.
+        file_date = datetime.fromtimestamp(os.path.getmtime(self.log_file)).strftime("%Y%m%d")
+        too_big = os.path.getsize(self.log_file) >= self.max_bytes
+        if too_big or file_date != datetime.now().strftime("%Y%m%d") or not self._has_current_header():
+            self._rotate(file_date)
+
+    def _has_current_header(self) -> bool:
+        # 컬럼이 다른 예전 형식의 로그 파일에 이어 쓰지 않도록, 헤더가 다르면 세그먼트로 넘깁니다.
+        with open(self.log_file, mode="r", newline="", encoding="utf-8-sig") as f:
+            return next(csv.reader(f), None) == LOG_COLUMNS
+
+    def _rotate(self, file_date: str) -> None:
+        stem, _ = os.path.splitext(self.log_file)
+        n = 1
+        while glob.glob(f"{stem}_{file_date}_{n}.*"):
+            n += 1
+        segment = f"{stem}_{file_date}_{n}.csv"
+        os.replace(self.log_file, segment)
+        if self.parquet:
+            self._to_parquet(segment)
+
+    @staticmethod
+    def _to_parquet(segment: str) -> None:
+        import pandas as pd
+
+        try:
+            df = pd.read_csv(segment, encoding="utf-8-sig", dtype=str, keep_default_na=False)
+            df.to_parquet(os.path.splitext(segment)[0] + ".parquet", compression="zstd", index=False)
+            os.remove(segment)
+        except Exception as e:
+            print(f"⚠️ 대화 로그 Parquet 변환 실패 (CSV로 보관합니다): {e}")
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+conversation_logger = ConversationLogWriter(
+    LOG_FILE,
+    queue_size=CONVERSATION_LOG_QUEUE_SIZE,
+    batch_size=CONVERSATION_LOG_BATCH_SIZE,
+    flush_interval=CONVERSATION_LOG_FLUSH_SECONDS,
+    max_bytes=CONVERSATION_LOG_MAX_MB * 1024 * 1024,
+    parquet=CONVERSATION_LOG_PARQUET,
+)
+# 프로세스가 정상 종료될 때 큐에 남은 로그를 마저 씁니다.
+atexit.register(conversation_logger.flush)
+
+
+def log_to_csv(user_input, ai_output, agent_used):
+    """
+    사용자의 질문, AI의 답변, 사용된 Agent를 대화 로그에 기록합니다. (백그라운드 로거에 넣기만 하고 바로 반환)
+    """
+    conversation_logger.log_turn(user_input, ai_output, agent_used=agent_used)
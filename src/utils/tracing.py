@@ -0,0 +1,341 @@
+# src/utils/tracing.py
+
+import contextvars
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import urllib.request
+import uuid
+from contextlib import contextmanager
+from logging.handlers import RotatingFileHandler
+from typing import Any, Dict, Iterator, List
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.config import (
+    TRACING_ENABLED,
+    TRACE_JSONL_PATH,
+    TRACE_JSONL_MAX_MB,
+    TRACE_JSONL_BACKUPS,
+    TRACE_OTLP_ENDPOINT,
+    TRACE_SERVICE_NAME,
+)
+
+
+class Span:
+    """
+    하나의 작업 구간(턴, 노드, 도구 호출, 검색 등)입니다.
+    같은 턴의 스팬들은 trace_id를 공유하고, parent_id로 중첩 관계를 표현합니다.
+    """
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "thread_id", "start_ns", "end_ns",
+                 "attributes", "status", "_lock")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, thread_id: str | None,
+                 attributes: Dict[str, Any] | None = None):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.thread_id = thread_id
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.status = "ok"
+        self._lock = threading.Lock()
+
+    def set(self, **attributes: Any) -> None:
+        with self._lock:
+            self.attributes.update(attributes)
+
+    def incr(self, key: str, amount: float = 1) -> None:
+        """토큰 수, 캐시 적중 수처럼 여러 번에 걸쳐 누적되는 속성을 더합니다."""
+        with self._lock:
+            self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "thread_id": self.thread_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+# --- 1. 내보내기(Exporter) ---
+
+class JsonlSpanExporter:
+    """끝난 스팬을 한 줄에 하나씩 JSONL 파일로 기록합니다. 파일이 max_bytes를 넘으면 backups개까지 회전합니다."""
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._logger = logging.getLogger(f"tracing.jsonl.{path}")
+        self._logger.propagate = False
+        self._logger.setLevel(logging.INFO)
+        if not self._logger.handlers:
+            handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            self._logger.addHandler(handler)
+
+    def export(self, spans: List[Span]) -> None:
+        for span in spans:
+            self._logger.info(json.dumps(span.to_dict(), ensure_ascii=False, default=str))
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, str):
+        return {"stringValue": value}
+    return {"stringValue": json.dumps(value, ensure_ascii=False, default=str)}
+
+
+def to_otlp_json(spans: List[Span], service_name: str) -> Dict[str, Any]:
+    """스팬 목록을 OTLP/HTTP JSON(ExportTraceServiceRequest) 형식으로 변환합니다."""
+    otlp_spans = []
+    for span in spans:
+        attributes = {**span.attributes, "thread_id": span.thread_id or ""}
+        otlp_spans.append({
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id or "",
+            "name": span.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(span.start_ns),
+            "endTimeUnixNano": str(span.end_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in attributes.items()],
+            "status": {"code": 2 if span.status == "error" else 1},
+        })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "src.utils.tracing"}, "spans": otlp_spans}],
+        }]
+    }
+
+
+class OtlpHttpJsonExporter:
+    """
+    OTLP/HTTP(JSON) 엔드포인트(예: http://localhost:4318/v1/traces)로 스팬을 보냅니다.
+    OpenTelemetry Collector 또는 scripts/trace_collector.py가 그대로 받을 수 있습니다.
+    """
+    def __init__(self, endpoint: str, service_name: str, timeout: float = 2.0):
+        self.endpoint = endpoint
+        self.service_name = service_name
+        self.timeout = timeout
+
+    def export(self, spans: List[Span]) -> None:
+        body = json.dumps(to_otlp_json(spans, self.service_name), ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(self.endpoint, data=body, headers={"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=self.timeout):
+            pass
+
+
+# --- 2. Tracer ---
+
+_current_span: contextvars.ContextVar[Span | None] = contextvars.ContextVar("current_span", default=None)
+
+
+class _NoopSpan:
+    """트레이싱이 꺼져 있을 때 사용하는 빈 스팬 (호출부에서 조건 분기를 하지 않아도 되도록)"""
+    def set(self, **attributes: Any) -> None:
+        pass
+
+    def incr(self, key: str, amount: float = 1) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """
+    턴 > 노드 > 도구 > 서비스 검색 > Chroma 쿼리로 중첩되는 스팬을 만들고, 백그라운드 스레드에서 내보냅니다.
+    - 부모 스팬은 contextvars로 전달됩니다. (LangGraph 노드 스레드, asyncio 태스크, to_thread에 자동 전파)
+    - 턴 스팬은 thread_id별로 등록되어, 다른 스레드/이벤트 루프에서 실행되는 노드도 같은 턴 아래에 묶입니다.
+    """
+    def __init__(self, exporters: List[Any], enabled: bool = True, batch_size: int = 64, flush_interval: float = 1.0):
+        self.enabled = enabled and bool(exporters)
+        self.exporters = exporters
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=10000)
+        self._turns: Dict[str, Span] = {}
+        self._turns_lock = threading.Lock()
+        self.dropped = 0
+        if self.enabled:
+            threading.Thread(target=self._export_loop, name="trace-export", daemon=True).start()
+
+    def current_span(self) -> Span | _NoopSpan:
+        return _current_span.get() or NOOP_SPAN
+
+    def _parent_for(self, thread_id: str | None) -> Span | None:
+        parent = _current_span.get()
+        if parent is None and thread_id:
+            with self._turns_lock:
+                parent = self._turns.get(thread_id)
+        return parent
+
+    def _new_span(self, name: str, thread_id: str | None, attributes: Dict[str, Any]) -> Span:
+        parent = self._parent_for(thread_id)
+        return Span(
+            name,
+            trace_id=parent.trace_id if parent else uuid.uuid4().hex,
+            parent_id=parent.span_id if parent else None,
+            thread_id=thread_id or (parent.thread_id if parent else None),
+            attributes=attributes,
+        )
+
+    def _finish(self, span: Span) -> None:
+        span.end_ns = time.time_ns()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    @contextmanager
+    def span(self, name: str, thread_id: str | None = None, **attributes: Any) -> Iterator[Span | _NoopSpan]:
+        """중첩 스팬을 엽니다. 블록 안에서 만든 스팬은 이 스팬의 자식이 됩니다."""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+        span = self._new_span(name, thread_id, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            self._finish(span)
+
+    def start_turn(self, thread_id: str | None, **attributes: Any) -> Span | _NoopSpan:
+        """
+        대화 한 턴의 루트 스팬을 시작합니다. (제너레이터처럼 컨텍스트를 넘나드는 곳에서 쓰도록 contextvar를 쓰지 않습니다)
+        이 턴이 끝날 때까지 같은 thread_id의 부모 없는 스팬은 이 스팬 아래에 기록됩니다.
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        span = Span("turn", trace_id=uuid.uuid4().hex, parent_id=None, thread_id=thread_id, attributes=attributes)
+        if thread_id:
+            with self._turns_lock:
+                self._turns[thread_id] = span
+        return span
+
+    def end_turn(self, span: Span | _NoopSpan, error: BaseException | None = None) -> None:
+        if not isinstance(span, Span):
+            return
+        if error is not None:
+            span.status = "error"
+            span.set(error=f"{type(error).__name__}: {error}")
+        if span.thread_id:
+            with self._turns_lock:
+                if self._turns.get(span.thread_id) is span:
+                    del self._turns[span.thread_id]
+        self._finish(span)
+
+    def _export_loop(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            for exporter in self.exporters:
+                try:
+                    exporter.export(batch)
+                except Exception as e:
+                    print(f"⚠️ 트레이스 내보내기 실패 ({type(exporter).__name__}): {e}")
+            for _ in batch:
+                self._queue.task_done()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """대기 중인 스팬을 모두 내보낼 때까지 기다립니다. (스크립트 종료 직전 등)"""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+class LLMTracingCallback(BaseCallbackHandler):
+    """
+    LangChain 콜백으로 LLM 호출마다 'llm' 스팬을 기록하고, 토큰 사용량을 감싸는 스팬(노드/도구)에도 누적합니다.
+    LangChain은 콜백을 호출 측의 컨텍스트에서 실행하므로 현재 스팬이 그대로 부모가 됩니다.
+    """
+    def __init__(self, tracer: "Tracer"):
+        self.tracer = tracer
+        self._spans: Dict[UUID, tuple[Span, Any]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, tags=None, metadata=None, **kwargs):
+        if not self.tracer.enabled:
+            return
+        parent = _current_span.get()
+        model = (kwargs.get("invocation_params") or {}).get("model") or (metadata or {}).get("ls_model_name")
+        span = self.tracer._new_span("llm", None, {"model": str(model), "tags": ",".join(tags or [])})
+        with self._lock:
+            self._spans[run_id] = (span, parent)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        with self._lock:
+            entry = self._spans.pop(run_id, None)
+        if entry is None:
+            return
+        span, parent = entry
+        usage = {}
+        try:
+            message = response.generations[0][0].message
+            usage = getattr(message, "usage_metadata", None) or {}
+            span.set(output_chars=len(message.content) if isinstance(message.content, str) else 0)
+        except (AttributeError, IndexError):
+            pass
+        for key in ("input_tokens", "output_tokens"):
+            if key in usage:
+                span.set(**{key: usage[key]})
+                if parent is not None:
+                    parent.incr(key, usage[key])
+        self.tracer._finish(span)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        with self._lock:
+            entry = self._spans.pop(run_id, None)
+        if entry is not None:
+            entry[0].status = "error"
+            entry[0].set(error=f"{type(error).__name__}: {error}")
+            self.tracer._finish(entry[0])
+
+
+def _build_exporters() -> List[Any]:
+    exporters: List[Any] = []
+    if TRACE_JSONL_PATH:
+        exporters.append(JsonlSpanExporter(TRACE_JSONL_PATH, TRACE_JSONL_MAX_MB * 1024 * 1024, TRACE_JSONL_BACKUPS))
+    if TRACE_OTLP_ENDPOINT:
+        exporters.append(OtlpHttpJsonExporter(TRACE_OTLP_ENDPOINT, TRACE_SERVICE_NAME))
+    return exporters
+
+
+# 프로젝트 전역에서 사용할 싱글톤(Singleton) 인스턴스
+tracer = Tracer(_build_exporters() if TRACING_ENABLED else [], enabled=TRACING_ENABLED)
+llm_tracing_callback = LLMTracingCallback(tracer)